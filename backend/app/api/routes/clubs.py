@@ -1,48 +1,104 @@
+import json
+
 from fastapi import APIRouter, HTTPException, Query
-from app.scraper.parser import buscar_id_time, buscar_jogos, buscar_detalhes_jogo, buscar_jogos_por_ano
-from app.db.repositories.club_repo import listar_todos_clubes
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.core.estatisticas import estatisticas_do_clube
+from app.core.typeahead import indice_typeahead
+from app.scraper.parser import (
+    buscar_id_time_async, buscar_jogos_async, buscar_jogos_por_ano_async, transmitir_jogos_async
+)
+from app.db.repositories.club_repo import buscar_clubes, listar_todos_clubes
 
 router = APIRouter()
 
 
 @router.get("/")
-def listar_clubes():
+def listar_clubes(
+    nome: str = Query(None, min_length=1, description="Filtra pelo nome (sem acento, ordenado por relevância)"),
+    limite: int = Query(20, ge=1, le=100),
+):
+    if nome:
+        return buscar_clubes(nome, limite)
     return listar_todos_clubes()
 
 
 @router.get("/search")
-def search_clube(nome: str = Query(..., min_length=2)):
-    result = buscar_id_time(nome)
+async def search_clube(nome: str = Query(..., min_length=2)):
+    result = await buscar_id_time_async(nome)
     if not result:
         raise HTTPException(status_code=404, detail="Clube não encontrado")
     return result
 
 
+@router.get("/typeahead")
+async def typeahead_clubes(q: str = Query(..., min_length=1), limite: int = Query(8, ge=1, le=20)):
+    """Sugestões a cada tecla: catálogo local primeiro, SofaScore só quando nada casar."""
+    sugestoes = await run_in_threadpool(indice_typeahead.sugerir, q, limite)
+    if sugestoes or len(q.strip()) < 3 or indice_typeahead.sem_resultado(q):
+        return sugestoes
+    result = await buscar_id_time_async(q)
+    if not result:
+        indice_typeahead.registrar_sem_resultado(q)
+        return []
+    return [indice_typeahead.sugestao_externa(result)]
+
+
 @router.get("/{club_id}/matches")
-def matches_clube(
+async def matches_clube(
     club_id: int,
     tipo: str = Query("all"),
     limite_paginas: int = Query(None, ge=1, le=20),
     ano: int = Query(None),
+    janela: int = Query(None, ge=1, le=8, description="Páginas buscadas em paralelo (prefetch)"),
 ):
     if tipo in ["next", "last"]:
-        return buscar_jogos(club_id, tipo=tipo, limite_paginas=limite_paginas)
+        return await buscar_jogos_async(club_id, tipo=tipo, limite_paginas=limite_paginas, janela=janela)
 
     if ano:
-        jogos = buscar_jogos_por_ano(club_id, ano)
+        jogos = await buscar_jogos_por_ano_async(club_id, ano)
         return {"ano": ano, "total": len(jogos), "jogos": jogos}
 
     # default = todos jogos do ano atual
     from datetime import datetime
     ano_atual = datetime.now().year
-    jogos = buscar_jogos_por_ano(club_id, ano_atual)
+    jogos = await buscar_jogos_por_ano_async(club_id, ano_atual)
     return {"ano": ano_atual, "total": len(jogos), "jogos": jogos}
 
 
+@router.get("/{club_id}/matches/stream")
+async def matches_clube_stream(
+    club_id: int,
+    tipo: str = Query("last", pattern="^(next|last)$"),
+    limite_paginas: int = Query(None, ge=1, le=20),
+    janela: int = Query(None, ge=1, le=8, description="Páginas buscadas em paralelo (prefetch)"),
+):
+    """
+    Mesmos jogos de /matches?tipo=..., em NDJSON (um registro JSON por linha):
+    páginas de jogos assim que chegam, depois correções de venue e um "fim".
+    """
+    async def linhas():
+        async for registro in transmitir_jogos_async(club_id, tipo, limite_paginas, janela):
+            yield json.dumps(registro, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(linhas(), media_type="application/x-ndjson",
+                             headers={"X-Accel-Buffering": "no"})
+
+
+@router.get("/{club_id}/estatisticas")
+async def estatisticas_clube(club_id: int, ultimos: int = Query(5, ge=1, le=50)):
+    """Forma, gols, casa/fora, jogos sem sofrer gol e pontos por jogo por temporada (jogos guardados)."""
+    stats = await run_in_threadpool(estatisticas_do_clube, club_id, ultimos)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Nenhum jogo encerrado guardado para o clube")
+    return stats
+
+
 @router.get("/{club_id}/historico/{ano}")
-def historico_por_ano(club_id: int, ano: int):
+async def historico_por_ano(club_id: int, ano: int):
     """Retorna todos os jogos de um clube em um ano específico."""
     if ano < 2000 or ano > 2030:
         raise HTTPException(status_code=400, detail="Ano inválido")
-    jogos = buscar_jogos_por_ano(club_id, ano)
+    jogos = await buscar_jogos_por_ano_async(club_id, ano)
     return {"ano": ano, "total": len(jogos), "jogos": jogos}
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
+
+from app.scraper.imagens import TAMANHOS, logo_time
+
+router = APIRouter()
+
+# O conteúdo de uma URL muda raramente; o ETag (sha do arquivo) cobre a troca de escudo.
+CACHE_CONTROL = "public, max-age=604800, stale-while-revalidate=86400"
+
+
+@router.get("/team/{time_id}")
+async def logo(request: Request, time_id: int, tam: int | None = Query(None)):
+    if tam is not None and tam not in TAMANHOS:
+        raise HTTPException(status_code=400, detail=f"tam deve ser um de {list(TAMANHOS)}")
+    imagem = await logo_time(time_id, tam)
+    if imagem is None:
+        raise HTTPException(status_code=404, detail="Logo não encontrado")
+    dados, tipo, sha = imagem
+    headers = {"ETag": f'"{sha[:32]}"', "Cache-Control": CACHE_CONTROL}
+    if headers["ETag"] in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(dados, media_type=tipo, headers=headers)
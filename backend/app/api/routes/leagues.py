@@ -1,9 +1,15 @@
 from fastapi import APIRouter, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
+
+from app.core.estatisticas import estatisticas_da_liga
 from app.scraper.leagues import (
-    PAISES, LIGAS_POR_PAIS, buscar_tabela_liga, buscar_jogos_liga
+    PAISES, LIGAS_POR_PAIS, buscar_tabela_async, buscar_jogos_liga_async
 )
 
-from app.scraper.leagues import buscar_info_liga
+from app.scraper.leagues import (
+    buscar_calendario_liga_async, buscar_info_liga_async, buscar_season_async, buscar_tabela_local_async,
+    buscar_temporadas_async,
+)
 router = APIRouter()
 
 
@@ -21,28 +27,94 @@ def listar_ligas(pais_id: str):
 
 
 @router.get("/{tournament_id}/tabela")
-def tabela(
+async def tabela(
     tournament_id: int,
     season_id: int = Query(None),
+    ano: int = Query(None, description="Temporada que começa neste ano (ignorado com season_id)"),
 ):
-    result = buscar_tabela_liga(tournament_id, season_id)
+    """
+    Tabela da temporada. Em liga de tabela única com o calendário sincronizado
+    no banco sai dos resultados guardados (`origem: local`); senão, dos
+    standings do SofaScore (`origem: sofascore`).
+    """
+    result = await buscar_tabela_async(tournament_id, season_id, ano)
     if "error" in result:
         raise HTTPException(status_code=404, detail=result["error"])
     return result
 
 
+@router.get("/{tournament_id}/tabela/local")
+async def tabela_local(
+    tournament_id: int,
+    season_id: int = Query(None),
+    ano: int = Query(None, description="Temporada que começa neste ano (ignorado com season_id)"),
+    tipo: str = Query("total", pattern="^(total|casa|fora|forma)$"),
+    rodada: int = Query(None, ge=1, description="Tabela como estava ao fim desta rodada"),
+    n: int = Query(5, ge=1, le=38, description="Jogos considerados na forma"),
+):
+    """
+    Tabela calculada dos resultados guardados (sincronizados por /calendario).
+    Mesmo formato de /tabela, com a forma de cada time; `completa` diz se a
+    temporada está sincronizada numa liga de tabela única, ou seja, se a
+    tabela vale pela oficial.
+    """
+    result = await buscar_tabela_local_async(tournament_id, season_id, ano, tipo, rodada, n)
+    if "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+    return result
+
+
+@router.get("/{tournament_id}/estatisticas")
+async def estatisticas_liga(
+    tournament_id: int,
+    season_id: int = Query(None),
+    ano: int = Query(None, description="Temporada que começa neste ano (ignorado com season_id)"),
+    todas: bool = Query(False, description="Todas as temporadas guardadas, em vez da atual"),
+    ultimos: int = Query(5, ge=1, le=50),
+):
+    """Estatísticas de todos os clubes do torneio, calculadas dos jogos guardados."""
+    if not season_id and not todas:
+        season_id = await buscar_season_async(tournament_id, ano)
+        if not season_id:
+            raise HTTPException(status_code=404, detail="Temporada não encontrada")
+    return await run_in_threadpool(estatisticas_da_liga, tournament_id, season_id, ultimos)
+
+
 @router.get("/{tournament_id}/jogos")
-def jogos_liga(
+async def jogos_liga(
     tournament_id: int,
     season_id: int = Query(None),
     rodada: int = Query(None),
+    ano: int = Query(None, description="Temporada que começa neste ano (ignorado com season_id)"),
 ):
-    return buscar_jogos_liga(tournament_id, season_id, rodada)
+    return await buscar_jogos_liga_async(tournament_id, season_id, rodada, ano)
+
+
+@router.get("/{tournament_id}/calendario")
+async def calendario_liga(
+    tournament_id: int,
+    season_id: int = Query(None),
+    ano: int = Query(None, description="Temporada que começa neste ano (ignorado com season_id)"),
+):
+    """Todos os jogos da temporada, agrupados por rodada."""
+    result = await buscar_calendario_liga_async(tournament_id, season_id, ano)
+    if "error" in result:
+        raise HTTPException(status_code=404, detail=result["error"])
+    return result
+
+
+@router.get("/{tournament_id}/temporadas")
+async def temporadas_liga(tournament_id: int):
+    """Temporadas do torneio, da atual para a mais antiga."""
+    return [
+        {"id": t["id"], "nome": t["nome"], "ano": t["ano"], "ano_inicio": t["ano_inicio"]}
+        for t in await buscar_temporadas_async(tournament_id)
+    ]
 
 
 @router.get("/{tournament_id}/info")
-def info_liga(tournament_id: int):
-    result = buscar_info_liga(tournament_id)
+async def info_liga(tournament_id: int):
+    result = await buscar_info_liga_async(tournament_id)
     
     if "error" in result:
         raise HTTPException(status_code=404, detail=result["error"])
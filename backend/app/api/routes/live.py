@@ -0,0 +1,75 @@
+import asyncio
+import json
+import time
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.scraper.ao_vivo import TAMANHO_FILA, painel_ao_vivo
+from app.db.repositories.evento_repo import eventos_ao_vivo
+
+router = APIRouter()
+
+KEEPALIVE_S = 15
+REVISAO_CLUBES_S = 60
+
+
+def _ids(valor: str | None) -> list[int]:
+    try:
+        return [int(v) for v in (valor or "").split(",") if v.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Ids devem ser inteiros separados por vírgula")
+
+
+@router.get("/")
+async def ao_vivo(
+    request: Request,
+    eventos: str = Query(None, description="Ids de eventos, separados por vírgula"),
+    clubes: str = Query(None, description="Ids de clubes: acompanha os jogos deles em andamento"),
+):
+    """
+    Server-Sent Events com placar e gols dos jogos pedidos. Cada mensagem é
+    `event: placar` (ou `fim`) com o placar inteiro e os gols novos em JSON.
+    Sem clubes, o stream fecha quando todos os eventos assinados terminam.
+    """
+    event_ids, time_ids = _ids(eventos), _ids(clubes)
+    if not event_ids and not time_ids:
+        raise HTTPException(status_code=400, detail="Informe eventos ou clubes")
+
+    fila: asyncio.Queue = asyncio.Queue(TAMANHO_FILA)
+    assinados: set[int] = set()
+    encerrados: set[int] = set()
+
+    def assinar(ids: list[int]) -> None:
+        novos = [i for i in ids if i not in assinados][:settings.AO_VIVO_MAX_EVENTOS - len(assinados)]
+        assinados.update(novos)
+        painel_ao_vivo.assinar(fila, novos)
+
+    async def mensagens():
+        assinar(event_ids)
+        revisado_em = 0.0
+        try:
+            while not await request.is_disconnected():
+                # Clubes: jogos que começam durante a conexão entram na assinatura.
+                if time_ids and time.monotonic() - revisado_em > REVISAO_CLUBES_S:
+                    assinar(await run_in_threadpool(eventos_ao_vivo, time_ids, time.time(),
+                                                    settings.AO_VIVO_JANELA_S))
+                    revisado_em = time.monotonic()
+                try:
+                    msg = await asyncio.wait_for(fila.get(), KEEPALIVE_S)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {msg['tipo']}\ndata: {json.dumps(msg, ensure_ascii=False)}\n\n"
+                if msg["tipo"] == "fim":
+                    encerrados.add(msg["id"])
+                    # Só eventos: acabaram todos, não há mais o que mandar.
+                    if not time_ids and encerrados >= assinados:
+                        return
+        finally:
+            painel_ao_vivo.cancelar(fila)
+
+    return StreamingResponse(mensagens(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
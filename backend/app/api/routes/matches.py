@@ -0,0 +1,27 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from app.scraper.parser import buscar_detalhes_jogo_async, buscar_gols_jogos_async
+
+router = APIRouter()
+
+MAX_IDS = 100
+
+
+@router.get("/gols")
+async def gols_em_lote(ids: str = Query(..., description="Ids de eventos, separados por vírgula")):
+    """Gols de vários jogos numa resposta só: {id: [gols] ou null se indisponível}."""
+    try:
+        event_ids = list(dict.fromkeys(int(i) for i in ids.split(",") if i.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Ids devem ser inteiros separados por vírgula")
+    if not event_ids or len(event_ids) > MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"Informe de 1 a {MAX_IDS} ids")
+    return await buscar_gols_jogos_async(event_ids)
+
+
+@router.get("/{event_id}/gols")
+async def gols_jogo(event_id: int):
+    gols = await buscar_detalhes_jogo_async(event_id)
+    if gols is None:
+        raise HTTPException(status_code=404, detail="Detalhes do jogo indisponíveis")
+    return gols
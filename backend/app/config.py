@@ -14,6 +14,47 @@ class Settings(BaseSettings):
 
     CORS_ORIGINS: list[str] = ["*"]
 
+    # Cliente SofaScore
+    SOFASCORE_BASE_URL: str = "https://www.sofascore.com/api/v1"
+    SOFASCORE_IMPERSONATE: str = "chrome110"
+    SOFASCORE_POOL_SIZE: int = 10
+    SOFASCORE_POOL_TIMEOUT: float = 30.0
+    SOFASCORE_HTTP2: bool = True
+    SOFASCORE_MAX_CONCORRENCIA: int = 50
+    SOFASCORE_TAXA_REQ_S: float = 5.0
+    SOFASCORE_RAJADA: int = 10
+    SOFASCORE_TAXA_MINIMA: float = 0.5
+    SOFASCORE_RECUPERACAO: float = 0.05
+    SOFASCORE_JANELA_PAGINAS: int = 4
+    SOFASCORE_CB_FALHAS: int = 5
+    SOFASCORE_CB_ABERTO_S: float = 30.0
+    SOFASCORE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    SOFASCORE_CACHE_DB: str = str(BASE_DIR / "cache_sofascore.db")
+
+    # Logos dos times (proxy /img/team/{id} com cache em disco). Com
+    # LOGO_PROXY_URL (ex.: http://localhost:8000) as respostas da API apontam
+    # para o proxy em vez do SofaScore.
+    IMAGENS_DIR: str = str(BASE_DIR / "cache_imagens")
+    IMAGENS_MAX_BYTES: int = 256 * 1024 * 1024
+    LOGO_PROXY_URL: str = ""
+    LOGO_PROXY_TAMANHO: int = 64
+
+    # Placar ao vivo (/api/live): um poller por jogo, compartilhado por todos
+    # os assinantes. Clubes assinados acompanham jogos em andamento ou que
+    # começam em até AO_VIVO_JANELA_S.
+    AO_VIVO_INTERVALO_S: float = 15
+    AO_VIVO_JANELA_S: float = 30 * 60
+    AO_VIVO_MAX_EVENTOS: int = 30
+
+    # Pré-aquecimento em background (app.scraper.aquecimento). Desligue aqui
+    # quando rodar o worker separado.
+    AQUECIMENTO_ATIVO: bool = True
+    AQUECIMENTO_INTERVALO_S: float = 10 * 60
+    AQUECIMENTO_INTERVALO_JOGO_S: float = 60
+    AQUECIMENTO_JANELA_JOGO_S: float = 3 * 60 * 60
+    AQUECIMENTO_MAX_CLUBES_DIARIO: int = 20
+    AQUECIMENTO_FOLGA_MINIMA: float = 5
+
     class Config:
         env_file = ".env"
         extra = "ignore"
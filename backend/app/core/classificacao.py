@@ -0,0 +1,214 @@
+"""
+Classificação de liga calculada a partir dos resultados guardados.
+
+Cada temporada mantém em memória as tabelas total, casa e fora; a cada
+consulta só os resultados novos são somados (se algum já somado mudou, a
+temporada é recalculada). Tabela até a rodada N e tabela de forma (últimos
+N jogos de cada time) saem na hora, dos mesmos resultados.
+
+A ordem segue os critérios de desempate de cada competição
+(CRITERIOS_DESEMPATE). "confronto" e "confronto_saldo" são pontos e saldo
+só nos jogos entre os times ainda empatados.
+"""
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, replace
+
+PONTOS_VITORIA = 3
+FORMA_PADRAO = 5
+
+CRITERIOS_PADRAO = ("pontos", "saldo", "gols_pro")
+CRITERIOS_DESEMPATE: dict[int, tuple[str, ...]] = {
+    325: ("pontos", "vitorias", "saldo", "gols_pro", "confronto"),               # Brasileirão Série A
+    77:  ("pontos", "vitorias", "saldo", "gols_pro", "confronto"),               # Brasileirão Série B
+    17:  ("pontos", "saldo", "gols_pro", "confronto"),                           # Premier League
+    24:  ("pontos", "saldo", "gols_pro", "confronto"),                           # Championship
+    8:   ("pontos", "confronto", "confronto_saldo", "saldo", "gols_pro"),        # La Liga
+    11:  ("pontos", "confronto", "confronto_saldo", "saldo", "gols_pro"),        # La Liga 2
+    34:  ("pontos", "saldo", "confronto", "confronto_saldo", "gols_pro"),        # Ligue 1
+    182: ("pontos", "saldo", "confronto", "confronto_saldo", "gols_pro"),        # Ligue 2
+    155: ("pontos", "saldo", "gols_pro", "confronto"),                           # Liga Profesional
+}
+_CONFRONTO = {"confronto", "confronto_saldo"}
+
+
+@dataclass(frozen=True)
+class Resultado:
+    id: int
+    inicio: int
+    rodada: int | None
+    home_id: int
+    away_id: int
+    home_gols: int
+    away_gols: int
+
+
+@dataclass
+class Linha:
+    time_id: int
+    jogos: int = 0
+    vitorias: int = 0
+    empates: int = 0
+    derrotas: int = 0
+    gols_pro: int = 0
+    gols_contra: int = 0
+
+    @property
+    def saldo(self) -> int:
+        return self.gols_pro - self.gols_contra
+
+    @property
+    def pontos(self) -> int:
+        return PONTOS_VITORIA * self.vitorias + self.empates
+
+    def somar(self, pro: int, contra: int) -> None:
+        self.jogos += 1
+        self.gols_pro += pro
+        self.gols_contra += contra
+        if pro > contra:
+            self.vitorias += 1
+        elif pro == contra:
+            self.empates += 1
+        else:
+            self.derrotas += 1
+
+
+class Tabela:
+    """Tabela somada jogo a jogo. `lado` "casa"/"fora" só conta os jogos do time naquele mando."""
+
+    def __init__(self, criterios: tuple[str, ...] = CRITERIOS_PADRAO, lado: str | None = None):
+        self.criterios = criterios
+        self.lado = lado
+        self.linhas: dict[int, Linha] = {}
+        self.jogos: list[Resultado] = []
+
+    def _linha(self, time_id: int) -> Linha:
+        linha = self.linhas.get(time_id)
+        if linha is None:
+            linha = self.linhas[time_id] = Linha(time_id)
+        return linha
+
+    def aplicar(self, r: Resultado, times: set[int] | None = None) -> None:
+        """Soma o resultado; com `times`, só o lado desses times (tabela de forma)."""
+        self.jogos.append(r)
+        if self.lado != "fora" and (times is None or r.home_id in times):
+            self._linha(r.home_id).somar(r.home_gols, r.away_gols)
+        if self.lado != "casa" and (times is None or r.away_id in times):
+            self._linha(r.away_id).somar(r.away_gols, r.home_gols)
+        # Quem só jogou do outro lado ainda aparece na tabela, zerado.
+        self._linha(r.home_id)
+        self._linha(r.away_id)
+
+    def _confronto(self, grupo: list[Linha]) -> dict[int, Linha]:
+        ids = {linha.time_id for linha in grupo}
+        mini = {time_id: Linha(time_id) for time_id in ids}
+        for r in self.jogos:
+            if r.home_id in ids and r.away_id in ids:
+                mini[r.home_id].somar(r.home_gols, r.away_gols)
+                mini[r.away_id].somar(r.away_gols, r.home_gols)
+        return mini
+
+    def _ordenar(self, grupo: list[Linha], criterios: tuple[str, ...]) -> list[Linha]:
+        if len(grupo) <= 1 or not criterios:
+            return grupo
+        criterio, resto = criterios[0], criterios[1:]
+        if criterio in _CONFRONTO:
+            mini = self._confronto(grupo)
+            atributo = "pontos" if criterio == "confronto" else "saldo"
+            valor = lambda linha: getattr(mini[linha.time_id], atributo)
+        else:
+            valor = lambda linha: getattr(linha, criterio)
+        faixas: dict[int, list[Linha]] = defaultdict(list)
+        for linha in grupo:
+            faixas[valor(linha)].append(linha)
+        ordenadas = []
+        for chave in sorted(faixas, reverse=True):
+            ordenadas.extend(self._ordenar(faixas[chave], resto))
+        return ordenadas
+
+    def ordenadas(self) -> list[Linha]:
+        # Desempate final estável pelo id, para a ordem não oscilar entre consultas.
+        linhas = sorted(self.linhas.values(), key=lambda linha: linha.time_id)
+        return self._ordenar(linhas, self.criterios)
+
+    def forma(self, n: int = FORMA_PADRAO) -> dict[int, list[str]]:
+        """Últimos `n` resultados de cada time, do mais antigo para o mais recente ("V", "E", "D")."""
+        por_time: dict[int, list[str]] = defaultdict(list)
+        for r in sorted(self.jogos, key=lambda r: r.inicio):
+            for time_id, pro, contra, lado in ((r.home_id, r.home_gols, r.away_gols, "casa"),
+                                               (r.away_id, r.away_gols, r.home_gols, "fora")):
+                if self.lado in (None, lado):
+                    por_time[time_id].append("V" if pro > contra else "E" if pro == contra else "D")
+        return {time_id: seq[-n:] for time_id, seq in por_time.items()}
+
+
+LADOS = {"total": None, "casa": "casa", "fora": "fora"}
+
+
+def montar_tabela(resultados: list[Resultado], criterios: tuple[str, ...], tipo: str = "total",
+                  rodada: int | None = None, n_forma: int = FORMA_PADRAO) -> Tabela:
+    """Tabela calculada do zero: até a rodada `rodada`, por mando, ou de forma (últimos n_forma jogos)."""
+    if rodada is not None:
+        resultados = [r for r in resultados if r.rodada is not None and r.rodada <= rodada]
+    if tipo == "forma":
+        tabela = Tabela(tuple(c for c in criterios if c not in _CONFRONTO))
+        por_time: dict[int, list[Resultado]] = defaultdict(list)
+        for r in sorted(resultados, key=lambda r: r.inicio):
+            por_time[r.home_id].append(r)
+            por_time[r.away_id].append(r)
+        for time_id, jogos in por_time.items():
+            for r in jogos[-n_forma:]:
+                tabela.aplicar(r, {time_id})
+        return tabela
+    tabela = Tabela(criterios, LADOS[tipo])
+    for r in resultados:
+        tabela.aplicar(r)
+    return tabela
+
+
+class _Temporada:
+    def __init__(self, criterios: tuple[str, ...]):
+        self.aplicados: dict[int, Resultado] = {}
+        self.tabelas = {tipo: Tabela(criterios, lado) for tipo, lado in LADOS.items()}
+
+
+class MotorClassificacao:
+    """Tabelas total/casa/fora por temporada, atualizadas só com os resultados que chegaram."""
+
+    def __init__(self):
+        self._temporadas: dict[tuple[int, int], _Temporada] = {}
+        self._lock = threading.Lock()
+        self.recalculos = 0
+        self.incrementais = 0
+
+    def tabela(self, tournament_id: int, season_id: int, resultados: list[Resultado],
+               tipo: str, n_forma: int = FORMA_PADRAO) -> tuple[list[Linha], dict[int, list[str]]]:
+        """Linhas ordenadas (cópias) e os últimos `n_forma` resultados da tabela `tipo` ("total", "casa" ou "fora")."""
+        criterios = CRITERIOS_DESEMPATE.get(tournament_id, CRITERIOS_PADRAO)
+        chave = (tournament_id, season_id)
+        with self._lock:
+            temporada = self._temporadas.get(chave)
+            por_id = {r.id: r for r in resultados}
+            # Resultado já somado que mudou (ou sumiu) invalida a soma incremental.
+            if temporada is None or any(por_id.get(i) != r for i, r in temporada.aplicados.items()):
+                temporada = self._temporadas[chave] = _Temporada(criterios)
+                self.recalculos += 1
+            novos = [r for r in resultados if r.id not in temporada.aplicados]
+            if novos and temporada.aplicados:
+                self.incrementais += 1
+            for r in novos:
+                temporada.aplicados[r.id] = r
+                for t in temporada.tabelas.values():
+                    t.aplicar(r)
+            tabela = temporada.tabelas[tipo]
+            return [replace(linha) for linha in tabela.ordenadas()], tabela.forma(n_forma)
+
+    def estatisticas(self) -> dict:
+        return {
+            "temporadas":  len(self._temporadas),
+            "recalculos":  self.recalculos,
+            "incrementais": self.incrementais,
+        }
+
+
+motor_classificacao = MotorClassificacao()
@@ -0,0 +1,149 @@
+"""
+Estatísticas de clubes calculadas em colunas (NumPy) sobre os eventos guardados.
+
+Os jogos encerrados viram arrays (um por coluna) e cada jogo é duplicado na
+perspectiva de cada time (mandante e visitante), de modo que todas as somas
+por time — e por time e temporada — saem de um bincount, para um clube ou
+para todos os clubes de uma liga na mesma passada.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.core.classificacao import FORMA_PADRAO
+from app.scraper.client import team_image_url
+from app.db.repositories.evento_repo import consultar_times, linhas_resultados
+
+
+@dataclass(frozen=True)
+class Resultados:
+    """Jogos encerrados em colunas, um elemento por jogo."""
+    inicio: np.ndarray
+    season_id: np.ndarray
+    home_id: np.ndarray
+    away_id: np.ndarray
+    home_gols: np.ndarray
+    away_gols: np.ndarray
+
+    @classmethod
+    def de_linhas(cls, linhas: list[tuple]) -> "Resultados":
+        """Linhas (inicio, season_id, home_id, away_id, home_gols, away_gols)."""
+        colunas = np.array(linhas, dtype=np.int64).reshape(-1, 6).T
+        return cls(*colunas)
+
+    def __len__(self) -> int:
+        return len(self.inicio)
+
+
+def _por_time(r: Resultados) -> tuple[np.ndarray, ...]:
+    """Cada jogo duas vezes, na perspectiva do mandante e na do visitante."""
+    time_id = np.concatenate([r.home_id, r.away_id])
+    pro = np.concatenate([r.home_gols, r.away_gols])
+    contra = np.concatenate([r.away_gols, r.home_gols])
+    casa = np.concatenate([np.ones(len(r), bool), np.zeros(len(r), bool)])
+    inicio = np.concatenate([r.inicio, r.inicio])
+    season = np.concatenate([r.season_id, r.season_id])
+    return time_id, pro, contra, casa, inicio, season
+
+
+def _somas(idx: np.ndarray, n: int, pro: np.ndarray, contra: np.ndarray, filtro: np.ndarray | None = None) -> dict:
+    if filtro is not None:
+        idx, pro, contra = idx[filtro], pro[filtro], contra[filtro]
+    contar = lambda mascara: np.bincount(idx, weights=mascara, minlength=n).astype(np.int64)
+    jogos = np.bincount(idx, minlength=n)
+    vitorias = contar(pro > contra)
+    empates = contar(pro == contra)
+    return {
+        "jogos":        jogos,
+        "vitorias":     vitorias,
+        "empates":      empates,
+        "derrotas":     jogos - vitorias - empates,
+        "gols_pro":     np.bincount(idx, weights=pro, minlength=n).astype(np.int64),
+        "gols_contra":  np.bincount(idx, weights=contra, minlength=n).astype(np.int64),
+        "sem_sofrer":   contar(contra == 0),
+        "pontos":       3 * vitorias + empates,
+    }
+
+
+def _linha(somas: dict, i: int) -> dict:
+    linha = {k: int(v[i]) for k, v in somas.items()}
+    linha["saldo"] = linha["gols_pro"] - linha["gols_contra"]
+    linha["pontos_por_jogo"] = round(linha["pontos"] / linha["jogos"], 2) if linha["jogos"] else None
+    return linha
+
+
+def calcular_estatisticas(r: Resultados, time_ids: list[int] | None = None,
+                          ultimos: int = FORMA_PADRAO) -> dict[int, dict]:
+    """
+    Por time: totais, casa/fora, forma dos `ultimos` jogos (do mais antigo ao
+    mais recente) e pontos por jogo de cada temporada. Sem `time_ids`, todos
+    os times que aparecem em `r`.
+    """
+    if not len(r):
+        return {}
+    time_id, pro, contra, casa, inicio, season = _por_time(r)
+    if time_ids is not None:
+        manter = np.isin(time_id, time_ids)
+        time_id, pro, contra, casa, inicio, season = (
+            a[manter] for a in (time_id, pro, contra, casa, inicio, season)
+        )
+        if not len(time_id):
+            return {}
+    times, idx = np.unique(time_id, return_inverse=True)
+    n = len(times)
+
+    total = _somas(idx, n, pro, contra)
+    em_casa = _somas(idx, n, pro, contra, casa)
+    fora = _somas(idx, n, pro, contra, ~casa)
+
+    # Por (time, temporada): chave única combinada, somas no mesmo bincount.
+    temporadas, idx_temporada = np.unique(season, return_inverse=True)
+    chave = idx * len(temporadas) + idx_temporada
+    chaves, idx_chave = np.unique(chave, return_inverse=True)
+    por_temporada = _somas(idx_chave, len(chaves), pro, contra)
+
+    # Forma: ordena por (time, início) e fica com as `ultimos` posições de cada grupo.
+    ordem = np.lexsort((inicio, idx))
+    idx_ordenado = idx[ordem]
+    fim_grupo = np.searchsorted(idx_ordenado, idx_ordenado, side="right")
+    recentes = ordem[(fim_grupo - np.arange(len(ordem))) <= ultimos]
+    letras = np.where(pro[recentes] > contra[recentes], "V", np.where(pro[recentes] == contra[recentes], "E", "D"))
+    cortes = np.searchsorted(idx[recentes], np.arange(n + 1))
+
+    resultado = {}
+    for i, t in enumerate(times.tolist()):
+        resultado[t] = {
+            "time_id": t,
+            **_linha(total, i),
+            "casa":    _linha(em_casa, i),
+            "fora":    _linha(fora, i),
+            "forma":   letras[cortes[i]:cortes[i + 1]].tolist(),
+            "temporadas": [],
+        }
+    for j, k in enumerate(chaves.tolist()):
+        t = times[k // len(temporadas)].item()
+        resultado[t]["temporadas"].append({"season_id": temporadas[k % len(temporadas)].item(),
+                                           **_linha(por_temporada, j)})
+    return resultado
+
+
+def _com_nomes(estatisticas: dict[int, dict]) -> list[dict]:
+    times = consultar_times(list(estatisticas))
+    for time_id, stats in estatisticas.items():
+        stats["time"] = (times.get(time_id) or {}).get("nome")
+        stats["logo"] = team_image_url(time_id)
+    return sorted(estatisticas.values(), key=lambda s: (-s["pontos"], -s["saldo"], -s["gols_pro"]))
+
+
+def estatisticas_do_clube(time_id: int, ultimos: int = FORMA_PADRAO) -> dict | None:
+    """Estatísticas do clube em todos os jogos encerrados guardados (todas as competições)."""
+    r = Resultados.de_linhas(linhas_resultados(time_id=time_id))
+    stats = calcular_estatisticas(r, [time_id], ultimos)
+    return _com_nomes(stats)[0] if stats else None
+
+
+def estatisticas_da_liga(tournament_id: int, season_id: int | None = None,
+                         ultimos: int = FORMA_PADRAO) -> list[dict]:
+    """Estatísticas de todos os clubes nos jogos do torneio (de uma temporada, ou de todas)."""
+    r = Resultados.de_linhas(linhas_resultados(tournament_id=tournament_id, season_id=season_id))
+    return _com_nomes(calcular_estatisticas(r, ultimos=ultimos))
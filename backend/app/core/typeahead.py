@@ -0,0 +1,222 @@
+"""
+Typeahead de clubes servido da memória.
+
+O catálogo é a tabela `clubes` mais os times do SofaScore já vistos em
+eventos, ordenado por popularidade (clube do coração dos usuários pesa mais
+que aparição nos diários). Cada palavra dos nomes entra num índice de
+prefixos; consulta sem nenhum prefixo casando tenta similaridade por
+trigramas (erros de digitação). Só quando nada disso acha é que a rota vai
+ao SofaScore, e o "não achou" de lá também fica guardado.
+"""
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import dataclass, field
+
+from app.scraper.client import team_image_url
+from app.db.repositories.club_repo import listar_todos_clubes, normalizar_nome, versao_clubes
+from app.db.repositories.diary_repo import contagem_clubes_diario
+from app.db.repositories.evento_repo import listar_times
+from app.db.repositories.user_repo import contagem_clubes_coracao
+
+PREFIXO_MAX = 6
+PESO_CORACAO = 5
+SIMILARIDADE_MINIMA = 0.3
+
+
+@dataclass(frozen=True)
+class _Entrada:
+    id: int
+    nome: str
+    pais: str | None
+    nomes: frozenset[str]   # nomes normalizados (catálogo, SofaScore, nome curto)
+    palavras: frozenset[str]
+    popularidade: int
+
+
+@dataclass(frozen=True)
+class _Indice:
+    """Catálogo e índices de uma construção; trocado inteiro, numa atribuição só."""
+    entradas: tuple[_Entrada, ...] = ()
+    prefixos: dict[str, list[int]] = field(default_factory=dict)
+    trigramas: dict[str, list[int]] = field(default_factory=dict)
+
+
+def _trigramas(texto: str) -> set[str]:
+    texto = f"  {texto} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceTypeahead:
+    def __init__(self, checagem: float = 60.0, recarga: float = 600.0,
+                 validade_negativa: float = 3600.0, max_negativos: int = 10_000):
+        self._checagem = checagem
+        self._recarga = recarga
+        self._validade_negativa = validade_negativa
+        self._max_negativos = max_negativos
+        # `_lock` só decide quem reconstrói; a construção corre fora dele e os
+        # leitores (threads do threadpool) pegam `_indice` uma vez por consulta, sem lock.
+        self._lock = threading.Lock()
+        self._indice = _Indice()
+        self._negativos: OrderedDict[str, float] = OrderedDict()
+        self._lock_negativos = threading.Lock()
+        self._versao: int | None = None
+        self._construido_em = 0.0
+        self._conferido_em = 0.0
+        self._construindo = False
+        self.construcoes = 0
+        self.consultas = 0
+        self.locais = 0
+        self.negativos_servidos = 0
+
+    def invalidar(self) -> None:
+        with self._lock:
+            self._versao = None
+
+    @staticmethod
+    def _construir() -> _Indice:
+        popularidade = Counter(contagem_clubes_diario())
+        for time_id, n in contagem_clubes_coracao().items():
+            popularidade[time_id] += PESO_CORACAO * n
+
+        nomes: dict[int, list[str]] = defaultdict(list)
+        paises: dict[int, str | None] = {}
+        for clube in listar_todos_clubes():
+            if clube["nome"]:
+                nomes[clube["id"]].append(clube["nome"])
+                paises[clube["id"]] = clube["pais"]
+        for t in listar_times():
+            nomes[t["id"]].extend(n for n in (t["nome"], t["nome_curto"]) if n)
+            paises.setdefault(t["id"], t["pais"])
+
+        entradas = []
+        for time_id, lista in nomes.items():
+            normalizados = frozenset(filter(None, map(normalizar_nome, lista)))
+            if not normalizados:
+                continue
+            entradas.append(_Entrada(
+                id=time_id, nome=lista[0], pais=paises.get(time_id), nomes=normalizados,
+                palavras=frozenset(p for n in normalizados for p in n.split()),
+                popularidade=popularidade[time_id],
+            ))
+        entradas.sort(key=lambda e: (-e.popularidade, e.nome))
+
+        prefixos: dict[str, list[int]] = defaultdict(list)
+        trigramas: dict[str, list[int]] = defaultdict(list)
+        for i, e in enumerate(entradas):
+            for chave in {p[:n] for p in e.palavras for n in range(1, min(len(p), PREFIXO_MAX) + 1)}:
+                prefixos[chave].append(i)
+            for tri in set().union(*map(_trigramas, e.nomes)):
+                trigramas[tri].append(i)
+
+        return _Indice(tuple(entradas), dict(prefixos), dict(trigramas))
+
+    def _atualizar(self) -> None:
+        with self._lock:
+            agora = time.monotonic()
+            if self._construindo or (self._versao is not None and agora - self._conferido_em < self._checagem):
+                return
+            # Quem chega durante a construção segue com o índice atual.
+            self._construindo = True
+            self._conferido_em = agora
+        try:
+            versao = versao_clubes()
+            # Recarga periódica também pega popularidade e times novos do SofaScore.
+            if versao != self._versao or agora - self._construido_em > self._recarga:
+                self._indice = self._construir()
+                self._versao = versao
+                self._construido_em = time.monotonic()
+                self.construcoes += 1
+        finally:
+            with self._lock:
+                self._construindo = False
+
+    @staticmethod
+    def _por_prefixo(indice: _Indice, consulta: str) -> list[int]:
+        palavras = consulta.split()
+        candidatos = indice.prefixos.get(palavras[0][:PREFIXO_MAX], [])
+        if len(palavras) == 1 and len(consulta) <= PREFIXO_MAX:
+            achados = list(candidatos)  # a chave já é o prefixo inteiro
+        else:
+            achados = [
+                i for i in candidatos
+                if all(any(p.startswith(q) for p in indice.entradas[i].palavras) for q in palavras)
+            ]
+        # Ordenação estável: dentro de cada grupo continua valendo a popularidade.
+        achados.sort(key=lambda i: (
+            consulta not in indice.entradas[i].nomes,
+            not any(n.startswith(consulta) for n in indice.entradas[i].nomes),
+        ))
+        return achados
+
+    @staticmethod
+    def _por_similaridade(indice: _Indice, consulta: str) -> list[int]:
+        tris = _trigramas(consulta)
+        comuns = Counter(i for tri in tris for i in indice.trigramas.get(tri, ()))
+        pontuados = []
+        for i, n in comuns.items():
+            total = max(len(tris | _trigramas(nome)) for nome in indice.entradas[i].nomes)
+            similaridade = n / total
+            if similaridade >= SIMILARIDADE_MINIMA:
+                pontuados.append((-similaridade, i))
+        pontuados.sort()
+        return [i for _, i in pontuados]
+
+    @staticmethod
+    def _como_dict(e: _Entrada) -> dict:
+        return {"id": e.id, "nome": e.nome, "pais": e.pais, "logo": team_image_url(e.id),
+                "popularidade": e.popularidade}
+
+    @staticmethod
+    def sugestao_externa(time: dict) -> dict:
+        """Resultado da busca no SofaScore no mesmo formato das sugestões locais."""
+        return {"id": time["id"], "nome": time["nome"], "pais": time.get("pais"),
+                "logo": time.get("logo") or team_image_url(time["id"]), "popularidade": 0}
+
+    def sugerir(self, termo: str, limite: int = 8) -> list[dict]:
+        self._atualizar()
+        self.consultas += 1
+        consulta = normalizar_nome(termo)
+        if not consulta:
+            return []
+        indice = self._indice
+        achados = self._por_prefixo(indice, consulta)
+        if not achados and len(consulta) >= 3:
+            achados = self._por_similaridade(indice, consulta)
+        if achados:
+            self.locais += 1
+        return [self._como_dict(indice.entradas[i]) for i in achados[:limite]]
+
+    def sem_resultado(self, termo: str) -> bool:
+        """O SofaScore já respondeu que não conhece `termo` (dentro da validade)?"""
+        chave = normalizar_nome(termo)
+        with self._lock_negativos:
+            expira = self._negativos.get(chave)
+            if expira is None:
+                return False
+            if expira < time.monotonic():
+                del self._negativos[chave]
+                return False
+            self.negativos_servidos += 1
+            return True
+
+    def registrar_sem_resultado(self, termo: str) -> None:
+        chave = normalizar_nome(termo)
+        with self._lock_negativos:
+            self._negativos[chave] = time.monotonic() + self._validade_negativa
+            self._negativos.move_to_end(chave)
+            while len(self._negativos) > self._max_negativos:
+                self._negativos.popitem(last=False)
+
+    def estatisticas(self) -> dict:
+        return {
+            "entradas":           len(self._indice.entradas),
+            "construcoes":        self.construcoes,
+            "consultas":          self.consultas,
+            "locais":             self.locais,
+            "negativos":          len(self._negativos),
+            "negativos_servidos": self.negativos_servidos,
+        }
+
+
+indice_typeahead = IndiceTypeahead()
@@ -54,6 +54,178 @@ def inicializar_banco() -> None:
             )
         """)
 
+        # Versão de tabelas que ficam em memória: triggers sobem a versão a cada
+        # escrita, inclusive de scripts externos (ex.: scraper/importar_backup.py).
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS versoes_tabela (
+                tabela  TEXT PRIMARY KEY,
+                versao  INTEGER NOT NULL
+            )
+        """)
+        for operacao in ("INSERT", "UPDATE", "DELETE"):
+            c.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS clubes_versao_{operacao.lower()}
+                AFTER {operacao} ON clubes
+                BEGIN
+                    INSERT INTO versoes_tabela (tabela, versao) VALUES ('clubes', 1)
+                    ON CONFLICT(tabela) DO UPDATE SET versao = versao + 1;
+                END
+            """)
+
+        # Busca por nome de clube: nome e apelidos normalizados (sem acento,
+        # minúsculos), rowid = clubes.id. Reconstruída por club_repo quando a
+        # versão de `clubes` ou a dos apelidos em `times` muda. SQLite sem FTS5/trigram fica no LIKE.
+        try:
+            c.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS clubes_busca
+                USING fts5(nome, apelidos, tokenize = 'trigram')
+            """)
+        except sqlite3.OperationalError:
+            pass
+
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS paginas_time (
+                time_id         INTEGER NOT NULL,
+                pagina          INTEGER NOT NULL,
+                ts_min          INTEGER,
+                ts_max          INTEGER,
+                atualizado_em   INTEGER NOT NULL,
+                PRIMARY KEY (time_id, pagina)
+            )
+        """)
+
+        # Times do SofaScore. (`teams` é do schema antigo do scraper Flask.)
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS times (
+                id              INTEGER PRIMARY KEY,
+                nome            TEXT,
+                nome_curto      TEXT,
+                pais            TEXT,
+                atualizado_em   INTEGER
+            )
+        """)
+        # Nome e nome curto dos times que também estão em `clubes` são apelidos
+        # no índice de busca: mudança neles sobe a versão 'times_apelidos'.
+        for operacao, condicao in (
+            ("INSERT", "new.id IN (SELECT id FROM clubes)"),
+            ("UPDATE OF nome, nome_curto", "(old.nome IS NOT new.nome OR old.nome_curto IS NOT new.nome_curto) "
+                                           "AND new.id IN (SELECT id FROM clubes)"),
+            ("DELETE", "old.id IN (SELECT id FROM clubes)"),
+        ):
+            c.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS times_apelidos_versao_{operacao.split()[0].lower()}
+                AFTER {operacao} ON times
+                WHEN {condicao}
+                BEGIN
+                    INSERT INTO versoes_tabela (tabela, versao) VALUES ('times_apelidos', 1)
+                    ON CONFLICT(tabela) DO UPDATE SET versao = versao + 1;
+                END
+            """)
+
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS torneios (
+                id                      INTEGER PRIMARY KEY,
+                nome                    TEXT,
+                unique_tournament_id    INTEGER,
+                categoria               TEXT
+            )
+        """)
+
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS venues (
+                id      INTEGER PRIMARY KEY,
+                nome    TEXT,
+                cidade  TEXT,
+                pais    TEXT
+            )
+        """)
+
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS eventos (
+                id                      INTEGER PRIMARY KEY,
+                inicio                  INTEGER,
+                status                  TEXT,
+                home_id                 INTEGER,
+                away_id                 INTEGER,
+                home_gols               INTEGER,
+                away_gols               INTEGER,
+                tournament_id           INTEGER,
+                unique_tournament_id    INTEGER,
+                season_id               INTEGER,
+                rodada                  INTEGER,
+                venue_id                INTEGER,
+                payload                 TEXT NOT NULL,
+                atualizado_em           INTEGER NOT NULL
+            )
+        """)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_eventos_home_inicio ON eventos (home_id, inicio)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_eventos_away_inicio ON eventos (away_id, inicio)")
+        c.execute("""
+            CREATE INDEX IF NOT EXISTS idx_eventos_temporada
+            ON eventos (unique_tournament_id, season_id, rodada)
+        """)
+
+        # Intervalos [inicio, fim) em que todos os jogos passados do time já estão em `eventos`
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS cobertura_time (
+                time_id     INTEGER NOT NULL,
+                inicio      INTEGER NOT NULL,
+                fim         INTEGER NOT NULL
+            )
+        """)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_cobertura_time ON cobertura_time (time_id)")
+
+        # Catálogo de temporadas de cada torneio (/unique-tournament/{id}/seasons);
+        # ordem 0 = temporada atual
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS temporadas (
+                id                    INTEGER PRIMARY KEY,
+                unique_tournament_id  INTEGER NOT NULL,
+                nome                  TEXT,
+                ano                   TEXT,
+                ano_inicio            INTEGER,
+                ordem                 INTEGER NOT NULL,
+                atualizado_em         INTEGER NOT NULL
+            )
+        """)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_temporadas_torneio ON temporadas (unique_tournament_id, ordem)")
+
+        # Zonas de classificação (campo promotion dos standings) por posição
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS zonas_temporada (
+                unique_tournament_id  INTEGER NOT NULL,
+                season_id             INTEGER NOT NULL,
+                zonas                 TEXT NOT NULL,
+                PRIMARY KEY (unique_tournament_id, season_id)
+            )
+        """)
+
+        # Rodadas de uma temporada baixadas inteiras e só com jogos encerrados.
+        # Fases de copa repetem o número com slugs diferentes, então o slug
+        # ('' quando não há) entra na chave. A tabela só lembra o que não
+        # precisa voltar ao SofaScore: a versão sem slug é simplesmente refeita.
+        colunas = {row[1] for row in c.execute("PRAGMA table_info(rodadas_fechadas)")}
+        if colunas and "slug" not in colunas:
+            c.execute("DROP TABLE rodadas_fechadas")
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS rodadas_fechadas (
+                unique_tournament_id  INTEGER NOT NULL,
+                season_id             INTEGER NOT NULL,
+                rodada                INTEGER NOT NULL,
+                slug                  TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (unique_tournament_id, season_id, rodada, slug)
+            )
+        """)
+
+        # Gols de jogos encerrados (de /event/{id}/incidents): não mudam mais
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS gols_evento (
+                evento_id   INTEGER PRIMARY KEY,
+                gols        TEXT NOT NULL,
+                gravado_em  INTEGER NOT NULL
+            )
+        """)
+
         migrations = [
             ("diario",    "user_id",              "INTEGER"),
             ("diario",    "home_logo",             "TEXT"),
@@ -61,6 +233,10 @@ def inicializar_banco() -> None:
             ("usuarios",  "clube_coracao_id",      "INTEGER"),
             ("usuarios",  "clube_coracao_nome",    "TEXT"),
             ("usuarios",  "clube_coracao_logo",    "TEXT"),
+            ("eventos",   "venue_consultada_em",   "INTEGER"),
+            ("times",     "cor_primaria",          "TEXT"),
+            ("times",     "cor_secundaria",        "TEXT"),
+            ("times",     "cores_em",              "INTEGER"),
         ]
         for table, col, tipo in migrations:
             try:
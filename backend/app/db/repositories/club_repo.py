@@ -1,3 +1,9 @@
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+
 from app.db.database import conectar
 
 
@@ -23,14 +29,205 @@ def consultar_estadio_por_id(id_time: int) -> dict | None:
 
 
 def consultar_estadio_do_clube(nome: str) -> dict | None:
+    clubes = buscar_clubes(nome, limite=1)
+    return {"estadio": clubes[0]["estadio"], "cidade": clubes[0]["cidade"]} if clubes else None
+
+
+def _versao(c, tabela: str) -> int | None:
+    c.execute("SELECT versao FROM versoes_tabela WHERE tabela = ?", (tabela,))
+    row = c.fetchone()
+    return row[0] if row else None
+
+
+def versao_clubes() -> int:
+    conn = conectar()
+    try:
+        return _versao(conn.cursor(), "clubes") or 0
+    finally:
+        conn.close()
+
+
+def normalizar_nome(nome: str) -> str:
+    """'São Paulo FC' -> 'sao paulo fc': sem acento, minúsculo, espaços simples."""
+    sem_acento = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode()
+    return " ".join("".join(ch if ch.isalnum() else " " for ch in sem_acento.lower()).split())
+
+
+def _tem_indice_busca(c) -> bool:
+    c.execute("SELECT 1 FROM sqlite_master WHERE name = 'clubes_busca'")
+    return c.fetchone() is not None
+
+
+def _sincronizar_busca(c) -> None:
+    """Reconstrói `clubes_busca` se `clubes` ou os apelidos em `times` mudaram desde a última reconstrução."""
+    versoes = {"clubes_busca": _versao(c, "clubes") or 0, "clubes_busca_apelidos": _versao(c, "times_apelidos") or 0}
+    if all(_versao(c, tabela) == versao for tabela, versao in versoes.items()):
+        return
+    # Apelidos: nome e nome curto que o SofaScore usa para o mesmo id.
+    c.execute("""
+        SELECT c.id, c.nome, t.nome AS nome_sofascore, t.nome_curto
+        FROM clubes c LEFT JOIN times t ON t.id = c.id
+    """)
+    linhas = []
+    for row in c.fetchall():
+        nome = normalizar_nome(row["nome"] or "")
+        apelidos = {normalizar_nome(a) for a in (row["nome_sofascore"], row["nome_curto"]) if a} - {nome}
+        linhas.append((row["id"], nome, " | ".join(sorted(apelidos))))
+    c.execute("DELETE FROM clubes_busca")
+    c.executemany("INSERT INTO clubes_busca (rowid, nome, apelidos) VALUES (?, ?, ?)", linhas)
+    c.executemany("""
+        INSERT INTO versoes_tabela (tabela, versao) VALUES (?, ?)
+        ON CONFLICT(tabela) DO UPDATE SET versao = excluded.versao
+    """, list(versoes.items()))
+    c.connection.commit()
+
+
+def buscar_clubes(termo: str, limite: int = 10) -> list[dict]:
+    """
+    Clubes cujo nome (ou apelido) contém `termo`, ignorando acento e caixa.
+
+    Ordem: nome idêntico, nome começando pelo termo, depois relevância (bm25)
+    do índice de trigramas. Termos com menos de 3 letras, ou SQLite sem
+    FTS5, caem no LIKE.
+    """
+    normalizado = normalizar_nome(termo)
+    if not normalizado:
+        return []
     conn = conectar()
     try:
         c = conn.cursor()
-        c.execute(
-            "SELECT estadio, cidade FROM clubes WHERE nome LIKE ? LIMIT 1",
-            (f"%{nome}%",)
-        )
-        row = c.fetchone()
-        return dict(row) if row else None
+        if len(normalizado) >= 3 and _tem_indice_busca(c):
+            _sincronizar_busca(c)
+            c.execute("""
+                SELECT cl.id, cl.nome, cl.pais, cl.cidade, cl.estadio, cl.capacidade
+                FROM clubes_busca b JOIN clubes cl ON cl.id = b.rowid
+                WHERE clubes_busca MATCH ?
+                ORDER BY b.nome = ? DESC, b.nome LIKE ? DESC, rank
+                LIMIT ?
+            """, ('"' + normalizado.replace('"', '""') + '"', normalizado, normalizado + "%", limite))
+        else:
+            c.execute(
+                "SELECT id, nome, pais, cidade, estadio, capacidade FROM clubes WHERE nome LIKE ? LIMIT ?",
+                (f"%{termo}%", limite)
+            )
+        return [dict(row) for row in c.fetchall()]
     finally:
         conn.close()
+
+
+Estadio = tuple[str, str]  # (estadio, cidade)
+_AUSENTE = object()
+
+
+@dataclass(frozen=True)
+class _Carga:
+    """Uma carga da tabela `clubes`; trocada inteira a cada recarga."""
+    versao: int | None
+    por_id: dict[int, Estadio] = field(default_factory=dict)
+    por_nome: dict[str, Estadio] = field(default_factory=dict)
+    # Nomes que não bateram exato e foram ao índice de busca (LRU).
+    por_trecho: OrderedDict[str, Estadio | None] = field(default_factory=OrderedDict)
+
+
+class IndiceClubes:
+    """
+    A tabela `clubes` em memória, por id e por nome normalizado.
+
+    Carrega tudo numa consulta só e depois responde sem tocar no banco; só
+    nome que não bate exato vai uma vez ao índice de busca (memorizado, até
+    `max_trechos` nomes). A versão da tabela (mantida por triggers) é
+    conferida no máximo a cada `checagem` segundos; se mudou, o índice é
+    recarregado fora do lock e entra numa atribuição só, então consultas
+    nunca esperam a recarga. `invalidar()` força a recarga na próxima consulta.
+    """
+
+    def __init__(self, checagem: float = 60.0, max_trechos: int = 4096):
+        self._checagem = checagem
+        self._max_trechos = max_trechos
+        self._lock = threading.Lock()
+        self._carga = _Carga(versao=None)
+        self._conferido_em = 0.0
+        self.recargas = 0
+
+    def invalidar(self) -> None:
+        with self._lock:
+            self._carga = replace(self._carga, versao=None)
+
+    @staticmethod
+    def _carregar(versao: int) -> _Carga:
+        conn = conectar()
+        try:
+            c = conn.cursor()
+            c.execute("SELECT id, nome, cidade, estadio FROM clubes ORDER BY rowid")
+            rows = c.fetchall()
+        finally:
+            conn.close()
+        por_id, por_nome = {}, {}
+        for row in rows:
+            estadio = (row["estadio"], row["cidade"])
+            por_id[row["id"]] = estadio
+            if row["nome"]:
+                por_nome.setdefault(normalizar_nome(row["nome"]), estadio)
+        return _Carga(versao=versao, por_id=por_id, por_nome=por_nome)
+
+    def _atualizar(self) -> None:
+        with self._lock:
+            agora = time.monotonic()
+            if self._carga.versao is not None and agora - self._conferido_em < self._checagem:
+                return
+            self._conferido_em = agora
+        versao = versao_clubes()
+        if versao == self._carga.versao:
+            return
+        carga = self._carregar(versao)
+        with self._lock:
+            # Duas recargas concorrentes: a versão mais nova fica.
+            if self._carga.versao is None or versao >= self._carga.versao:
+                self._carga = carga
+                self.recargas += 1
+
+    @staticmethod
+    def _como_dict(estadio: Estadio | None) -> dict | None:
+        return {"estadio": estadio[0], "cidade": estadio[1]} if estadio else None
+
+    def _memorizado(self, carga: _Carga, trecho: str):
+        with self._lock:
+            estadio = carga.por_trecho.get(trecho, _AUSENTE)
+            if estadio is not _AUSENTE:
+                carga.por_trecho.move_to_end(trecho)
+            return estadio
+
+    def _memorizar(self, carga: _Carga, trecho: str, estadio: Estadio | None) -> None:
+        with self._lock:
+            carga.por_trecho[trecho] = estadio
+            carga.por_trecho.move_to_end(trecho)
+            while len(carga.por_trecho) > self._max_trechos:
+                carga.por_trecho.popitem(last=False)
+
+    def estadio_por_id(self, id_time: int) -> dict | None:
+        self._atualizar()
+        return self._como_dict(self._carga.por_id.get(id_time))
+
+    def estadio_por_nome(self, nome: str) -> dict | None:
+        """Como consultar_estadio_do_clube, mas nome exato (normalizado) sai da memória."""
+        self._atualizar()
+        carga = self._carga
+        trecho = normalizar_nome(nome)
+        if not trecho:
+            return None
+        estadio = carga.por_nome.get(trecho)
+        if estadio is None:
+            estadio = self._memorizado(carga, trecho)
+            if estadio is _AUSENTE:
+                dados = consultar_estadio_do_clube(nome)
+                estadio = (dados["estadio"], dados["cidade"]) if dados else None
+                self._memorizar(carga, trecho, estadio)
+        return self._como_dict(estadio)
+
+    def estatisticas(self) -> dict:
+        carga = self._carga
+        return {"clubes": len(carga.por_id), "trechos": len(carga.por_trecho),
+                "versao": carga.versao, "recargas": self.recargas}
+
+
+indice_clubes = IndiceClubes()
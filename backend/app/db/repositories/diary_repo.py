@@ -1,5 +1,11 @@
+import re
+from collections import Counter
+
 from app.db.database import conectar
 
+# Escudo direto do SofaScore (".../team/{id}/image") ou pelo proxy local ("/img/team/{id}?tam=64").
+_RE_ID_ESCUDO = re.compile(r"/team/(\d+)(?:/image|/?(?:\?|$))")
+
 
 def ler_diario(user_id: int) -> list[dict]:
     conn = conectar()
@@ -76,3 +82,23 @@ def verificar_jogo_no_diario(user_id: int, id_sofascore: int) -> bool:
         return c.fetchone() is not None
     finally:
         conn.close()
+
+
+def contagem_clubes_diario() -> Counter:
+    """Quantas vezes cada time aparece nos diários (o id está na URL do escudo)."""
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.execute("SELECT home_logo, away_logo FROM diario")
+        return Counter(
+            int(m.group(1))
+            for row in c.fetchall()
+            for logo in row
+            if logo and (m := _RE_ID_ESCUDO.search(logo))
+        )
+    finally:
+        conn.close()
+
+
+def clubes_mais_frequentes(limite: int) -> list[int]:
+    return [time_id for time_id, _ in contagem_clubes_diario().most_common(limite)]
@@ -0,0 +1,478 @@
+import json
+import time
+
+from app.db.database import conectar
+
+# Jogo "notstarted" no banco que começou há menos que isto pode estar rolando
+# (a linha só não foi atualizada): 90 min, intervalo, acréscimos, prorrogação.
+DURACAO_MAXIMA_JOGO = 3 * 3600
+
+_UPSERT_TIME = """
+    INSERT INTO times (id, nome, nome_curto, pais, cor_primaria, cor_secundaria, cores_em, atualizado_em)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        nome = COALESCE(excluded.nome, times.nome),
+        nome_curto = COALESCE(excluded.nome_curto, times.nome_curto),
+        pais = COALESCE(excluded.pais, times.pais),
+        cor_primaria = COALESCE(excluded.cor_primaria, times.cor_primaria),
+        cor_secundaria = COALESCE(excluded.cor_secundaria, times.cor_secundaria),
+        cores_em = COALESCE(excluded.cores_em, times.cores_em),
+        atualizado_em = excluded.atualizado_em
+"""
+
+
+def _linha_time(t: dict, agora: int) -> tuple:
+    cores = t.get("teamColors") or {}
+    return (t["id"], t.get("name"), t.get("shortName"), (t.get("country") or {}).get("name"),
+            cores.get("primary"), cores.get("secondary"), agora if cores.get("primary") else None, agora)
+
+
+def _linhas_evento(e: dict, agora: int) -> tuple[tuple, list[tuple], tuple | None, tuple | None]:
+    home = e.get("homeTeam") or {}
+    away = e.get("awayTeam") or {}
+    torneio = e.get("tournament") or {}
+    unico = torneio.get("uniqueTournament") or {}
+    venue = e.get("venue") or {}
+
+    evento = (
+        e["id"], e.get("startTimestamp"), (e.get("status") or {}).get("type"),
+        home.get("id"), away.get("id"),
+        (e.get("homeScore") or {}).get("display"), (e.get("awayScore") or {}).get("display"),
+        torneio.get("id"), unico.get("id"), (e.get("season") or {}).get("id"),
+        (e.get("roundInfo") or {}).get("round"), venue.get("id"),
+        json.dumps(e, ensure_ascii=False), agora,
+    )
+    times = [_linha_time(t, agora) for t in (home, away) if t.get("id")]
+    linha_torneio = (
+        (torneio["id"], torneio.get("name"), unico.get("id"), (torneio.get("category") or {}).get("name"))
+        if torneio.get("id") else None
+    )
+    linha_venue = (
+        (venue["id"], venue.get("name"), (venue.get("city") or {}).get("name"),
+         (venue.get("country") or {}).get("name"))
+        if venue.get("id") and venue.get("name") else None
+    )
+    return evento, times, linha_torneio, linha_venue
+
+
+def salvar_eventos(eventos: list[dict]) -> None:
+    """Upsert em lote de eventos do SofaScore (e dos times, torneios e venues que eles citam)."""
+    eventos = [e for e in eventos if e.get("id")]
+    if not eventos:
+        return
+    agora = int(time.time())
+    linhas_eventos, times, torneios, venues = {}, {}, {}, {}
+    for e in eventos:
+        evento, linhas_times, linha_torneio, linha_venue = _linhas_evento(e, agora)
+        linhas_eventos[evento[0]] = evento
+        times.update((t[0], t) for t in linhas_times)
+        if linha_torneio:
+            torneios[linha_torneio[0]] = linha_torneio
+        if linha_venue:
+            venues[linha_venue[0]] = linha_venue
+
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.executemany(_UPSERT_TIME, list(times.values()))
+        c.executemany(
+            "INSERT OR REPLACE INTO torneios (id, nome, unique_tournament_id, categoria) VALUES (?, ?, ?, ?)",
+            list(torneios.values())
+        )
+        c.executemany(
+            "INSERT OR REPLACE INTO venues (id, nome, cidade, pais) VALUES (?, ?, ?, ?)",
+            list(venues.values())
+        )
+        # A listagem de /events nem sempre traz venue; não apaga o que /event/{id} já trouxe.
+        c.executemany("""
+            INSERT INTO eventos (
+                id, inicio, status, home_id, away_id, home_gols, away_gols,
+                tournament_id, unique_tournament_id, season_id, rodada, venue_id,
+                payload, atualizado_em
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                inicio = excluded.inicio,
+                status = excluded.status,
+                home_id = excluded.home_id,
+                away_id = excluded.away_id,
+                home_gols = excluded.home_gols,
+                away_gols = excluded.away_gols,
+                tournament_id = excluded.tournament_id,
+                unique_tournament_id = excluded.unique_tournament_id,
+                season_id = COALESCE(excluded.season_id, eventos.season_id),
+                rodada = COALESCE(excluded.rodada, eventos.rodada),
+                venue_id = COALESCE(excluded.venue_id, eventos.venue_id),
+                payload = excluded.payload,
+                atualizado_em = excluded.atualizado_em
+        """, list(linhas_eventos.values()))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def salvar_times(times: list[dict]) -> None:
+    """Upsert em lote de objetos `team` do SofaScore (busca, /team/{id}, standings)."""
+    agora = int(time.time())
+    linhas = {t["id"]: _linha_time(t, agora) for t in times if t and t.get("id")}
+    if not linhas:
+        return
+    conn = conectar()
+    try:
+        conn.executemany(_UPSERT_TIME, list(linhas.values()))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def consultar_times(time_ids: list[int], validade: float | None = None) -> dict[int, dict]:
+    """Metadados guardados (nome, país, cores) por id; com `validade`, só times com cores mais novas que ela."""
+    if not time_ids:
+        return {}
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        marcas = ",".join("?" * len(time_ids))
+        filtro, params = "", list(time_ids)
+        if validade is not None:
+            filtro, params = "AND cores_em >= ?", [*time_ids, time.time() - validade]
+        c.execute(f"""
+            SELECT id, nome, nome_curto, pais, cor_primaria, cor_secundaria, atualizado_em
+            FROM times WHERE id IN ({marcas}) {filtro}
+        """, params)
+        return {row["id"]: dict(row) for row in c.fetchall()}
+    finally:
+        conn.close()
+
+
+def listar_times() -> list[dict]:
+    """Times do SofaScore já vistos em eventos."""
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.execute("SELECT id, nome, nome_curto, pais FROM times")
+        return [dict(row) for row in c.fetchall()]
+    finally:
+        conn.close()
+
+
+def _evento_da_linha(row) -> dict:
+    """Payload original, com a venue do banco quando a listagem veio sem ela."""
+    e = json.loads(row["payload"])
+    if not (e.get("venue") or {}).get("name") and row["venue_nome"]:
+        e["venue"] = {"id": row["venue_id"], "name": row["venue_nome"],
+                      "city": {"name": row["venue_cidade"] or "A definir"}}
+    return e
+
+
+def eventos_do_time(time_id: int, inicio: float | None = None, fim: float | None = None) -> list[dict]:
+    """Eventos do time com `inicio` em [inicio, fim), do mais recente para o mais antigo."""
+    inicio = -1 if inicio is None else inicio
+    fim = 2 ** 62 if fim is None else fim
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.execute("""
+            SELECT e.payload, e.venue_id, v.nome AS venue_nome, v.cidade AS venue_cidade
+            FROM eventos e LEFT JOIN venues v ON v.id = e.venue_id
+            WHERE (e.home_id = ? OR e.away_id = ?) AND e.inicio >= ? AND e.inicio < ?
+            ORDER BY e.inicio DESC
+        """, (time_id, time_id, inicio, fim))
+        return [_evento_da_linha(row) for row in c.fetchall()]
+    finally:
+        conn.close()
+
+
+def eventos_da_temporada(tournament_id: int, season_id: int, rodadas: list[int]) -> list[dict]:
+    """Eventos guardados das rodadas pedidas de uma temporada."""
+    if not rodadas:
+        return []
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        marcas = ",".join("?" * len(rodadas))
+        c.execute(f"""
+            SELECT e.payload, e.venue_id, v.nome AS venue_nome, v.cidade AS venue_cidade
+            FROM eventos e LEFT JOIN venues v ON v.id = e.venue_id
+            WHERE e.unique_tournament_id = ? AND e.season_id = ? AND e.rodada IN ({marcas})
+            ORDER BY e.inicio
+        """, (tournament_id, season_id, *rodadas))
+        return [_evento_da_linha(row) for row in c.fetchall()]
+    finally:
+        conn.close()
+
+
+def resultados_da_temporada(tournament_id: int, season_id: int) -> list[dict]:
+    """Placar final de cada jogo encerrado da temporada, em ordem de início."""
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.execute("""
+            SELECT id, inicio, rodada, home_id, away_id, home_gols, away_gols FROM eventos
+            WHERE unique_tournament_id = ? AND season_id = ? AND status = 'finished'
+              AND home_gols IS NOT NULL AND away_gols IS NOT NULL
+            ORDER BY inicio
+        """, (tournament_id, season_id))
+        return [dict(row) for row in c.fetchall()]
+    finally:
+        conn.close()
+
+
+def linhas_resultados(time_id: int | None = None, tournament_id: int | None = None,
+                      season_id: int | None = None) -> list[tuple]:
+    """(inicio, season_id, home_id, away_id, home_gols, away_gols) dos jogos encerrados do time ou torneio."""
+    filtros, params = ["status = 'finished'", "home_gols IS NOT NULL", "away_gols IS NOT NULL"], []
+    if time_id is not None:
+        filtros.append("(home_id = ? OR away_id = ?)")
+        params += [time_id, time_id]
+    if tournament_id is not None:
+        filtros.append("unique_tournament_id = ?")
+        params.append(tournament_id)
+    if season_id is not None:
+        filtros.append("season_id = ?")
+        params.append(season_id)
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.execute(f"""
+            SELECT inicio, COALESCE(season_id, 0), home_id, away_id, home_gols, away_gols
+            FROM eventos WHERE {" AND ".join(filtros)}
+        """, params)
+        return [tuple(row) for row in c.fetchall()]
+    finally:
+        conn.close()
+
+
+def rodadas_fechadas(tournament_id: int, season_id: int) -> set[tuple[int, str]]:
+    """(rodada, slug) das rodadas fechadas; slug '' quando a rodada não tem."""
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.execute("SELECT rodada, slug FROM rodadas_fechadas WHERE unique_tournament_id = ? AND season_id = ?",
+                  (tournament_id, season_id))
+        return {(row["rodada"], row["slug"]) for row in c.fetchall()}
+    finally:
+        conn.close()
+
+
+def fechar_rodadas(tournament_id: int, season_id: int, rodadas: list[tuple[int, str]]) -> None:
+    """Marca rodadas (rodada, slug) inteiras já no banco e encerradas: não precisam mais ir ao SofaScore."""
+    if not rodadas:
+        return
+    conn = conectar()
+    try:
+        conn.executemany(
+            "INSERT OR IGNORE INTO rodadas_fechadas (unique_tournament_id, season_id, rodada, slug) "
+            "VALUES (?, ?, ?, ?)",
+            [(tournament_id, season_id, r, slug) for r, slug in rodadas]
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def rodadas_em_dia(tournament_id: int, season_id: int, rodadas: list[int], agora: float) -> bool:
+    """
+    Todas as `rodadas` têm jogos no banco e nenhum deles ficou parado no tempo
+    (marcado para antes de `agora` e ainda sem começar ou em andamento)?
+    """
+    if not rodadas:
+        return True
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        marcas = ",".join("?" * len(rodadas))
+        c.execute(f"""
+            SELECT rodada, TOTAL(status IN ('notstarted', 'inprogress') AND inicio <= ?) AS atrasados
+            FROM eventos
+            WHERE unique_tournament_id = ? AND season_id = ? AND rodada IN ({marcas})
+            GROUP BY rodada
+        """, (agora, tournament_id, season_id, *rodadas))
+        atrasados = {row["rodada"]: row["atrasados"] for row in c.fetchall()}
+    finally:
+        conn.close()
+    return all(atrasados.get(r) == 0 for r in rodadas)
+
+
+def venues_de_eventos(event_ids: list[int], validade: float) -> dict[int, tuple[str, str] | None]:
+    """
+    Venue já resolvida de cada evento: (estadio, cidade), ou None se o
+    SofaScore foi consultado e não tinha venue (para sempre, se o jogo já
+    terminou; por `validade` segundos, se não). Ids ausentes precisam ir ao
+    SofaScore.
+    """
+    if not event_ids:
+        return {}
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        marcas = ",".join("?" * len(event_ids))
+        c.execute(f"""
+            SELECT e.id, v.nome, v.cidade
+            FROM eventos e LEFT JOIN venues v ON v.id = e.venue_id
+            WHERE e.id IN ({marcas}) AND (
+                v.nome IS NOT NULL
+                OR (e.venue_consultada_em IS NOT NULL AND (e.status = 'finished' OR e.venue_consultada_em > ?))
+            )
+        """, [*event_ids, time.time() - validade])
+        return {
+            row["id"]: (row["nome"], row["cidade"] or "A definir") if row["nome"] else None
+            for row in c.fetchall()
+        }
+    finally:
+        conn.close()
+
+
+def marcar_venues_consultadas(event_ids: list[int]) -> None:
+    if not event_ids:
+        return
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        agora = int(time.time())
+        c.executemany("UPDATE eventos SET venue_consultada_em = ? WHERE id = ?", [(agora, i) for i in event_ids])
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def venues_padrao(home_ids: list[int]) -> dict[int, tuple[str, str]]:
+    """Venue mais frequente dos jogos em casa de cada time, aprendida dos eventos guardados."""
+    if not home_ids:
+        return {}
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        marcas = ",".join("?" * len(home_ids))
+        c.execute(f"""
+            SELECT e.home_id, v.nome, v.cidade, COUNT(*) AS jogos
+            FROM eventos e JOIN venues v ON v.id = e.venue_id
+            WHERE e.home_id IN ({marcas})
+            GROUP BY e.home_id, e.venue_id
+            ORDER BY jogos
+        """, list(home_ids))
+        # Ordem crescente: a venue mais frequente de cada time sobrescreve as outras.
+        return {row["home_id"]: (row["nome"], row["cidade"] or "A definir") for row in c.fetchall()}
+    finally:
+        conn.close()
+
+
+def ha_jogo_perto(agora: float, janela: float, time_id: int | None = None,
+                  torneio_id: int | None = None) -> bool:
+    """Existe jogo do time (ou do torneio) começando a menos de `janela` segundos de `agora`?"""
+    if time_id is not None:
+        filtro, params = "(home_id = ? OR away_id = ?)", (time_id, time_id)
+    else:
+        filtro, params = "unique_tournament_id = ?", (torneio_id,)
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.execute(
+            f"SELECT 1 FROM eventos WHERE {filtro} AND inicio BETWEEN ? AND ? LIMIT 1",
+            (*params, agora - janela, agora + janela)
+        )
+        return c.fetchone() is not None
+    finally:
+        conn.close()
+
+
+def eventos_ao_vivo(time_ids: list[int], agora: float, janela: float) -> list[int]:
+    """
+    Ids dos eventos dos times em andamento, que começam em até `janela`
+    segundos, ou que ainda constam como não iniciados mas começaram há menos
+    de DURACAO_MAXIMA_JOGO (o poller confere o status real).
+    """
+    if not time_ids:
+        return []
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        marcas = ",".join("?" * len(time_ids))
+        c.execute(f"""
+            SELECT id FROM eventos
+            WHERE (home_id IN ({marcas}) OR away_id IN ({marcas}))
+              AND (status = 'inprogress' OR (status = 'notstarted' AND inicio BETWEEN ? AND ?))
+            ORDER BY inicio
+        """, [*time_ids, *time_ids, agora - max(janela, DURACAO_MAXIMA_JOGO), agora + janela])
+        return [row["id"] for row in c.fetchall()]
+    finally:
+        conn.close()
+
+
+def gols_de_eventos(event_ids: list[int]) -> dict[int, list[dict]]:
+    """Gols já guardados de jogos encerrados, por id de evento."""
+    if not event_ids:
+        return {}
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        marcas = ",".join("?" * len(event_ids))
+        c.execute(f"SELECT evento_id, gols FROM gols_evento WHERE evento_id IN ({marcas})", list(event_ids))
+        return {row["evento_id"]: json.loads(row["gols"]) for row in c.fetchall()}
+    finally:
+        conn.close()
+
+
+def salvar_gols(gols_por_evento: dict[int, list[dict]]) -> None:
+    """Guarda para sempre os gols de jogos encerrados."""
+    if not gols_por_evento:
+        return
+    agora = int(time.time())
+    conn = conectar()
+    try:
+        conn.executemany(
+            "INSERT OR REPLACE INTO gols_evento (evento_id, gols, gravado_em) VALUES (?, ?, ?)",
+            [(event_id, json.dumps(gols, ensure_ascii=False), agora) for event_id, gols in gols_por_evento.items()]
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def eventos_finalizados(event_ids: list[int]) -> set[int]:
+    if not event_ids:
+        return set()
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        marcas = ",".join("?" * len(event_ids))
+        c.execute(f"SELECT id FROM eventos WHERE id IN ({marcas}) AND status = 'finished'", list(event_ids))
+        return {row["id"] for row in c.fetchall()}
+    finally:
+        conn.close()
+
+
+def _intervalos(c, time_id: int) -> list[tuple[int, int]]:
+    c.execute("SELECT inicio, fim FROM cobertura_time WHERE time_id = ? ORDER BY inicio", (time_id,))
+    return [(row["inicio"], row["fim"]) for row in c.fetchall()]
+
+
+def registrar_cobertura(time_id: int, inicio: float, fim: float) -> None:
+    """Marca [inicio, fim) como completo no banco, fundindo com os intervalos já conhecidos."""
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        fundidos: list[list[int]] = []
+        for a, b in sorted(_intervalos(c, time_id) + [(int(inicio), int(fim))]):
+            if fundidos and a <= fundidos[-1][1]:
+                fundidos[-1][1] = max(fundidos[-1][1], b)
+            else:
+                fundidos.append([a, b])
+        c.execute("DELETE FROM cobertura_time WHERE time_id = ?", (time_id,))
+        c.executemany("INSERT INTO cobertura_time (time_id, inicio, fim) VALUES (?, ?, ?)",
+                      [(time_id, a, b) for a, b in fundidos])
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def cobertura_ate(time_id: int, inicio: float) -> int | None:
+    """Fim do intervalo completo que contém `inicio`, ou None."""
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        for a, b in _intervalos(c, time_id):
+            if a <= inicio < b:
+                return b
+        return None
+    finally:
+        conn.close()
@@ -0,0 +1,30 @@
+import time
+
+from app.db.database import conectar
+
+
+def registrar_pagina(time_id: int, pagina: int, ts_min: int | None, ts_max: int | None) -> None:
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.execute("""
+            INSERT OR REPLACE INTO paginas_time (time_id, pagina, ts_min, ts_max, atualizado_em)
+            VALUES (?, ?, ?, ?, ?)
+        """, (time_id, pagina, ts_min, ts_max, int(time.time())))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def indice_paginas(time_id: int) -> list[dict]:
+    """Faixas de timestamp conhecidas de cada página de /events/last do time."""
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.execute(
+            "SELECT pagina, ts_min, ts_max, atualizado_em FROM paginas_time WHERE time_id = ? ORDER BY pagina",
+            (time_id,)
+        )
+        return [dict(row) for row in c.fetchall()]
+    finally:
+        conn.close()
@@ -0,0 +1,76 @@
+import json
+import time
+
+from app.db.database import conectar
+
+
+def _ano_inicio(ano: str | None) -> int | None:
+    """Ano em que a temporada começa: "2024" -> 2024, "24/25" -> 2024, "2024/2025" -> 2024."""
+    inicio = (ano or "").split("/")[0].strip()
+    if not inicio.isdigit():
+        return None
+    return int(inicio) + 2000 if len(inicio) == 2 else int(inicio)
+
+
+def salvar_temporadas(tournament_id: int, seasons: list[dict]) -> None:
+    """Substitui o catálogo do torneio pela lista do SofaScore (mais recente primeiro)."""
+    agora = int(time.time())
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.execute("DELETE FROM temporadas WHERE unique_tournament_id = ?", (tournament_id,))
+        c.executemany("""
+            INSERT OR REPLACE INTO temporadas (id, unique_tournament_id, nome, ano, ano_inicio, ordem, atualizado_em)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (s["id"], tournament_id, s.get("name"), s.get("year"), _ano_inicio(s.get("year")), ordem, agora)
+            for ordem, s in enumerate(seasons) if s.get("id")
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def temporadas_do_torneio(tournament_id: int) -> tuple[list[dict], int | None]:
+    """Catálogo guardado (mais recente primeiro) e quando foi atualizado (None se nunca)."""
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.execute("""
+            SELECT id, nome, ano, ano_inicio, atualizado_em FROM temporadas
+            WHERE unique_tournament_id = ? ORDER BY ordem
+        """, (tournament_id,))
+        temporadas = [dict(row) for row in c.fetchall()]
+        return temporadas, min((t["atualizado_em"] for t in temporadas), default=None)
+    finally:
+        conn.close()
+
+
+def salvar_zonas(tournament_id: int, season_id: int, zonas: dict[int, dict]) -> None:
+    """Guarda o `promotion` de cada posição dos standings da temporada."""
+    if not zonas:
+        return
+    conn = conectar()
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO zonas_temporada (unique_tournament_id, season_id, zonas) VALUES (?, ?, ?)",
+            (tournament_id, season_id, json.dumps(zonas, ensure_ascii=False))
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def zonas_da_temporada(tournament_id: int, season_id: int) -> dict[int, dict]:
+    """Zonas por posição da temporada; sem elas, as da temporada mais recente guardada do torneio."""
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.execute("""
+            SELECT zonas FROM zonas_temporada WHERE unique_tournament_id = ?
+            ORDER BY season_id = ? DESC, season_id DESC LIMIT 1
+        """, (tournament_id, season_id))
+        row = c.fetchone()
+        return {int(posicao): promo for posicao, promo in json.loads(row["zonas"]).items()} if row else {}
+    finally:
+        conn.close()
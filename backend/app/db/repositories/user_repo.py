@@ -69,3 +69,26 @@ def remover_clube_coracao(user_id: int) -> bool:
         return True
     finally:
         conn.close()
+
+
+def listar_clubes_coracao() -> list[int]:
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.execute("SELECT DISTINCT clube_coracao_id FROM usuarios WHERE clube_coracao_id IS NOT NULL")
+        return [row[0] for row in c.fetchall()]
+    finally:
+        conn.close()
+
+
+def contagem_clubes_coracao() -> dict[int, int]:
+    conn = conectar()
+    try:
+        c = conn.cursor()
+        c.execute("""
+            SELECT clube_coracao_id, COUNT(*) FROM usuarios
+            WHERE clube_coracao_id IS NOT NULL GROUP BY clube_coracao_id
+        """)
+        return {row[0]: row[1] for row in c.fetchall()}
+    finally:
+        conn.close()
@@ -1,8 +1,19 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.config import settings
 from app.db.database import inicializar_banco
-from app.api.routes import auth, clubs, diary, travel, leagues
+from app.core.classificacao import motor_classificacao
+from app.core.typeahead import indice_typeahead
+from app.db.repositories.club_repo import indice_clubes
+from app.scraper.aquecimento import aquecedor
+from app.scraper.client import estatisticas, fechar_sessoes, fechar_sessoes_async, rastrear_dados_antigos
+from app.scraper.parser import voos_jogos
+from app.scraper.ao_vivo import painel_ao_vivo
+from app.scraper.imagens import cache_imagens
+from app.api.routes import auth, clubs, diary, travel, leagues, images, live, matches
 
 app = FastAPI(title="De Olho No Jogo", version="2.1.0")
 
@@ -12,20 +23,60 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Dados-Antigos", "X-Dados-Idade"],
 )
 
+
+@app.middleware("http")
+async def marcar_dados_antigos(request: Request, call_next):
+    """Sinaliza quando a resposta usou payload antigo do SofaScore (upstream fora)."""
+    marcas = rastrear_dados_antigos()
+    response = await call_next(request)
+    if marcas:
+        response.headers["X-Dados-Antigos"] = "1"
+        response.headers["X-Dados-Idade"] = str(int(time.time() - min(marcas)))
+    return response
+
+
 app.include_router(auth.router,    prefix="/api/auth",    tags=["auth"])
 app.include_router(clubs.router,   prefix="/api/clubs",   tags=["clubs"])
 app.include_router(diary.router,   prefix="/api/diary",   tags=["diary"])
 app.include_router(travel.router,  prefix="/api/travel",  tags=["travel"])
 app.include_router(leagues.router, prefix="/api/leagues", tags=["leagues"])
+app.include_router(matches.router, prefix="/api/matches", tags=["matches"])
+app.include_router(live.router,    prefix="/api/live",    tags=["live"])
+app.include_router(images.router,  prefix="/img",         tags=["img"])
 
 
 @app.on_event("startup")
-def startup():
+async def startup():
     inicializar_banco()
+    if settings.AQUECIMENTO_ATIVO:
+        aquecedor.iniciar()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await aquecedor.parar()
+    await painel_ao_vivo.parar()
+    await fechar_sessoes_async()
+    fechar_sessoes()
 
 
 @app.get("/health")
 def health():
     return {"status": "ok", "version": "2.1.0"}
+
+
+@app.get("/metrics")
+def metrics():
+    return {
+        **estatisticas(),
+        "single_flight_jogos": voos_jogos.estatisticas(),
+        "aquecimento":         aquecedor.estatisticas(),
+        "indice_clubes":       indice_clubes.estatisticas(),
+        "typeahead":           indice_typeahead.estatisticas(),
+        "classificacao":       motor_classificacao.estatisticas(),
+        "ao_vivo":             painel_ao_vivo.estatisticas(),
+        "imagens":             cache_imagens.estatisticas(),
+    }
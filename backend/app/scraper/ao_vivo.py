@@ -0,0 +1,159 @@
+"""
+Placar ao vivo empurrado para os clientes.
+
+Cada jogo acompanhado tem um único poller, compartilhado por todos os
+assinantes: ele consulta /event/{id} a cada AO_VIVO_INTERVALO_S (ignorando o
+cache de respostas) e só busca os incidentes quando o placar muda. As
+mudanças viram mensagens nas filas dos assinantes. O custo no SofaScore
+cresce com o número de jogos ao vivo, não com o de espectadores.
+
+O poller para quando o último assinante sai ou o jogo termina.
+"""
+import asyncio
+import logging
+import time
+
+from app.config import settings
+from app.scraper.client import get_async, sem_cache
+from app.scraper.parser import STATUS_FINAL, buscar_detalhes_jogo_async
+from app.db.repositories.evento_repo import salvar_eventos
+
+logger = logging.getLogger(__name__)
+
+# Jogo que ainda não começou é consultado no máximo a cada ESPERA_MAXIMA.
+ESPERA_MAXIMA = 5 * 60
+TAMANHO_FILA = 100
+
+
+class _Poller:
+    def __init__(self, event_id: int):
+        self.event_id = event_id
+        self.assinantes: set[asyncio.Queue] = set()
+        self.estado: dict | None = None
+        self.tarefa: asyncio.Task | None = None
+
+
+def _mensagem(estado: dict, gols_novos: list[dict]) -> dict:
+    return {
+        "tipo":       "fim" if estado["status"] == STATUS_FINAL else "placar",
+        "id":         estado["id"],
+        "status":     estado["status"],
+        "descricao":  estado["descricao"],
+        "placar":     f"{estado['home_gols']} - {estado['away_gols']}",
+        "home_gols":  estado["home_gols"],
+        "away_gols":  estado["away_gols"],
+        "gols_novos": gols_novos,
+    }
+
+
+class PainelAoVivo:
+    def __init__(self, intervalo: float):
+        self._intervalo = intervalo
+        self._pollers: dict[int, _Poller] = {}
+        self.consultas = 0
+        self.mensagens = 0
+        self.descartadas = 0
+
+    def assinar(self, fila: asyncio.Queue, event_ids: list[int]) -> None:
+        """Passa a entregar em `fila` as mudanças dos jogos (o estado atual vai na hora)."""
+        for event_id in event_ids:
+            poller = self._pollers.get(event_id)
+            if poller is None:
+                poller = self._pollers[event_id] = _Poller(event_id)
+                poller.tarefa = asyncio.create_task(self._rodar(poller))
+            poller.assinantes.add(fila)
+            if poller.estado is not None:
+                self._entregar(fila, _mensagem(poller.estado, poller.estado["gols"]))
+
+    def cancelar(self, fila: asyncio.Queue) -> None:
+        for event_id, poller in list(self._pollers.items()):
+            poller.assinantes.discard(fila)
+            if not poller.assinantes:
+                del self._pollers[event_id]
+                if poller.tarefa is not None:
+                    poller.tarefa.cancel()
+
+    def _entregar(self, fila: asyncio.Queue, mensagem: dict) -> None:
+        try:
+            fila.put_nowait(mensagem)
+            self.mensagens += 1
+        except asyncio.QueueFull:
+            # Cliente lento: cada mensagem traz o placar inteiro, a próxima corrige.
+            self.descartadas += 1
+
+    def _publicar(self, poller: _Poller, mensagem: dict) -> None:
+        for fila in list(poller.assinantes):
+            self._entregar(fila, mensagem)
+
+    async def _consultar(self, event_id: int, anterior: dict | None) -> dict | None:
+        self.consultas += 1
+        with sem_cache():
+            data = await get_async(f"/event/{event_id}")
+        e = (data or {}).get("event")
+        if not e:
+            return None
+        await asyncio.to_thread(salvar_eventos, [e])
+        estado = {
+            "id":        event_id,
+            "inicio":    e.get("startTimestamp"),
+            "status":    (e.get("status") or {}).get("type"),
+            "descricao": (e.get("status") or {}).get("description"),
+            "home_gols": (e.get("homeScore") or {}).get("display", 0),
+            "away_gols": (e.get("awayScore") or {}).get("display", 0),
+            "gols":      anterior["gols"] if anterior else [],
+        }
+        placar = (estado["home_gols"], estado["away_gols"])
+        if anterior is None or placar != (anterior["home_gols"], anterior["away_gols"]):
+            if any(placar):
+                with sem_cache():
+                    gols = await buscar_detalhes_jogo_async(event_id)
+                if gols is not None:
+                    estado["gols"] = gols
+        return estado
+
+    def _espera(self, estado: dict | None) -> float:
+        if estado and estado["status"] == "notstarted" and estado["inicio"]:
+            return min(max(self._intervalo, estado["inicio"] - time.time()), ESPERA_MAXIMA)
+        return self._intervalo
+
+    async def _rodar(self, poller: _Poller) -> None:
+        try:
+            while poller.assinantes:
+                try:
+                    estado = await self._consultar(poller.event_id, poller.estado)
+                except Exception as e:
+                    logger.warning(f"Ao vivo {poller.event_id}: {e}")
+                    estado = None
+                if estado is not None:
+                    anterior = poller.estado
+                    poller.estado = estado
+                    mudou = anterior is None or any(
+                        estado[k] != anterior[k] for k in ("status", "descricao", "home_gols", "away_gols")
+                    )
+                    if mudou:
+                        vistos = anterior["gols"] if anterior else []
+                        self._publicar(poller, _mensagem(estado, [g for g in estado["gols"] if g not in vistos]))
+                    if estado["status"] == STATUS_FINAL:
+                        break
+                await asyncio.sleep(self._espera(estado))
+        finally:
+            if self._pollers.get(poller.event_id) is poller:
+                del self._pollers[poller.event_id]
+
+    async def parar(self) -> None:
+        tarefas = [p.tarefa for p in self._pollers.values() if p.tarefa is not None]
+        for tarefa in tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*tarefas, return_exceptions=True)
+
+    def estatisticas(self) -> dict:
+        return {
+            "jogos":       len(self._pollers),
+            "assinaturas": sum(len(p.assinantes) for p in self._pollers.values()),
+            "consultas":   self.consultas,
+            "mensagens":   self.mensagens,
+            "descartadas": self.descartadas,
+        }
+
+
+painel_ao_vivo = PainelAoVivo(settings.AO_VIVO_INTERVALO_S)
@@ -0,0 +1,165 @@
+"""
+Pré-aquecimento do cache: atualiza em background o que os usuários vão pedir.
+
+Alvos, recalculados a cada volta:
+  - próximos jogos (e o ano atual) dos clubes do coração dos usuários;
+  - os clubes que mais aparecem nos diários;
+  - as tabelas e o calendário da temporada de todos os torneios de LIGAS_POR_PAIS.
+
+Cada alvo volta a ser atualizado a cada AQUECIMENTO_INTERVALO_S, ou a cada
+AQUECIMENTO_INTERVALO_JOGO_S quando há jogo dele perto do horário (pelo banco
+de eventos). Antes de cada alvo o aquecedor espera o rate limiter global ter
+folga, então tráfego de usuário sempre passa na frente; o calendário das
+ligas vai em lotes de rodadas, cada um esperando a folga de novo.
+
+Roda dentro da API (AQUECIMENTO_ATIVO) ou como worker separado:
+
+    python -m app.scraper.aquecimento
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+from app.config import settings
+from app.scraper.client import folga_upstream
+from app.scraper.leagues import LIGAS_POR_PAIS, buscar_calendario_liga_async, buscar_tabela_liga_async
+from app.scraper.parser import buscar_jogos_async, buscar_jogos_por_ano_async
+from app.db.database import inicializar_banco
+from app.db.repositories.diary_repo import clubes_mais_frequentes
+from app.db.repositories.evento_repo import ha_jogo_perto
+from app.db.repositories.user_repo import listar_clubes_coracao
+
+logger = logging.getLogger(__name__)
+
+Alvo = tuple[str, int]  # ("clube", time_id) ou ("liga", tournament_id)
+
+
+class Aquecedor:
+    def __init__(self, intervalo: float, intervalo_jogo: float, janela_jogo: float,
+                 max_clubes_diario: int, folga_minima: float, rajada: int, passo: float = 5.0):
+        self._intervalo = intervalo
+        self._intervalo_jogo = intervalo_jogo
+        self._janela_jogo = janela_jogo
+        self._max_clubes_diario = max_clubes_diario
+        self._folga_minima = folga_minima
+        self._capacidade = rajada
+        self._passo = passo
+        # Lote que ainda cabe na rajada do limiter depois da folga mínima.
+        self._lote_rodadas = max(1, int(rajada - folga_minima))
+        self._proximo: dict[Alvo, float] = {}
+        self._por_alvo: dict[str, dict] = {}
+        self._tarefa: asyncio.Task | None = None
+        self.voltas = 0
+
+    def alvos(self) -> list[Alvo]:
+        clubes = dict.fromkeys(listar_clubes_coracao() + clubes_mais_frequentes(self._max_clubes_diario))
+        ligas = dict.fromkeys(liga["id"] for ligas in LIGAS_POR_PAIS.values() for liga in ligas)
+        return [("clube", time_id) for time_id in clubes] + [("liga", liga_id) for liga_id in ligas]
+
+    def _intervalo_de(self, alvo: Alvo, agora: float) -> float:
+        tipo, alvo_id = alvo
+        if tipo == "clube":
+            perto = ha_jogo_perto(agora, self._janela_jogo, time_id=alvo_id)
+        else:
+            perto = ha_jogo_perto(agora, self._janela_jogo, torneio_id=alvo_id)
+        return self._intervalo_jogo if perto else self._intervalo
+
+    async def _aguardar_folga(self, pedidos: list | None = None) -> None:
+        """Espera o limiter ter a folga mínima, mais a que `pedidos` vão gastar."""
+        # O limiter nunca passa da rajada: acima dela a espera não terminaria.
+        necessaria = min(self._folga_minima + len(pedidos or ()), self._capacidade)
+        while folga_upstream() < necessaria:
+            await asyncio.sleep(1)
+
+    async def _aquecer(self, alvo: Alvo) -> None:
+        tipo, alvo_id = alvo
+        if tipo == "clube":
+            await buscar_jogos_async(alvo_id, "next")
+            await buscar_jogos_por_ano_async(alvo_id, datetime.now().year)
+        else:
+            await buscar_tabela_liga_async(alvo_id)
+            # Mantém os resultados da temporada no banco para a tabela local. As
+            # rodadas vão em lotes e cada lote espera folga: uma temporada
+            # inteira de uma vez endividaria o limiter na frente dos usuários.
+            await buscar_calendario_liga_async(alvo_id, lote=self._lote_rodadas,
+                                               antes_de_pedir=self._aguardar_folga)
+
+    def _registrar(self, alvo: Alvo, duracao: float, ok: bool, intervalo: float) -> None:
+        stats = self._por_alvo.setdefault(f"{alvo[0]}:{alvo[1]}", {"execucoes": 0, "falhas": 0})
+        stats["execucoes"] += 1
+        stats["falhas"] += 0 if ok else 1
+        stats["ultima"] = int(time.time())
+        stats["duracao_s"] = round(duracao, 3)
+        stats["intervalo_s"] = intervalo
+
+    async def rodar_uma_vez(self) -> int:
+        """Atualiza os alvos vencidos; devolve quantos foram atualizados."""
+        feitos = 0
+        # alvos() e _intervalo_de() leem o SQLite: fora do event loop, como o resto do caminho async.
+        for alvo in await asyncio.to_thread(self.alvos):
+            if self._proximo.get(alvo, 0) > time.time():
+                continue
+            await self._aguardar_folga()
+            inicio = time.perf_counter()
+            ok = True
+            try:
+                await self._aquecer(alvo)
+            except Exception as e:
+                ok = False
+                logger.warning(f"Aquecimento {alvo[0]}:{alvo[1]} falhou: {e}")
+            duracao = time.perf_counter() - inicio
+            intervalo = await asyncio.to_thread(self._intervalo_de, alvo, time.time())
+            self._proximo[alvo] = time.time() + intervalo
+            self._registrar(alvo, duracao, ok, intervalo)
+            logger.info(f"Aquecido {alvo[0]}:{alvo[1]} em {duracao:.2f}s (próximo em {intervalo:.0f}s)")
+            feitos += 1
+        self.voltas += 1
+        return feitos
+
+    async def rodar(self) -> None:
+        while True:
+            try:
+                await self.rodar_uma_vez()
+            except Exception as e:
+                logger.error(f"Volta de aquecimento falhou: {e}")
+            await asyncio.sleep(self._passo)
+
+    def iniciar(self) -> None:
+        if self._tarefa is None:
+            self._tarefa = asyncio.create_task(self.rodar())
+
+    async def parar(self) -> None:
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    def estatisticas(self) -> dict:
+        return {
+            "voltas": self.voltas,
+            "alvos": dict(self._por_alvo),
+        }
+
+
+aquecedor = Aquecedor(
+    intervalo=settings.AQUECIMENTO_INTERVALO_S,
+    intervalo_jogo=settings.AQUECIMENTO_INTERVALO_JOGO_S,
+    janela_jogo=settings.AQUECIMENTO_JANELA_JOGO_S,
+    max_clubes_diario=settings.AQUECIMENTO_MAX_CLUBES_DIARIO,
+    folga_minima=settings.AQUECIMENTO_FOLGA_MINIMA,
+    rajada=settings.SOFASCORE_RAJADA,
+)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    inicializar_banco()
+    asyncio.run(aquecedor.rodar())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import threading
+import time
+
+FECHADO = "fechado"
+ABERTO = "aberto"
+MEIO_ABERTO = "meio_aberto"
+
+
+class Disjuntor:
+    """
+    Circuit breaker de uma família de endpoints.
+
+    Depois de `limite_falhas` falhas seguidas abre e recusa chamadas por
+    `tempo_aberto` segundos. Passado esse tempo fica meio-aberto: deixa passar
+    uma única chamada de teste, que fecha (sucesso) ou reabre (falha) o circuito.
+    """
+
+    def __init__(self, limite_falhas: int, tempo_aberto: float):
+        self._limite_falhas = limite_falhas
+        self._tempo_aberto = tempo_aberto
+        self._lock = threading.Lock()
+        self._estado = FECHADO
+        self._falhas = 0
+        self._aberto_ate = 0.0
+        self._teste_em_voo = False
+        self.aberturas = 0
+        self.recusadas = 0
+
+    def permitir(self) -> str | None:
+        """Estado em que a chamada vai rodar, ou None se ela deve falhar rápido."""
+        with self._lock:
+            if self._estado == ABERTO:
+                if time.monotonic() < self._aberto_ate:
+                    self.recusadas += 1
+                    return None
+                self._estado = MEIO_ABERTO
+                self._teste_em_voo = False
+            if self._estado == MEIO_ABERTO:
+                if self._teste_em_voo:
+                    self.recusadas += 1
+                    return None
+                self._teste_em_voo = True
+            return self._estado
+
+    def sucesso(self) -> None:
+        with self._lock:
+            self._estado = FECHADO
+            self._falhas = 0
+            self._teste_em_voo = False
+
+    def liberar(self) -> None:
+        """Chamada que não terminou em sucesso nem falha: libera a vaga de teste do meio-aberto."""
+        with self._lock:
+            self._teste_em_voo = False
+
+    def falha(self) -> None:
+        with self._lock:
+            self._falhas += 1
+            if self._estado == MEIO_ABERTO or self._falhas >= self._limite_falhas:
+                self._estado = ABERTO
+                self._aberto_ate = time.monotonic() + self._tempo_aberto
+                self._teste_em_voo = False
+                self.aberturas += 1
+
+    def estatisticas(self) -> dict:
+        return {
+            "estado":    self._estado,
+            "falhas":    self._falhas,
+            "aberturas": self.aberturas,
+            "recusadas": self.recusadas,
+        }
+
+
+class Disjuntores:
+    """Um Disjuntor por família de endpoint, criado sob demanda."""
+
+    def __init__(self, limite_falhas: int, tempo_aberto: float):
+        self._limite_falhas = limite_falhas
+        self._tempo_aberto = tempo_aberto
+        self._lock = threading.Lock()
+        self._por_familia: dict[str, Disjuntor] = {}
+
+    def para(self, familia: str) -> Disjuntor:
+        with self._lock:
+            disjuntor = self._por_familia.get(familia)
+            if disjuntor is None:
+                disjuntor = Disjuntor(self._limite_falhas, self._tempo_aberto)
+                self._por_familia[familia] = disjuntor
+            return disjuntor
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {familia: d.estatisticas() for familia, d in self._por_familia.items()}
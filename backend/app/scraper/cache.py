@@ -0,0 +1,289 @@
+"""
+Cache de respostas do SofaScore em dois níveis.
+
+1. Memória: LRU limitado por bytes (payload JSON serializado).
+2. Disco: SQLite próprio, sobrevive a restarts e guarda entradas vencidas
+   para quem quiser um payload antigo quando o upstream cair. As gravações
+   entram numa fila e uma thread as junta num commit só, então gravar nunca
+   espera o fsync (nem trava o event loop).
+
+O TTL de cada path vem de POLITICA_TTL (primeiro template que casar).
+"""
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+MINUTO = 60
+HORA = 60 * MINUTO
+DIA = 24 * HORA
+SEMPRE = None  # nunca expira
+
+# A thread de escrita espera isto depois da primeira gravação pendente, para
+# uma rajada de respostas virar um commit só.
+INTERVALO_ESCRITA = 0.2
+
+
+def incidentes_encerrados(data: dict) -> bool:
+    """Jogo encerrado tem o incidente de período "FT" (ou AET/AP) — a lista não muda mais."""
+    return any(
+        inc.get("incidentType") == "period" and inc.get("text") in ("FT", "AET", "AP")
+        for inc in data.get("incidents", [])
+    )
+
+
+def _ttl_incidents(data: dict) -> float | None:
+    return SEMPRE if incidentes_encerrados(data) else MINUTO
+
+
+def _ttl_evento(data: dict) -> float | None:
+    status = data.get("event", {}).get("status", {}).get("type")
+    return 30 * DIA if status == "finished" else 10 * MINUTO
+
+
+# (template, ttl). `*` casa exatamente um segmento do path.
+# ttl pode ser segundos, SEMPRE, 0 (não guarda) ou função do payload.
+POLITICA_TTL: list[tuple[str, float | None | Callable[[dict], float | None]]] = [
+    ("/event/*/incidents",                                  _ttl_incidents),
+    ("/event/*",                                            _ttl_evento),
+    ("/team/*/events/last/*",                               30 * MINUTO),
+    ("/team/*/events/next/*",                               10 * MINUTO),
+    ("/team/*",                                             DIA),
+    ("/search/*",                                           DIA),
+    ("/unique-tournament/*/seasons",                        6 * HORA),
+    ("/unique-tournament/*/season/*/rounds",                6 * HORA),
+    ("/unique-tournament/*/season/*/standings/total",       5 * MINUTO),
+    ("/unique-tournament/*/season/*/events/round/*",        10 * MINUTO),
+    ("/unique-tournament/*/season/*/events/round/*/slug/*", 10 * MINUTO),
+    ("/unique-tournament/*/season/*/events/last/*",         10 * MINUTO),
+    ("/tournament/*",                                       DIA),
+]
+
+
+def _compilar(template: str) -> re.Pattern:
+    partes = [r"[^/]+" if p == "*" else re.escape(p) for p in template.split("/")]
+    return re.compile("/".join(partes) + r"$")
+
+
+_POLITICA = [(_compilar(t), ttl) for t, ttl in POLITICA_TTL]
+
+
+def familia(path: str) -> str:
+    """Template da política que casa com `path` (ou "/<primeiro segmento>/*")."""
+    for (padrao, _), (template, _) in zip(_POLITICA, POLITICA_TTL):
+        if padrao.match(path):
+            return template
+    return "/" + path.strip("/").split("/")[0] + "/*"
+
+
+def ttl_para(path: str, data: dict) -> float | None:
+    """Segundos de validade de `data` em `path` (None = não expira, 0 = não guarda)."""
+    for padrao, ttl in _POLITICA:
+        if padrao.match(path):
+            return ttl(data) if callable(ttl) else ttl
+    return 0
+
+
+class CacheMemoria:
+    """LRU de payloads serializados com orçamento em bytes."""
+
+    def __init__(self, max_bytes: int):
+        self._itens: OrderedDict[str, tuple[float | None, bytes]] = OrderedDict()
+        self._bytes = 0
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def ler(self, path: str) -> bytes | None:
+        with self._lock:
+            item = self._itens.get(path)
+            if item is None:
+                return None
+            expira_em, payload = item
+            if expira_em is not None and expira_em <= time.time():
+                self._remover(path)
+                return None
+            self._itens.move_to_end(path)
+            return payload
+
+    def gravar(self, path: str, payload: bytes, expira_em: float | None) -> None:
+        if len(payload) > self._max_bytes:
+            return
+        with self._lock:
+            if path in self._itens:
+                self._remover(path)
+            self._itens[path] = (expira_em, payload)
+            self._bytes += len(payload)
+            while self._bytes > self._max_bytes:
+                _, (_, antigo) = self._itens.popitem(last=False)
+                self._bytes -= len(antigo)
+                self.evictions += 1
+
+    def _remover(self, path: str) -> None:
+        _, payload = self._itens.pop(path)
+        self._bytes -= len(payload)
+
+    def tamanho(self) -> tuple[int, int]:
+        return len(self._itens), self._bytes
+
+
+class CacheDisco:
+    """
+    Tier persistente em SQLite. Entradas vencidas ficam guardadas (para fallback).
+
+    `gravar` só enfileira; a thread de escrita grava o lote pendente numa
+    transação. Até lá, `ler` enxerga o que está na fila.
+    """
+
+    def __init__(self, arquivo: str):
+        self._conn = sqlite3.connect(arquivo, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._pendentes: dict[str, tuple[bytes, float | None, float]] = {}
+        self._lock_pendentes = threading.Lock()
+        self._acordar = threading.Event()
+        self.commits = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_http (
+                    path        TEXT PRIMARY KEY,
+                    payload     BLOB NOT NULL,
+                    expira_em   REAL,
+                    gravado_em  REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+        threading.Thread(target=self._escritor, name="cache-disco", daemon=True).start()
+
+    def ler(self, path: str) -> tuple[bytes, float | None, float] | None:
+        with self._lock_pendentes:
+            pendente = self._pendentes.get(path)
+        if pendente is not None:
+            return pendente
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expira_em, gravado_em FROM cache_http WHERE path = ?", (path,)
+            ).fetchone()
+        return row
+
+    def gravar(self, path: str, payload: bytes, expira_em: float | None) -> None:
+        with self._lock_pendentes:
+            self._pendentes[path] = (payload, expira_em, time.time())
+        self._acordar.set()
+
+    def descarregar(self) -> None:
+        """Grava agora tudo o que está na fila (também chamado no shutdown)."""
+        with self._lock_pendentes:
+            lote = dict(self._pendentes)
+        if not lote:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache_http (path, payload, expira_em, gravado_em) VALUES (?, ?, ?, ?)",
+                [(path, *item) for path, item in lote.items()],
+            )
+            self._conn.commit()
+            self.commits += 1
+        # Só sai da fila o que não foi regravado enquanto o lote ia para o disco.
+        with self._lock_pendentes:
+            for path, item in lote.items():
+                if self._pendentes.get(path) is item:
+                    del self._pendentes[path]
+
+    def _escritor(self) -> None:
+        while True:
+            self._acordar.wait()
+            time.sleep(INTERVALO_ESCRITA)
+            self._acordar.clear()
+            try:
+                self.descarregar()
+            except sqlite3.Error as e:
+                logger.error(f"Erro ao gravar cache em disco: {e}")
+
+
+class CacheRespostas:
+    def __init__(self, max_bytes: int, arquivo: str):
+        self.memoria = CacheMemoria(max_bytes)
+        self.disco = CacheDisco(arquivo)
+        self.hits_memoria = 0
+        self.hits_disco = 0
+        self.misses = 0
+
+    def _ler_memoria(self, path: str) -> dict | None:
+        payload = self.memoria.ler(path)
+        if payload is None:
+            return None
+        self.hits_memoria += 1
+        return json.loads(payload)
+
+    def _ler_disco(self, path: str) -> dict | None:
+        row = self.disco.ler(path)
+        if row is not None:
+            payload, expira_em, _ = row
+            if expira_em is None or expira_em > time.time():
+                self.hits_disco += 1
+                self.memoria.gravar(path, payload, expira_em)
+                return json.loads(payload)
+
+        self.misses += 1
+        return None
+
+    def ler(self, path: str) -> dict | None:
+        data = self._ler_memoria(path)
+        return data if data is not None else self._ler_disco(path)
+
+    async def ler_async(self, path: str) -> dict | None:
+        """Como `ler`, mas a ida ao SQLite roda fora do event loop."""
+        data = self._ler_memoria(path)
+        return data if data is not None else await asyncio.to_thread(self._ler_disco, path)
+
+    def ler_antigo(self, path: str) -> tuple[dict, float] | None:
+        """Último payload bom de `path`, mesmo vencido, com o instante em que foi gravado."""
+        try:
+            row = self.disco.ler(path)
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao ler cache {path}: {e}")
+            return None
+        if row is None:
+            return None
+        payload, _, gravado_em = row
+        return json.loads(payload), gravado_em
+
+    def gravar(self, path: str, data: dict) -> None:
+        ttl = ttl_para(path, data)
+        if ttl == 0:
+            return
+        expira_em = None if ttl is SEMPRE else time.time() + ttl
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        self.memoria.gravar(path, payload, expira_em)
+        self.disco.gravar(path, payload, expira_em)
+
+    def descarregar(self) -> None:
+        try:
+            self.disco.descarregar()
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao gravar cache em disco: {e}")
+
+    def estatisticas(self) -> dict:
+        itens, bytes_usados = self.memoria.tamanho()
+        return {
+            "hits_memoria": self.hits_memoria,
+            "hits_disco":   self.hits_disco,
+            "misses":       self.misses,
+            "evictions":    self.memoria.evictions,
+            "itens_memoria": itens,
+            "bytes_memoria": bytes_usados,
+            "commits_disco": self.disco.commits,
+        }
+
+
+cache = CacheRespostas(settings.SOFASCORE_CACHE_MAX_BYTES, settings.SOFASCORE_CACHE_DB)
@@ -1,24 +1,476 @@
-from curl_cffi import requests
+import asyncio
+import contextvars
 import logging
+import queue
+import threading
+from collections.abc import Awaitable, Callable, Generator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+from curl_cffi import requests
+from curl_cffi.const import CurlHttpVersion
+
+from app.config import settings
+from app.scraper.breaker import MEIO_ABERTO, Disjuntor, Disjuntores
+from app.scraper.cache import cache, familia
+from app.scraper.ratelimit import LimitadorAdaptativo
+from app.scraper.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
-BASE_URL = "https://www.sofascore.com/api/v1"
+URL_OFICIAL = "https://www.sofascore.com/api/v1"
+# Aponte SOFASCORE_BASE_URL para o stub local (app.stub.servidor) em testes de carga.
+BASE_URL = settings.SOFASCORE_BASE_URL
 IMAGE_URL = "https://api.sofascore.app/api/v1"
-HEADERS = {"impersonate": "chrome110"}
+HEADERS = {"impersonate": settings.SOFASCORE_IMPERSONATE}
+STATUS_BLOQUEIO = (403, 429)
+
+
+# Um pedido é um path ("/event/123") ou (path, timeout).
+T = TypeVar("T")
+Pedido = str | tuple[str, int]
+Fluxo = Generator[list[Pedido], list[dict | None], T]
+
+
+def _http_version() -> CurlHttpVersion:
+    return CurlHttpVersion.V2TLS if settings.SOFASCORE_HTTP2 else CurlHttpVersion.V1_1
+
+
+def _nova_sessao() -> requests.Session:
+    return requests.Session(
+        impersonate=settings.SOFASCORE_IMPERSONATE,
+        http_version=_http_version(),
+        use_thread_local_curl=False,
+    )
+
+
+class PoolSessoes:
+    """
+    Pool de sessões curl_cffi de vida longa.
+
+    Cada sessão mantém seu handle curl (conexões keep-alive + TLS já negociado),
+    então só a primeira requisição de cada sessão paga o handshake.
+    O pool limita quantas sessões existem ao mesmo tempo; quem chega com o pool
+    esgotado espera até `timeout` segundos por uma sessão livre.
+    """
+
+    def __init__(self, tamanho: int, timeout: float):
+        self._livres: queue.LifoQueue[requests.Session] = queue.LifoQueue()
+        self._vagas = threading.BoundedSemaphore(tamanho)
+        self._timeout = timeout
+
+    @contextmanager
+    def sessao(self):
+        if not self._vagas.acquire(timeout=self._timeout):
+            raise TimeoutError("Pool de sessões SofaScore esgotado")
+        try:
+            try:
+                s = self._livres.get_nowait()
+            except queue.Empty:
+                s = _nova_sessao()
+            try:
+                yield s
+            finally:
+                self._livres.put(s)
+        finally:
+            self._vagas.release()
+
+    def fechar(self) -> None:
+        while True:
+            try:
+                self._livres.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pool = PoolSessoes(settings.SOFASCORE_POOL_SIZE, settings.SOFASCORE_POOL_TIMEOUT)
+_voos = SingleFlight()
+_limitador = LimitadorAdaptativo(
+    settings.SOFASCORE_TAXA_REQ_S,
+    settings.SOFASCORE_RAJADA,
+    settings.SOFASCORE_TAXA_MINIMA,
+    settings.SOFASCORE_RECUPERACAO,
+)
+_disjuntores = Disjuntores(settings.SOFASCORE_CB_FALHAS, settings.SOFASCORE_CB_ABERTO_S)
+_contadores = {"antigos_servidos": 0, "revalidacoes": 0}
+
+
+class FalhaUpstream(Exception):
+    """SofaScore indisponível: erro de rede, timeout, 5xx ou bloqueio (403/429)."""
+
+
+# --- Fallback com dados antigos ---
+# Quando o circuito está aberto ou a busca falha, devolvemos o último payload
+# bom do cache em disco. Cada request HTTP registra aqui o `gravado_em` dos
+# payloads antigos que usou (ver middleware em main.py), para marcar a resposta.
+_dados_antigos: ContextVar[list[float] | None] = ContextVar("sofascore_dados_antigos", default=None)
+
+
+def rastrear_dados_antigos() -> list[float]:
+    marcas: list[float] = []
+    _dados_antigos.set(marcas)
+    return marcas
+
+
+# Paths que, dentro de um fluxo, não vieram frescos do SofaScore (falha, disjuntor
+# aberto ou payload antigo). Quem grava dados "completos" no banco consulta isto
+# antes de confiar que uma listagem terminou de verdade.
+_degradados: ContextVar[list[str] | None] = ContextVar("sofascore_degradados", default=None)
+
+
+@contextmanager
+def rastrear_degradados() -> Generator[list[str], None, None]:
+    paths: list[str] = []
+    token = _degradados.set(paths)
+    try:
+        yield paths
+    finally:
+        _degradados.reset(token)
+
+
+# Dentro de `sem_cache()` as leituras ignoram o cache de respostas e vão ao
+# SofaScore (o resultado continua sendo gravado). Para quem acompanha jogo ao
+# vivo e não pode esperar o TTL vencer.
+_ignorar_cache: ContextVar[bool] = ContextVar("sofascore_ignorar_cache", default=False)
+
+
+@contextmanager
+def sem_cache() -> Generator[None, None, None]:
+    token = _ignorar_cache.set(True)
+    try:
+        yield
+    finally:
+        _ignorar_cache.reset(token)
+
+
+def _marcar_degradado(path: str) -> None:
+    degradados = _degradados.get()
+    if degradados is not None:
+        degradados.append(path)
+
+
+def _servir_antigo(path: str) -> dict | None:
+    return _usar_antigo(path, cache.ler_antigo(path))
+
+
+async def _servir_antigo_async(path: str) -> dict | None:
+    return _usar_antigo(path, await asyncio.to_thread(cache.ler_antigo, path))
+
+
+def _servir_falha(path: str) -> dict | None:
+    """Fallback de disjuntor aberto ou busca que falhou: sem payload antigo o path fica degradado do mesmo jeito."""
+    data = _servir_antigo(path)
+    if data is None:
+        _marcar_degradado(path)
+    return data
+
+
+async def _servir_falha_async(path: str) -> dict | None:
+    data = await _servir_antigo_async(path)
+    if data is None:
+        _marcar_degradado(path)
+    return data
+
+
+def _usar_antigo(path: str, antigo: tuple[dict, float] | None) -> dict | None:
+    if antigo is None:
+        return None
+    data, gravado_em = antigo
+    _marcar_degradado(path)
+    _contadores["antigos_servidos"] += 1
+    marcas = _dados_antigos.get()
+    if marcas is not None:
+        marcas.append(gravado_em)
+    return data
+
+
+def _interpretar(response, url: str) -> dict | None:
+    if response.status_code == 200:
+        try:
+            return response.json()
+        except ValueError as e:
+            # 200 com HTML (página de desafio do SofaScore) é bloqueio, não resposta.
+            logger.warning(f"SofaScore 200 sem JSON: {url}")
+            _limitador.penalizar()
+            raise FalhaUpstream("SofaScore respondeu sem JSON") from e
+    logger.warning(f"SofaScore {response.status_code}: {url}")
+    if response.status_code in STATUS_BLOQUEIO:
+        _limitador.penalizar()
+        raise FalhaUpstream(f"SofaScore {response.status_code}")
+    if response.status_code >= 500:
+        raise FalhaUpstream(f"SofaScore {response.status_code}")
+    # 404 e afins: o upstream respondeu, o recurso é que não existe.
+    return None
 
 
 def get(path: str, timeout: int = 10) -> dict | None:
+    if not _ignorar_cache.get():
+        data = cache.ler(path)
+        if data is not None:
+            return data
+
+    disjuntor = _disjuntores.para(familia(path))
+    estado = disjuntor.permitir()
+    if estado is None:
+        return _servir_falha(path)
+    if estado == MEIO_ABERTO:
+        antigo = _servir_antigo(path)
+        if antigo is not None:
+            _executor.submit(_revalidar, path, timeout, disjuntor)
+            return antigo
+
+    try:
+        return _voos.executar(path, lambda: _buscar_e_gravar(path, timeout, disjuntor))
+    except FalhaUpstream:
+        return _servir_falha(path)
+
+
+def _revalidar(path: str, timeout: int, disjuntor: Disjuntor) -> None:
+    _contadores["revalidacoes"] += 1
+    try:
+        _voos.executar(path, lambda: _buscar_e_gravar(path, timeout, disjuntor))
+    except FalhaUpstream:
+        pass
+
+
+def _buscar_e_gravar(path: str, timeout: int, disjuntor: Disjuntor) -> dict | None:
+    try:
+        data = _buscar(path, timeout)
+    except FalhaUpstream:
+        disjuntor.falha()
+        raise
+    except BaseException:
+        # Erro inesperado ou cancelamento: não conta como falha, mas solta a vaga de teste.
+        disjuntor.liberar()
+        raise
+    disjuntor.sucesso()
+    if data is not None:
+        cache.gravar(path, data)
+    return data
+
+
+def _buscar(path: str, timeout: int) -> dict | None:
     url = f"{BASE_URL}{path}"
+    _limitador.aguardar()
     try:
-        response = requests.get(url, impersonate="chrome110", timeout=timeout)
-        if response.status_code == 200:
-            return response.json()
-        logger.warning(f"SofaScore {response.status_code}: {url}")
+        with _pool.sessao() as sessao:
+            response = sessao.get(url, timeout=timeout)
+    except Exception as e:
+        logger.error(f"Erro request {url}: {e}")
+        raise FalhaUpstream(str(e)) from e
+    return _interpretar(response, url)
+
+
+# --- Cliente assíncrono ---
+# Uma AsyncSession por event loop: as requisições concorrentes compartilham o
+# mesmo multi handle do curl (keep-alive + multiplexação HTTP/2).
+_sessoes_async: dict[asyncio.AbstractEventLoop, requests.AsyncSession] = {}
+_revalidacoes_async: set[asyncio.Task] = set()
+
+
+def _sessao_async() -> requests.AsyncSession:
+    loop = asyncio.get_running_loop()
+    sessao = _sessoes_async.get(loop)
+    if sessao is None:
+        sessao = requests.AsyncSession(
+            impersonate=settings.SOFASCORE_IMPERSONATE,
+            http_version=_http_version(),
+            max_clients=settings.SOFASCORE_MAX_CONCORRENCIA,
+        )
+        _sessoes_async[loop] = sessao
+    return sessao
+
+
+async def get_async(path: str, timeout: int = 10) -> dict | None:
+    if not _ignorar_cache.get():
+        data = await cache.ler_async(path)
+        if data is not None:
+            return data
+
+    disjuntor = _disjuntores.para(familia(path))
+    estado = disjuntor.permitir()
+    if estado is None:
+        return await _servir_falha_async(path)
+    if estado == MEIO_ABERTO:
+        antigo = await _servir_antigo_async(path)
+        if antigo is not None:
+            tarefa = asyncio.create_task(_revalidar_async(path, timeout, disjuntor))
+            _revalidacoes_async.add(tarefa)
+            tarefa.add_done_callback(_revalidacoes_async.discard)
+            return antigo
+
+    try:
+        return await _voos.executar_async(path, lambda: _buscar_e_gravar_async(path, timeout, disjuntor))
+    except FalhaUpstream:
+        return await _servir_falha_async(path)
+
+
+async def _revalidar_async(path: str, timeout: int, disjuntor: Disjuntor) -> None:
+    _contadores["revalidacoes"] += 1
+    try:
+        await _voos.executar_async(path, lambda: _buscar_e_gravar_async(path, timeout, disjuntor))
+    except FalhaUpstream:
+        pass
+
+
+async def _buscar_e_gravar_async(path: str, timeout: int, disjuntor: Disjuntor) -> dict | None:
+    try:
+        data = await _buscar_async(path, timeout)
+    except FalhaUpstream:
+        disjuntor.falha()
+        raise
+    except BaseException:
+        # Erro inesperado ou cancelamento: não conta como falha, mas solta a vaga de teste.
+        disjuntor.liberar()
+        raise
+    disjuntor.sucesso()
+    if data is not None:
+        cache.gravar(path, data)
+    return data
+
+
+async def _buscar_async(path: str, timeout: int) -> dict | None:
+    url = f"{BASE_URL}{path}"
+    await _limitador.aguardar_async()
+    try:
+        response = await _sessao_async().get(url, timeout=timeout)
     except Exception as e:
         logger.error(f"Erro request {url}: {e}")
+        raise FalhaUpstream(str(e)) from e
+    return _interpretar(response, url)
+
+
+async def baixar_imagem_async(path: str, timeout: int = 10) -> tuple[bytes, str] | None:
+    """Bytes e content-type de `IMAGE_URL + path`; None se não existe ou o upstream falhou."""
+    disjuntor = _disjuntores.para("imagem")
+    if disjuntor.permitir() is None:
+        return None
+    return await _voos.executar_async(("imagem", path), lambda: _baixar_imagem_async(path, timeout, disjuntor))
+
+
+async def _baixar_imagem_async(path: str, timeout: int, disjuntor: Disjuntor) -> tuple[bytes, str] | None:
+    url = f"{IMAGE_URL}{path}"
+    try:
+        await _limitador.aguardar_async()
+        response = await _sessao_async().get(url, timeout=timeout)
+    except asyncio.CancelledError:
+        disjuntor.liberar()
+        raise
+    except Exception as e:
+        logger.error(f"Erro request {url}: {e}")
+        disjuntor.falha()
+        return None
+    if response.status_code == 200:
+        disjuntor.sucesso()
+        return response.content, response.headers.get("content-type", "image/png")
+    logger.warning(f"SofaScore {response.status_code}: {url}")
+    if response.status_code in STATUS_BLOQUEIO:
+        _limitador.penalizar()
+    if response.status_code in STATUS_BLOQUEIO or response.status_code >= 500:
+        disjuntor.falha()
+    else:
+        disjuntor.sucesso()
     return None
 
 
+# --- Execução de fluxos ---
+# Os fluxos do parser são geradores que fazem `respostas = yield [pedidos]`
+# e retornam o resultado final. Assim a mesma lógica roda no modelo síncrono
+# (threadpool) e no assíncrono, mudando só quem executa as requisições.
+_executor = ThreadPoolExecutor(max_workers=settings.SOFASCORE_POOL_SIZE, thread_name_prefix="sofascore")
+
+
+def _desempacotar(pedido: Pedido) -> tuple[str, int]:
+    return (pedido, 10) if isinstance(pedido, str) else pedido
+
+
+def _atender(pedido: Pedido) -> dict | None:
+    return get(*_desempacotar(pedido))
+
+
+async def _atender_async(pedido: Pedido) -> dict | None:
+    return await get_async(*_desempacotar(pedido))
+
+
+def buscar_varios(pedidos: list[Pedido]) -> list[dict | None]:
+    """Atende pedidos em paralelo no executor compartilhado, preservando a ordem."""
+    if len(pedidos) <= 1:
+        return [_atender(p) for p in pedidos]
+    # copy_context: as threads do executor enxergam o rastreio de dados antigos do request
+    futuros = [_executor.submit(contextvars.copy_context().run, _atender, p) for p in pedidos]
+    return [f.result() for f in futuros]
+
+
+async def buscar_varios_async(pedidos: list[Pedido]) -> list[dict | None]:
+    return list(await asyncio.gather(*(_atender_async(p) for p in pedidos)))
+
+
+def executar(fluxo: Fluxo[T]) -> T:
+    try:
+        pedidos = next(fluxo)
+        while True:
+            pedidos = fluxo.send(buscar_varios(pedidos))
+    except StopIteration as fim:
+        return fim.value
+
+
+def _avancar(fluxo: Fluxo[T], respostas: list[dict | None] | None) -> tuple[bool, list[Pedido] | T]:
+    """Um passo do fluxo: (False, próximos pedidos) ou (True, resultado)."""
+    try:
+        return False, next(fluxo) if respostas is None else fluxo.send(respostas)
+    except StopIteration as fim:
+        return True, fim.value
+
+
+async def executar_async(fluxo: Fluxo[T],
+                         antes_de_pedir: Callable[[list[Pedido]], Awaitable[None]] | None = None) -> T:
+    """Roda `fluxo`; `antes_de_pedir`, se dado, é aguardado antes de cada lote de requisições."""
+    # Os passos do fluxo (parse e SQLite) rodam numa thread, para não travar o
+    # event loop. Passos e requisições compartilham um contexto só do fluxo:
+    # um rastreio aberto num passo vale para as requisições que ele pediu.
+    loop = asyncio.get_running_loop()
+    contexto = contextvars.copy_context()
+    respostas = None
+    while True:
+        terminou, valor = await loop.run_in_executor(None, contexto.run, _avancar, fluxo, respostas)
+        if terminou:
+            return valor
+        if antes_de_pedir is not None and valor:
+            await antes_de_pedir(valor)
+        respostas = await asyncio.create_task(buscar_varios_async(valor), context=contexto)
+
+
+def fechar_sessoes() -> None:
+    _pool.fechar()
+    cache.descarregar()
+    _executor.shutdown(wait=False)
+
+
+async def fechar_sessoes_async() -> None:
+    loop = asyncio.get_running_loop()
+    sessao = _sessoes_async.pop(loop, None)
+    if sessao is not None:
+        await sessao.close()
+
+
+def estatisticas() -> dict:
+    return {
+        "cache":         cache.estatisticas(),
+        "single_flight": _voos.estatisticas(),
+        "rate_limit":    _limitador.estatisticas(),
+        "disjuntores":   _disjuntores.estatisticas(),
+        **_contadores,
+    }
+
+
+def folga_upstream() -> float:
+    """Requisições que cabem agora no orçamento global sem esperar."""
+    return _limitador.folga()
+
+
 def team_image_url(team_id: int) -> str:
+    if settings.LOGO_PROXY_URL:
+        return f"{settings.LOGO_PROXY_URL}/img/team/{team_id}?tam={settings.LOGO_PROXY_TAMANHO}"
     return f"{IMAGE_URL}/team/{team_id}/image"
@@ -0,0 +1,196 @@
+"""
+Cache de logos dos times em disco.
+
+Os arquivos são endereçados pelo conteúdo (sha256), então o mesmo escudo em
+tamanhos ou ids diferentes é gravado uma vez só, e o sha serve de ETag. Um
+índice em SQLite liga cada chave ("team/{id}/{tamanho}") ao sha e guarda o
+último acesso; passando de IMAGENS_MAX_BYTES, saem as chaves menos usadas.
+
+O original é baixado uma vez; as variantes menores (TAMANHOS) são geradas
+localmente com Pillow.
+"""
+import hashlib
+import io
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from PIL import Image
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.scraper.client import baixar_imagem_async
+
+logger = logging.getLogger(__name__)
+
+TAMANHOS = (32, 64, 128)
+VALIDADE = 30 * 24 * 3600       # escudo muda raramente; depois disso revalida no upstream
+INTERVALO_ACESSO = 3600         # não regrava o último acesso a cada request
+
+Imagem = tuple[bytes, str, str]  # (dados, content-type, sha)
+
+
+class CacheImagens:
+    def __init__(self, raiz: str, max_bytes: int):
+        self._raiz = Path(raiz)
+        self._raiz.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._conn = sqlite3.connect(str(self._raiz / "indice.db"), check_same_thread=False)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS imagens (
+                    chave       TEXT PRIMARY KEY,
+                    sha         TEXT NOT NULL,
+                    tipo        TEXT NOT NULL,
+                    bytes       INTEGER NOT NULL,
+                    gravado_em  REAL NOT NULL,
+                    acessado_em REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_imagens_acesso ON imagens (acessado_em)")
+            self._conn.commit()
+
+    def _arquivo(self, sha: str) -> Path:
+        return self._raiz / sha[:2] / sha
+
+    def ler(self, chave: str) -> tuple[bytes, str, str, float] | None:
+        """(dados, tipo, sha, gravado_em) de `chave`, mesmo vencida; None se não há."""
+        agora = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha, tipo, gravado_em, acessado_em FROM imagens WHERE chave = ?", (chave,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            sha, tipo, gravado_em, acessado_em = row
+            if agora - acessado_em > INTERVALO_ACESSO:
+                self._conn.execute("UPDATE imagens SET acessado_em = ? WHERE chave = ?", (agora, chave))
+                self._conn.commit()
+        try:
+            dados = self._arquivo(sha).read_bytes()
+        except OSError:
+            # Arquivo sumiu do disco: esquece a chave e deixa baixar de novo.
+            with self._lock:
+                self._conn.execute("DELETE FROM imagens WHERE chave = ?", (chave,))
+                self._conn.commit()
+            self.misses += 1
+            return None
+        self.hits += 1
+        return dados, tipo, sha, gravado_em
+
+    def gravar(self, chave: str, dados: bytes, tipo: str) -> str:
+        sha = hashlib.sha256(dados).hexdigest()
+        arquivo = self._arquivo(sha)
+        if not arquivo.exists():
+            arquivo.parent.mkdir(exist_ok=True)
+            temporario = arquivo.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            temporario.write_bytes(dados)
+            os.replace(temporario, arquivo)
+        agora = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO imagens (chave, sha, tipo, bytes, gravado_em, acessado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (chave, sha, tipo, len(dados), agora, agora),
+            )
+            self._conn.commit()
+            self._evictar()
+        return sha
+
+    def _evictar(self) -> None:
+        """Remove as chaves menos acessadas até caber no orçamento (com o lock)."""
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(bytes), 0) FROM (SELECT DISTINCT sha, bytes FROM imagens)"
+        ).fetchone()
+        if total <= self._max_bytes:
+            return
+        removidos = []
+        for chave, sha, tamanho in self._conn.execute(
+            "SELECT chave, sha, bytes FROM imagens ORDER BY acessado_em"
+        ).fetchall():
+            if total <= self._max_bytes:
+                break
+            self._conn.execute("DELETE FROM imagens WHERE chave = ?", (chave,))
+            self.evictions += 1
+            # Arquivo compartilhado só sai quando a última chave que o usa sai.
+            if self._conn.execute("SELECT 1 FROM imagens WHERE sha = ? LIMIT 1", (sha,)).fetchone() is None:
+                total -= tamanho
+                removidos.append(sha)
+        self._conn.commit()
+        for sha in removidos:
+            try:
+                self._arquivo(sha).unlink()
+            except OSError:
+                pass
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            itens, arquivos, bytes_usados = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT sha), "
+                "(SELECT COALESCE(SUM(bytes), 0) FROM (SELECT DISTINCT sha, bytes FROM imagens)) FROM imagens"
+            ).fetchone()
+        return {
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "evictions": self.evictions,
+            "itens":     itens,
+            "arquivos":  arquivos,
+            "bytes":     bytes_usados,
+        }
+
+
+cache_imagens = CacheImagens(settings.IMAGENS_DIR, settings.IMAGENS_MAX_BYTES)
+
+
+def _redimensionar(dados: bytes, tamanho: int) -> bytes:
+    with Image.open(io.BytesIO(dados)) as img:
+        img = img.convert("RGBA")
+        img.thumbnail((tamanho, tamanho), Image.LANCZOS)
+        saida = io.BytesIO()
+        img.save(saida, format="PNG", optimize=True)
+    return saida.getvalue()
+
+
+async def _original(time_id: int) -> Imagem | None:
+    chave = f"team/{time_id}/original"
+    guardada = await run_in_threadpool(cache_imagens.ler, chave)
+    if guardada is not None and time.time() - guardada[3] < VALIDADE:
+        return guardada[:3]
+    baixada = await baixar_imagem_async(f"/team/{time_id}/image")
+    if baixada is None:
+        # Upstream fora ou sem escudo: serve o que houver, mesmo vencido.
+        return guardada[:3] if guardada else None
+    dados, tipo = baixada
+    # Mesmo conteúdo cai no mesmo arquivo; regravar só renova gravado_em.
+    sha = await run_in_threadpool(cache_imagens.gravar, chave, dados, tipo)
+    return dados, tipo, sha
+
+
+async def logo_time(time_id: int, tamanho: int | None = None) -> Imagem | None:
+    """Escudo do time (original ou redimensionado para `tamanho` px), pelo cache em disco."""
+    if tamanho is None:
+        return await _original(time_id)
+
+    chave = f"team/{time_id}/{tamanho}"
+    guardada = await run_in_threadpool(cache_imagens.ler, chave)
+    if guardada is not None and time.time() - guardada[3] < VALIDADE:
+        return guardada[:3]
+    original = await _original(time_id)
+    if original is None:
+        return guardada[:3] if guardada else None
+    try:
+        dados = await run_in_threadpool(_redimensionar, original[0], tamanho)
+    except OSError as e:
+        logger.warning(f"Logo do time {time_id} ilegível: {e}")
+        return original
+    sha = await run_in_threadpool(cache_imagens.gravar, chave, dados, "image/png")
+    return dados, "image/png", sha
@@ -1,5 +1,23 @@
-from app.scraper.client import get, team_image_url
-from curl_cffi import requests
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+from app.core.classificacao import (
+    CRITERIOS_DESEMPATE, CRITERIOS_PADRAO, FORMA_PADRAO, Resultado, montar_tabela, motor_classificacao,
+)
+from app.scraper.client import Fluxo, executar, executar_async, rastrear_degradados, team_image_url
+from app.db.repositories.evento_repo import (
+    consultar_times, eventos_da_temporada, fechar_rodadas, resultados_da_temporada, rodadas_em_dia,
+    rodadas_fechadas, salvar_eventos, salvar_times,
+)
+from app.db.repositories.temporada_repo import (
+    salvar_temporadas, salvar_zonas, temporadas_do_torneio, zonas_da_temporada,
+)
+
+# Catálogo de temporadas guardado no banco; depois disso é renovado (o
+# aquecedor passa pelas ligas bem antes, então usuário quase nunca paga).
+VALIDADE_TEMPORADAS = 6 * 3600
 
 
 PAISES = [
@@ -41,6 +59,11 @@ LIGAS_POR_PAIS = {
     ],
 }
 
+# Ligas disputadas numa tabela só, sem grupos nem fase de mata-mata na
+# temporada regular: só nelas a tabela calculada dos resultados guardados
+# pode substituir a do SofaScore.
+LIGAS_TABELA_UNICA = {325, 77, 17, 24, 8, 11, 34, 182}
+
 # Mapeamento pelo texto exato do SofaScore (promotion.text)
 # Chave em lowercase para comparação case-insensitive
 PROMOTION_TEXT_MAP = {
@@ -126,8 +149,8 @@ def _parse_promotion(row: dict) -> dict:
     }
 
 
-def buscar_info_liga(tournament_id):
-    data = get(f"/tournament/{tournament_id}")
+def _fluxo_info_liga(tournament_id: int) -> Fluxo[dict]:
+    data, = yield [f"/tournament/{tournament_id}"]
     if not data:
         return {"error": "Erro ao buscar liga"}
 
@@ -143,21 +166,30 @@ def buscar_info_liga(tournament_id):
         "flag": flag_url
     }
 
-def buscar_tabela_liga(tournament_id: int, season_id: int | None = None) -> dict:
-    
-    if not season_id:
-        data = get(f"/unique-tournament/{tournament_id}/seasons")
-        if not data:
-            return {"error": "Não foi possível buscar temporadas"}
-        seasons = data.get("seasons", [])
-        if not seasons:
-            return {"error": "Nenhuma temporada encontrada"}
-        season_id = seasons[0]["id"]
-
-    data = get(f"/unique-tournament/{tournament_id}/season/{season_id}/standings/total")
-    if not data:
-        return {"error": "Standings não disponíveis"}
 
+def _fluxo_temporadas(tournament_id: int) -> Fluxo[list[dict]]:
+    """Temporadas do torneio, mais recente primeiro: do banco, ou do SofaScore se vencidas."""
+    temporadas, atualizado_em = temporadas_do_torneio(tournament_id)
+    if atualizado_em is not None and time.time() - atualizado_em < VALIDADE_TEMPORADAS:
+        return temporadas
+    data, = yield [f"/unique-tournament/{tournament_id}/seasons"]
+    seasons = (data or {}).get("seasons", [])
+    if not seasons:
+        return temporadas  # upstream fora: o catálogo vencido ainda serve
+    salvar_temporadas(tournament_id, seasons)
+    temporadas, _ = temporadas_do_torneio(tournament_id)
+    return temporadas
+
+
+def _fluxo_season(tournament_id: int, ano: int | None = None) -> Fluxo[int | None]:
+    """Temporada atual, ou a que começa em `ano` ("2024" ou "24/25" para 2024)."""
+    temporadas = yield from _fluxo_temporadas(tournament_id)
+    if ano is not None:
+        temporadas = [t for t in temporadas if t["ano_inicio"] == ano]
+    return temporadas[0]["id"] if temporadas else None
+
+
+def _montar_tabela(tournament_id: int, season_id: int, data: dict) -> dict:
     standings = data.get("standings", [])
     resultado = {
         "tournament_id": tournament_id,
@@ -170,6 +202,18 @@ def buscar_tabela_liga(tournament_id: int, season_id: int | None = None) -> dict
     # Para deduplicar legenda por label
     legenda_map = {}
 
+    times = [row.get("team", {}) for group in standings for row in group.get("rows", [])]
+    salvar_times(times)
+    # Zonas por posição, para a tabela calculada localmente (só liga de grupo único).
+    if len(standings) == 1:
+        salvar_zonas(tournament_id, season_id, {
+            row["position"]: row["promotion"] for row in standings[0].get("rows", [])
+            if row.get("position") and row.get("promotion")
+        })
+    cores = {t["id"]: t["teamColors"]["primary"] for t in times if (t.get("teamColors") or {}).get("primary")}
+    faltam = [t["id"] for t in times if t.get("id") and t["id"] not in cores]
+    cores.update((i, meta["cor_primaria"]) for i, meta in consultar_times(faltam).items() if meta["cor_primaria"])
+
     for group in standings:
         rows = []
         for row in group.get("rows", []):
@@ -184,6 +228,7 @@ def buscar_tabela_liga(tournament_id: int, season_id: int | None = None) -> dict
                 "time_id":     team.get("id"),
                 "time":        team.get("name"),
                 "logo":        team_image_url(team.get("id", 0)),
+                "cor":         cores.get(team.get("id")),
                 "jogos":       row.get("matches"),
                 "vitorias":    row.get("wins"),
                 "empates":     row.get("draws"),
@@ -206,15 +251,144 @@ def buscar_tabela_liga(tournament_id: int, season_id: int | None = None) -> dict
     return resultado
 
 
-def buscar_jogos_liga(tournament_id: int, season_id: int | None = None, rodada: int | None = None) -> list:
+def _fluxo_tabela_liga(tournament_id: int, season_id: int | None, ano: int | None = None) -> Fluxo[dict]:
     if not season_id:
-        data = get(f"/unique-tournament/{tournament_id}/seasons")
-        if not data:
-            return []
-        seasons = data.get("seasons", [])
-        if not seasons:
+        season_id = yield from _fluxo_season(tournament_id, ano)
+        if not season_id:
+            return {"error": "Temporada não encontrada" if ano else "Não foi possível buscar temporadas"}
+
+    data, = yield [f"/unique-tournament/{tournament_id}/season/{season_id}/standings/total"]
+    if not data:
+        return {"error": "Standings não disponíveis"}
+    return _montar_tabela(tournament_id, season_id, data)
+
+
+def calcular_tabela_local(tournament_id: int, season_id: int, tipo: str = "total",
+                          rodada: int | None = None, n_forma: int = FORMA_PADRAO) -> dict:
+    """
+    Tabela calculada dos resultados guardados, no formato de _montar_tabela,
+    sem ir ao SofaScore. `tipo`: "total", "casa", "fora" ou "forma" (últimos
+    `n_forma` jogos); `rodada` limita aos jogos até ela. As zonas
+    (promotion) dos últimos standings baixados entram só na tabela total.
+    """
+    resultados = [Resultado(**r) for r in resultados_da_temporada(tournament_id, season_id)]
+    if tipo != "forma" and rodada is None:
+        linhas, forma = motor_classificacao.tabela(tournament_id, season_id, resultados, tipo, n_forma)
+    else:
+        criterios = CRITERIOS_DESEMPATE.get(tournament_id, CRITERIOS_PADRAO)
+        tabela = montar_tabela(resultados, criterios, tipo, rodada, n_forma)
+        linhas = tabela.ordenadas()
+        base = montar_tabela(resultados, criterios, "total", rodada) if tipo == "forma" else tabela
+        forma = base.forma(n_forma)
+
+    zonas = zonas_da_temporada(tournament_id, season_id) if tipo == "total" else {}
+    times = consultar_times([linha.time_id for linha in linhas])
+    legenda_map = {}
+    rows = []
+    for posicao, linha in enumerate(linhas, start=1):
+        meta = times.get(linha.time_id) or {}
+        promo = _parse_promotion({"promotion": zonas.get(posicao)})
+        if promo["cor"] and promo["label"] not in legenda_map.values():
+            legenda_map[promo["cor"]] = promo["label"]
+        rows.append({
+            "posicao":     posicao,
+            "time_id":     linha.time_id,
+            "time":        meta.get("nome"),
+            "logo":        team_image_url(linha.time_id),
+            "cor":         meta.get("cor_primaria"),
+            "jogos":       linha.jogos,
+            "vitorias":    linha.vitorias,
+            "empates":     linha.empates,
+            "derrotas":    linha.derrotas,
+            "gols_pro":    linha.gols_pro,
+            "gols_contra": linha.gols_contra,
+            "saldo":       linha.saldo,
+            "pontos":      linha.pontos,
+            "forma":       forma.get(linha.time_id, []),
+            "promo_cor":   promo["cor"],
+            "promo_label": promo["label"],
+            "promo_texto": promo["texto"],
+        })
+    return {
+        "tournament_id": tournament_id,
+        "season_id":     season_id,
+        "tipo":          tipo,
+        "rodada":        rodada,
+        "jogos":         len(resultados),
+        "grupos":        [{"nome": "", "tabela": rows}],
+        "legenda":       [{"cor": k, "label": v} for k, v in legenda_map.items()],
+    }
+
+
+def _fluxo_temporada_sincronizada(tournament_id: int, season_id: int) -> Fluxo[bool]:
+    """
+    A tabela local vale pela do SofaScore? Só em liga de tabela única e com
+    todas as rodadas da temporada no banco: fechadas, ou guardadas sem jogo
+    que já devia ter começado ou terminado e não foi atualizado.
+    """
+    if tournament_id not in LIGAS_TABELA_UNICA:
+        return False
+    data, = yield [f"/unique-tournament/{tournament_id}/season/{season_id}/rounds"]
+    rodadas = [r for r in (data or {}).get("rounds", []) if r.get("round") is not None]
+    # Rodada com slug é mata-mata (playoff de acesso, por exemplo): fora da tabela.
+    if not rodadas or any(r.get("slug") for r in rodadas):
+        return False
+    fechadas = rodadas_fechadas(tournament_id, season_id)
+    abertas = [r["round"] for r in rodadas if _chave_rodada(r) not in fechadas]
+    return rodadas_em_dia(tournament_id, season_id, abertas, time.time())
+
+
+def _fluxo_tabela(tournament_id: int, season_id: int | None, ano: int | None = None) -> Fluxo[dict]:
+    """Tabela calculada localmente quando a temporada está sincronizada; senão, a do SofaScore."""
+    if not season_id:
+        season_id = yield from _fluxo_season(tournament_id, ano)
+        if not season_id:
+            return {"error": "Temporada não encontrada" if ano else "Não foi possível buscar temporadas"}
+    if (yield from _fluxo_temporada_sincronizada(tournament_id, season_id)):
+        return {**calcular_tabela_local(tournament_id, season_id), "completa": True, "origem": "local"}
+    tabela = yield from _fluxo_tabela_liga(tournament_id, season_id)
+    return tabela if "error" in tabela else {**tabela, "origem": "sofascore"}
+
+
+def _fluxo_tabela_local(tournament_id: int, season_id: int | None, ano: int | None, tipo: str,
+                        rodada: int | None, n_forma: int) -> Fluxo[dict]:
+    if not season_id:
+        season_id = yield from _fluxo_season(tournament_id, ano)
+        if not season_id:
+            return {"error": "Temporada não encontrada" if ano else "Não foi possível buscar temporadas"}
+    completa = yield from _fluxo_temporada_sincronizada(tournament_id, season_id)
+    return {**calcular_tabela_local(tournament_id, season_id, tipo, rodada, n_forma), "completa": completa}
+
+
+def _montar_jogo_liga(e: dict) -> dict:
+    ts = e.get("startTimestamp")
+    dt = datetime.fromtimestamp(ts).isoformat() if ts else None
+    status = e["status"]["type"]
+    placar = (
+        f"{e.get('homeScore',{}).get('display',0)} - {e.get('awayScore',{}).get('display',0)}"
+        if status == "finished" else "vs"
+    )
+    return {
+        "id":        e["id"],
+        "timestamp": ts,
+        "dt_obj":    dt,
+        "data_fmt":  datetime.fromtimestamp(ts).strftime("%d/%m %H:%M") if ts else "TBD",
+        "home":      e["homeTeam"]["name"],
+        "home_logo": team_image_url(e["homeTeam"]["id"]),
+        "away":      e["awayTeam"]["name"],
+        "away_logo": team_image_url(e["awayTeam"]["id"]),
+        "placar":    placar,
+        "status":    status,
+        "rodada":    e.get("roundInfo", {}).get("round"),
+    }
+
+
+def _fluxo_jogos_liga(tournament_id: int, season_id: int | None, rodada: int | None,
+                      ano: int | None = None) -> Fluxo[list]:
+    if not season_id:
+        season_id = yield from _fluxo_season(tournament_id, ano)
+        if not season_id:
             return []
-        season_id = seasons[0]["id"]
 
     path = (
         f"/unique-tournament/{tournament_id}/season/{season_id}/events/round/{rodada}"
@@ -222,32 +396,151 @@ def buscar_jogos_liga(tournament_id: int, season_id: int | None = None, rodada:
         f"/unique-tournament/{tournament_id}/season/{season_id}/events/last/0"
     )
 
-    data = get(path)
+    data, = yield [path]
     if not data:
         return []
+    events = data.get("events", [])
+    salvar_eventos(events)
+    return [_montar_jogo_liga(e) for e in events]
+
+
+def _path_rodada(base: str, rodada: dict) -> str:
+    # Fases de copa vêm com slug (ex.: "quarterfinals") além do número.
+    if rodada.get("slug"):
+        return f"{base}/events/round/{rodada['round']}/slug/{rodada['slug']}"
+    return f"{base}/events/round/{rodada['round']}"
+
+
+def _chave_rodada(rodada: dict) -> tuple[int, str]:
+    """(número, slug) de uma rodada de /rounds ou do roundInfo de um evento."""
+    return rodada["round"], rodada.get("slug") or ""
+
+
+def _fluxo_calendario_liga(tournament_id: int, season_id: int | None, ano: int | None = None,
+                           lote: int | None = None) -> Fluxo[dict]:
+    """
+    Todos os jogos da temporada, agrupados por rodada.
+
+    Rodadas já fechadas (baixadas inteiras, só jogos encerrados) saem do
+    banco; as outras são buscadas em paralelo, no ritmo do rate limiter —
+    todas de uma vez, ou em lotes de `lote` rodadas (o aquecedor confere a
+    folga do limiter entre um lote e outro). Uma rodada só fecha quando veio
+    fresca do SofaScore.
+    """
+    if not season_id:
+        season_id = yield from _fluxo_season(tournament_id, ano)
+        if not season_id:
+            return {"error": "Temporada não encontrada" if ano else "Não foi possível buscar temporadas"}
+
+    base = f"/unique-tournament/{tournament_id}/season/{season_id}"
+    data, = yield [f"{base}/rounds"]
+    rodadas = [r for r in (data or {}).get("rounds", []) if r.get("round") is not None]
+    fechadas = rodadas_fechadas(tournament_id, season_id)
+    if not rodadas:
+        # Upstream fora: o que o banco tem.
+        rodadas = [{"round": r, "slug": slug or None} for r, slug in sorted(fechadas)]
+
+    # Fases de copa repetem o número da rodada: a chave é (número, slug).
+    por_rodada: dict[tuple[int, str], list] = defaultdict(list)
+    for e in eventos_da_temporada(tournament_id, season_id, sorted({r["round"] for r in rodadas})):
+        por_rodada[_chave_rodada(e["roundInfo"])].append(e)
+
+    faltam = [r for r in rodadas if _chave_rodada(r) not in fechadas]
+    lote = lote or max(len(faltam), 1)
+    respostas = []
+    with rastrear_degradados() as degradados:
+        for i in range(0, len(faltam), lote):
+            respostas += yield [_path_rodada(base, r) for r in faltam[i:i + lote]]
+    novas_fechadas = []
+    for r, resposta in zip(faltam, respostas):
+        if resposta is None:
+            continue  # fica com o que o banco tem da rodada
+        events = resposta.get("events", [])
+        salvar_eventos(events)
+        por_rodada[_chave_rodada(r)] = events
+        if events and _path_rodada(base, r) not in degradados and all(
+            e.get("status", {}).get("type") == "finished" for e in events
+        ):
+            novas_fechadas.append(_chave_rodada(r))
+    fechar_rodadas(tournament_id, season_id, novas_fechadas)
+
+    calendario = [
+        {
+            "rodada": r["round"],
+            "slug":   r.get("slug"),
+            "nome":   r.get("name"),
+            "jogos":  [_montar_jogo_liga(e) for e in sorted(por_rodada[_chave_rodada(r)],
+                                                            key=lambda e: e.get("startTimestamp") or 0)],
+        }
+        for r in rodadas
+    ]
+    return {
+        "tournament_id": tournament_id,
+        "season_id":     season_id,
+        "rodada_atual":  ((data or {}).get("currentRound") or {}).get("round"),
+        "total":         sum(len(r["jogos"]) for r in calendario),
+        "rodadas":       calendario,
+    }
+
+
+def buscar_info_liga(tournament_id: int) -> dict:
+    return executar(_fluxo_info_liga(tournament_id))
+
+
+async def buscar_info_liga_async(tournament_id: int) -> dict:
+    return await executar_async(_fluxo_info_liga(tournament_id))
+
+
+def buscar_temporadas(tournament_id: int) -> list[dict]:
+    return executar(_fluxo_temporadas(tournament_id))
+
+
+async def buscar_temporadas_async(tournament_id: int) -> list[dict]:
+    return await executar_async(_fluxo_temporadas(tournament_id))
+
+
+def buscar_tabela_liga(tournament_id: int, season_id: int | None = None, ano: int | None = None) -> dict:
+    return executar(_fluxo_tabela_liga(tournament_id, season_id, ano))
+
+
+async def buscar_tabela_liga_async(tournament_id: int, season_id: int | None = None,
+                                   ano: int | None = None) -> dict:
+    return await executar_async(_fluxo_tabela_liga(tournament_id, season_id, ano))
+
+
+def buscar_jogos_liga(tournament_id: int, season_id: int | None = None, rodada: int | None = None,
+                      ano: int | None = None) -> list:
+    return executar(_fluxo_jogos_liga(tournament_id, season_id, rodada, ano))
+
+
+async def buscar_jogos_liga_async(tournament_id: int, season_id: int | None = None, rodada: int | None = None,
+                                  ano: int | None = None) -> list:
+    return await executar_async(_fluxo_jogos_liga(tournament_id, season_id, rodada, ano))
+
+
+def buscar_calendario_liga(tournament_id: int, season_id: int | None = None, ano: int | None = None) -> dict:
+    return executar(_fluxo_calendario_liga(tournament_id, season_id, ano))
+
+
+async def buscar_calendario_liga_async(tournament_id: int, season_id: int | None = None, ano: int | None = None,
+                                       lote: int | None = None,
+                                       antes_de_pedir: Callable[[list], Awaitable[None]] | None = None) -> dict:
+    return await executar_async(_fluxo_calendario_liga(tournament_id, season_id, ano, lote), antes_de_pedir)
+
+
+def buscar_tabela(tournament_id: int, season_id: int | None = None, ano: int | None = None) -> dict:
+    return executar(_fluxo_tabela(tournament_id, season_id, ano))
+
+
+async def buscar_tabela_async(tournament_id: int, season_id: int | None = None, ano: int | None = None) -> dict:
+    return await executar_async(_fluxo_tabela(tournament_id, season_id, ano))
+
+
+async def buscar_tabela_local_async(tournament_id: int, season_id: int | None = None, ano: int | None = None,
+                                    tipo: str = "total", rodada: int | None = None,
+                                    n_forma: int = FORMA_PADRAO) -> dict:
+    return await executar_async(_fluxo_tabela_local(tournament_id, season_id, ano, tipo, rodada, n_forma))
 
-    jogos = []
-    for e in data.get("events", []):
-        from datetime import datetime
-        ts = e.get("startTimestamp")
-        dt = datetime.fromtimestamp(ts).isoformat() if ts else None
-        status = e["status"]["type"]
-        placar = (
-            f"{e.get('homeScore',{}).get('display',0)} - {e.get('awayScore',{}).get('display',0)}"
-            if status == "finished" else "vs"
-        )
-        jogos.append({
-            "id":        e["id"],
-            "timestamp": ts,
-            "dt_obj":    dt,
-            "data_fmt":  datetime.fromtimestamp(ts).strftime("%d/%m %H:%M") if ts else "TBD",
-            "home":      e["homeTeam"]["name"],
-            "home_logo": team_image_url(e["homeTeam"]["id"]),
-            "away":      e["awayTeam"]["name"],
-            "away_logo": team_image_url(e["awayTeam"]["id"]),
-            "placar":    placar,
-            "status":    status,
-            "rodada":    e.get("roundInfo", {}).get("round"),
-        })
-    return jogos
 
+async def buscar_season_async(tournament_id: int, ano: int | None = None) -> int | None:
+    return await executar_async(_fluxo_season(tournament_id, ano))
@@ -0,0 +1,210 @@
+import asyncio
+import math
+from collections.abc import AsyncIterator, Callable
+
+from app.scraper.client import Fluxo, get_async, rastrear_degradados
+from app.db.repositories.pagina_repo import indice_paginas, registrar_pagina
+
+
+def fluxo_paginas(base: str, limite_paginas: int | None, janela: int,
+                  parar: Callable[[list], bool] | None = None) -> Fluxo[list]:
+    """
+    Busca `base/0`, `base/1`, ... em ordem e junta os eventos.
+
+    A página 0 vai sozinha (a maioria das listas cabe nela); depois disso
+    `janela` páginas seguem em paralelo, especulativamente. As respostas são
+    consumidas em ordem e tudo depois da última página (vazia ou sem
+    hasNextPage, ou a primeira para a qual `parar(eventos)` é verdadeiro)
+    é descartado. O ritmo real fica com o rate limiter global.
+    """
+    raw_events = []
+    pagina = 0
+    lote = 1
+    while limite_paginas is None or pagina < limite_paginas:
+        fim = pagina + lote if limite_paginas is None else min(pagina + lote, limite_paginas)
+        respostas = yield [f"{base}/{p}" for p in range(pagina, fim)]
+        for data in respostas:
+            events = (data or {}).get("events", [])
+            if not events:
+                return raw_events
+            raw_events.extend(events)
+            if not data.get("hasNextPage", False) or (parar and parar(events)):
+                return raw_events
+        pagina = fim
+        lote = janela
+    return raw_events
+
+
+async def _pagina_async(path: str) -> tuple[dict | None, bool]:
+    """Página e se ela veio degradada (falha, disjuntor aberto ou payload antigo)."""
+    with rastrear_degradados() as degradados:
+        data = await get_async(path)
+    return data, bool(degradados)
+
+
+async def transmitir_paginas(base: str, limite_paginas: int | None, janela: int,
+                             parar: Callable[[list], bool] | None = None
+                             ) -> AsyncIterator[tuple[int, list, bool]]:
+    """
+    Mesmo percurso de fluxo_paginas, mas entregando (página, eventos, degradada)
+    assim que cada página chega, em ordem, em vez de juntar tudo no fim. As
+    páginas especulativas descartadas terminam em background e ficam no cache.
+    """
+    pagina = 0
+    lote = 1
+    while limite_paginas is None or pagina < limite_paginas:
+        fim = pagina + lote if limite_paginas is None else min(pagina + lote, limite_paginas)
+        tarefas = [asyncio.ensure_future(_pagina_async(f"{base}/{p}")) for p in range(pagina, fim)]
+        for p, tarefa in zip(range(pagina, fim), tarefas):
+            data, degradada = await tarefa
+            events = (data or {}).get("events", [])
+            if not events:
+                return
+            yield p, events, degradada
+            if not data.get("hasNextPage", False) or (parar and parar(events)):
+                return
+        pagina = fim
+        lote = janela
+
+
+class PaginasTime:
+    """
+    Páginas de /team/{id}/events/last já vistas nesta consulta.
+
+    As páginas vão do mais recente (0) para o mais antigo, então os
+    timestamps caem à medida que o número da página sobe. Página além da
+    última conta como vazia, "mais antiga que tudo". Cada página carregada
+    alimenta o índice persistente página -> faixa de timestamps do time.
+    """
+
+    def __init__(self, time_id: int):
+        self.time_id = time_id
+        self.eventos: dict[int, list] = {}
+        self._ultima: int | None = None
+
+    def carregar(self, paginas: list[int]) -> Fluxo[None]:
+        faltam = [p for p in paginas if p not in self.eventos and not self._alem_do_fim(p)]
+        if not faltam:
+            return
+        respostas = yield [f"/team/{self.time_id}/events/last/{p}" for p in faltam]
+        for p, data in zip(faltam, respostas):
+            eventos = [e for e in (data or {}).get("events", []) if e.get("startTimestamp")]
+            self.eventos[p] = eventos
+            if not eventos or not data.get("hasNextPage", False):
+                self._ultima = p if eventos else p - 1
+            if eventos:
+                registrar_pagina(self.time_id, p,
+                                 min(e["startTimestamp"] for e in eventos),
+                                 max(e["startTimestamp"] for e in eventos))
+
+    def _alem_do_fim(self, p: int) -> bool:
+        return self._ultima is not None and p > self._ultima
+
+    def mais_antigo(self, p: int) -> float:
+        eventos = self.eventos.get(p) or []
+        return min((e["startTimestamp"] for e in eventos), default=-math.inf)
+
+    def mais_recente(self, p: int) -> float:
+        eventos = self.eventos.get(p) or []
+        return max((e["startTimestamp"] for e in eventos), default=-math.inf)
+
+    def estimar(self, ts: float, base: int) -> int:
+        """Palpite da página (>= base) que contém `ts`, pela duração média das páginas já vistas."""
+        cheias = [p for p, eventos in self.eventos.items() if eventos]
+        if base not in cheias or len(cheias) < 2:
+            return base
+        duracao = (max(map(self.mais_recente, cheias)) - min(map(self.mais_antigo, cheias))) \
+            / (max(cheias) - min(cheias) + 1)
+        return base + max(0, math.ceil((self.mais_antigo(base) - ts) / duracao))
+
+    def _faixa_possivel(self, p: int) -> tuple[float, float]:
+        """Limites para os timestamps de uma página ainda não carregada, pelas vizinhas."""
+        piso = max((self.mais_recente(j) for j in self.eventos if j > p), default=-math.inf)
+        teto = min((self.mais_antigo(j) for j in self.eventos if j < p and self.eventos[j]),
+                   default=math.inf)
+        return piso, teto
+
+    def abaixo_de(self, p: int, extremo: Callable[[int], float], limite: float) -> Fluxo[bool]:
+        """`extremo(p) < limite`, carregando a página só se as vizinhas não bastarem."""
+        if p not in self.eventos and not self._alem_do_fim(p):
+            piso, teto = self._faixa_possivel(p)
+            if teto < limite:
+                return True
+            if piso >= limite:
+                return False
+            yield from self.carregar([p])
+        return extremo(p) < limite
+
+    def primeira(self, extremo: Callable[[int], float], limite: float,
+                 dica: int, minimo: int = 0) -> Fluxo[int]:
+        """
+        Menor página >= `minimo` com `extremo(p) < limite` (critério monótono em p).
+
+        Galopa a partir da dica até cercar a fronteira e termina com busca
+        binária. Com dica boa custa uma requisição; sem dica, O(log n).
+        """
+        if (yield from self.abaixo_de(dica, extremo, limite)):
+            hi, passo = dica, 1
+            lo = minimo - 1
+            while hi > minimo:
+                q = max(minimo, hi - passo)
+                if not (yield from self.abaixo_de(q, extremo, limite)):
+                    lo = q
+                    break
+                hi, passo = q, passo * 2
+        else:
+            lo, passo = dica, 1
+            while True:
+                q = lo + passo
+                if (yield from self.abaixo_de(q, extremo, limite)):
+                    hi = q
+                    break
+                lo, passo = q, passo * 2
+
+        while hi - lo > 1:
+            meio = (lo + hi) // 2
+            if (yield from self.abaixo_de(meio, extremo, limite)):
+                hi = meio
+            else:
+                lo = meio
+        return hi
+
+
+def _dica(indice: list[dict], criterio: Callable[[dict], bool], minimo: int = 0) -> int | None:
+    for row in indice:
+        if row["pagina"] >= minimo and criterio(row):
+            return row["pagina"]
+    return None
+
+
+def fluxo_eventos_do_periodo(time_id: int, inicio: float, fim: float) -> Fluxo[list]:
+    """
+    Eventos de /events/last com startTimestamp em [inicio, fim).
+
+    As páginas que cobrem o período formam um intervalo [a, b):
+      a = primeira página com evento anterior a `fim`
+      b = primeira página inteiramente anterior a `inicio`
+    Ambas saem de busca guiada pelo índice persistente (ou binária, se frio).
+    """
+    paginas = PaginasTime(time_id)
+    indice = indice_paginas(time_id)
+
+    # Dicas: as páginas que, pelo índice, contêm as bordas do período. Quando
+    # acertam, as vizinhas são deduzidas sem requisição.
+    dica_a = _dica(indice, lambda r: r["ts_min"] < fim)
+    if dica_a is None:
+        dica_a = max([0] + [row["pagina"] + 1 for row in indice])
+    a = yield from paginas.primeira(paginas.mais_antigo, fim, dica_a)
+
+    dica_b = _dica(indice, lambda r: r["ts_min"] < inicio, minimo=a)
+    if dica_b is None:
+        dica_b = paginas.estimar(inicio, a)
+    b = yield from paginas.primeira(paginas.mais_recente, inicio, dica_b, minimo=a)
+
+    yield from paginas.carregar(list(range(a, b)))
+    return [
+        e
+        for p in range(a, b)
+        for e in paginas.eventos.get(p, [])
+        if inicio <= e["startTimestamp"] < fim
+    ]
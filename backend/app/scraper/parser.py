@@ -1,35 +1,84 @@
-import time
+import asyncio
 import logging
+import math
+import time
+from collections.abc import AsyncIterator, Callable
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from app.scraper.client import get, team_image_url
-from app.db.repositories.club_repo import consultar_estadio_por_id, consultar_estadio_do_clube
+from app.config import settings
+from app.scraper.cache import incidentes_encerrados
+from app.scraper.client import Fluxo, executar, executar_async, rastrear_degradados, team_image_url
+from app.scraper.paginacao import fluxo_eventos_do_periodo, fluxo_paginas, transmitir_paginas
+from app.scraper.singleflight import SingleFlight
+from app.db.repositories.club_repo import indice_clubes
+from app.db.repositories.evento_repo import (
+    cobertura_ate, consultar_times, eventos_do_time, eventos_finalizados, gols_de_eventos,
+    marcar_venues_consultadas, registrar_cobertura, salvar_eventos, salvar_gols, salvar_times,
+    venues_de_eventos, venues_padrao,
+)
 
 logger = logging.getLogger(__name__)
 
+# Páginas de clube grande são abertas por dezenas de usuários ao mesmo tempo:
+# a mesma busca completa em andamento é compartilhada por todos.
+voos_jogos = SingleFlight()
+
+# Jogo com este status não muda mais (placar, venue): fica no banco para sempre.
+STATUS_FINAL = "finished"
+
+# Status que ainda podem mudar (jogo adiado, atrasado, parado ou por jogar).
+# Os demais — encerrado, cancelado, abandonado — são definitivos.
+STATUS_PENDENTES = {"notstarted", "inprogress", "postponed", "delayed", "interrupted", "suspended", "willcontinue"}
+
+# Período terminado há mais que isto já não recebe jogos novos em /events/last.
+FOLGA_FECHAMENTO = 24 * 3600
+
+# Evento ainda não encerrado cuja consulta a /event/{id} veio sem venue só é
+# consultado de novo depois disto (a venue costuma ser definida perto do jogo).
+VALIDADE_SEM_VENUE = 6 * 3600
+
+# Cores e país de um time quase nunca mudam: /team/{id} só depois disto.
+VALIDADE_METADADOS_TIME = 30 * 24 * 3600
+
+# Status que a listagem /events/last nunca traz; no banco vêm de /events/next.
+STATUS_NAO_INICIADOS = {"notstarted", "inprogress"}
+
 
 def _extrair_venue(e: dict) -> tuple[str, str]:
     venue = e.get("venue") or {}
     if venue.get("name") and venue.get("city"):
         return venue["name"], venue["city"].get("name", "A definir")
     home_id = e["homeTeam"]["id"]
-    dados = consultar_estadio_por_id(home_id) or consultar_estadio_do_clube(e["homeTeam"]["name"])
+    dados = indice_clubes.estadio_por_id(home_id) or indice_clubes.estadio_por_nome(e["homeTeam"]["name"])
     if dados:
         return dados["estadio"], dados["cidade"]
     return "A definir", "A definir"
 
 
-def _buscar_venue_individual(event_id: int) -> tuple[str, str]:
-    data = get(f"/event/{event_id}")
+def _venue_do_evento(data: dict | None) -> tuple[str, str] | None:
     if data:
         venue = data.get("event", {}).get("venue") or {}
         if venue.get("name") and venue.get("city"):
             return venue["name"], venue["city"].get("name", "A definir")
-    return "A definir", "A definir"
+    return None
 
 
-def _montar_jogo(e: dict, time_id: int, estadio: str, cidade: str) -> dict:
+def _cores_dos_times(raw_events: list) -> dict[int, str]:
+    """Cor principal de cada time dos eventos: do próprio payload ou, se faltar, da tabela `times`."""
+    cores = {}
+    for e in raw_events:
+        for lado in ("homeTeam", "awayTeam"):
+            t = e[lado]
+            if (t.get("teamColors") or {}).get("primary"):
+                cores[t["id"]] = t["teamColors"]["primary"]
+    faltam = list({e[lado]["id"] for e in raw_events for lado in ("homeTeam", "awayTeam")} - cores.keys())
+    for time_id, meta in consultar_times(faltam).items():
+        if meta["cor_primaria"]:
+            cores[time_id] = meta["cor_primaria"]
+    return cores
+
+
+def _montar_jogo(e: dict, time_id: int, estadio: str, cidade: str, cores: dict[int, str]) -> dict:
     ts = e.get("startTimestamp")
     dt_obj = datetime.fromtimestamp(ts) if ts else None
     status = e["status"]["type"]
@@ -45,9 +94,11 @@ def _montar_jogo(e: dict, time_id: int, estadio: str, cidade: str) -> dict:
         "home":      e["homeTeam"]["name"],
         "home_id":   e["homeTeam"]["id"],
         "home_logo": team_image_url(e["homeTeam"]["id"]),
+        "home_cor":  cores.get(e["homeTeam"]["id"]),
         "away":      e["awayTeam"]["name"],
         "away_id":   e["awayTeam"]["id"],
         "away_logo": team_image_url(e["awayTeam"]["id"]),
+        "away_cor":  cores.get(e["awayTeam"]["id"]),
         "placar":    placar,
         "status":    status,
         "estadio":   estadio,
@@ -57,25 +108,78 @@ def _montar_jogo(e: dict, time_id: int, estadio: str, cidade: str) -> dict:
     }
 
 
-def _resolver_venues(raw_events: list) -> dict[int, tuple[str, str]]:
-    """Resolve venues em paralelo para eventos que não têm venue na listagem."""
-    sem_venue = [e for e in raw_events if not (e.get("venue") or {}).get("name")]
-    venue_map: dict[int, tuple[str, str]] = {}
+def _venues_guardadas(sem_venue: list) -> tuple[dict[int, tuple[str, str]], list]:
+    """Venues que o banco já resolveu, e os eventos que nunca foram resolvidos."""
+    conhecidas = venues_de_eventos([e["id"] for e in sem_venue], VALIDADE_SEM_VENUE)
+    venue_map = {event_id: venue for event_id, venue in conhecidas.items() if venue}
+    return venue_map, [e for e in sem_venue if e["id"] not in conhecidas]
+
+
+def _aplicar_venues_padrao(sem_venue: list, venue_map: dict[int, tuple[str, str]]) -> None:
+    padroes = venues_padrao(list({e["homeTeam"]["id"] for e in sem_venue if e["id"] not in venue_map}))
+    for e in sem_venue:
+        if e["id"] not in venue_map and e["homeTeam"]["id"] in padroes:
+            venue_map[e["id"]] = padroes[e["homeTeam"]["id"]]
+
+
+def _sem_venue(raw_events: list) -> list:
+    return [e for e in raw_events if not (e.get("venue") or {}).get("name")]
+
+
+def _fluxo_venues(raw_events: list) -> Fluxo[dict[int, tuple[str, str]]]:
+    """
+    Venues dos eventos que vieram sem venue na listagem.
+
+    Primeiro o que o banco já resolveu (por id de evento); só eventos nunca
+    resolvidos vão a /event/{id}, em paralelo. O que sobrar fica com a venue
+    aprendida do mandante (a mais frequente nos jogos em casa guardados).
+    """
+    sem_venue = _sem_venue(raw_events)
     if not sem_venue:
-        return venue_map
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        futures = {executor.submit(_buscar_venue_individual, e["id"]): e["id"] for e in sem_venue}
-        for future in as_completed(futures):
-            eid = futures[future]
-            try:
-                venue_map[eid] = future.result()
-            except Exception:
-                venue_map[eid] = ("A definir", "A definir")
+        return {}
+    venue_map, faltam = _venues_guardadas(sem_venue)
+    if faltam:
+        respostas = yield [f"/event/{e['id']}" for e in faltam]
+        salvar_eventos([data["event"] for data in respostas if data and data.get("event")])
+        marcar_venues_consultadas([e["id"] for e, data in zip(faltam, respostas) if data])
+        for e, data in zip(faltam, respostas):
+            venue = _venue_do_evento(data)
+            if venue:
+                venue_map[e["id"]] = venue
+    _aplicar_venues_padrao(sem_venue, venue_map)
     return venue_map
 
 
-def buscar_id_time(nome_time: str) -> dict | None:
-    data = get(f"/search/{nome_time}")
+def _venues_locais(raw_events: list) -> dict[int, tuple[str, str]]:
+    """Como _fluxo_venues, mas só com o banco (sem ir ao SofaScore)."""
+    sem_venue = _sem_venue(raw_events)
+    if not sem_venue:
+        return {}
+    venue_map, _ = _venues_guardadas(sem_venue)
+    _aplicar_venues_padrao(sem_venue, venue_map)
+    return venue_map
+
+
+def _montar_jogos(raw_events: list, time_id: int, venue_map: dict[int, tuple[str, str]]) -> list[dict]:
+    cores = _cores_dos_times(raw_events)
+    jogos = []
+    for e in raw_events:
+        venue = e.get("venue") or {}
+        if venue.get("name") and venue.get("city"):
+            estadio, cidade = venue["name"], venue["city"].get("name", "A definir")
+        else:
+            estadio, cidade = venue_map.get(e["id"]) or _extrair_venue(e)
+        jogos.append(_montar_jogo(e, time_id, estadio, cidade, cores))
+    return jogos
+
+
+def _fluxo_montar_jogos(raw_events: list, time_id: int) -> Fluxo[list[dict]]:
+    venue_map = yield from _fluxo_venues(raw_events)
+    return _montar_jogos(raw_events, time_id, venue_map)
+
+
+def _fluxo_id_time(nome_time: str) -> Fluxo[dict | None]:
+    data, = yield [f"/search/{nome_time}"]
     if not data:
         return None
     for item in data.get("results", []):
@@ -83,53 +187,91 @@ def buscar_id_time(nome_time: str) -> dict | None:
         if entity.get("sport", {}).get("name") != "Football":
             continue
         time_id = entity["id"]
-        cor = "#000000"
-        det = get(f"/team/{time_id}", timeout=5)
-        if det:
-            cor = det.get("team", {}).get("teamColors", {}).get("primary", "#000000")
+        salvar_times([entity])
+        meta = consultar_times([time_id], VALIDADE_METADADOS_TIME).get(time_id) or {}
+        cor = meta.get("cor_primaria")
+        if not cor:
+            det, = yield [(f"/team/{time_id}", 5)]
+            if det:
+                salvar_times([det.get("team")])
+                cor = det.get("team", {}).get("teamColors", {}).get("primary")
+        cor = cor or "#000000"
         return {"id": time_id, "nome": entity["name"],
                 "pais": entity.get("country", {}).get("name"),
                 "logo": team_image_url(time_id), "cor": cor}
     return None
 
 
-def buscar_jogos(time_id: int, tipo: str = "next", limite_paginas: int | None = None) -> list[dict]:
-    raw_events = []
-    pagina = 0
-    while True:
-        if limite_paginas is not None and pagina >= limite_paginas:
-            break
-        data = get(f"/team/{time_id}/events/{tipo}/{pagina}")
-        if not data:
-            break
-        events = data.get("events", [])
-        if not events:
-            break
-        raw_events.extend(events)
-        if not data.get("hasNextPage", False):
-            break
-        pagina += 1
-        time.sleep(0.3)
+def _limite_final(eventos: list, inicio: float, fim: float, agora: float) -> float:
+    """
+    Até onde [inicio, fim) pode ser dado como fechado no banco depois de baixar
+    `eventos`: antes do primeiro jogo que ainda pode mudar (adiado, em andamento) e,
+    se o período ainda está aberto, até o jogo mais recente visto.
+    """
+    if fim <= agora - FOLGA_FECHAMENTO:
+        limite = fim
+    else:
+        limite = max((e["startTimestamp"] + 1 for e in eventos if e.get("startTimestamp")), default=inicio)
+    pendentes = [
+        e["startTimestamp"] for e in eventos
+        if e.get("startTimestamp") and e.get("status", {}).get("type") in STATUS_PENDENTES
+    ]
+    return min([limite] + pendentes)
+
+
+def _parar_na_cobertura(coberto: int | None) -> Callable[[list], bool] | None:
+    """Critério de parada da paginação: página que já alcança a parte coberta pelo banco."""
+    if coberto is None:
+        return None
+    return lambda events: min((e["startTimestamp"] for e in events if e.get("startTimestamp")),
+                              default=coberto) < coberto
+
 
+def _fechar_historico(time_id: int, novos: list, coberto: int | None, frescos: bool) -> list:
+    """Registra a cobertura das páginas baixadas e devolve os eventos antigos que só estão no banco."""
+    # Página que falhou parece fim de lista: só marca cobertura com todas frescas.
+    limite = _limite_final(novos, 0, math.inf, time.time())
+    if limite > 0 and frescos:
+        registrar_cobertura(time_id, 0, limite)
+    if coberto is None:
+        return []
+    ids = {e["id"] for e in novos}
+    return [
+        e for e in eventos_do_time(time_id, fim=coberto)
+        if e["id"] not in ids and e.get("status", {}).get("type") not in STATUS_NAO_INICIADOS
+    ]
+
+
+def _fluxo_historico_completo(time_id: int, janela: int) -> Fluxo[list]:
+    """
+    Todo o /events/last do time, com o banco cobrindo o que já foi baixado.
+
+    Se [0, coberto) já está completo e finalizado no banco, só as páginas mais
+    novas que `coberto` vêm do SofaScore: a paginação para na primeira página
+    que alcança a parte coberta, e o resto sai do banco. Como a cobertura
+    nunca passa de um jogo não finalizado, páginas com jogo adiado ou em
+    andamento continuam sendo rebuscadas até ele terminar.
+    """
+    coberto = cobertura_ate(time_id, 0)
+    with rastrear_degradados() as degradados:
+        novos = yield from fluxo_paginas(f"/team/{time_id}/events/last", None, janela,
+                                         parar=_parar_na_cobertura(coberto))
+    salvar_eventos(novos)
+    return novos + _fechar_historico(time_id, novos, coberto, not degradados)
+
+
+def _fluxo_jogos(time_id: int, tipo: str, limite_paginas: int | None, janela: int) -> Fluxo[list[dict]]:
+    if tipo == "last" and limite_paginas is None:
+        raw_events = yield from _fluxo_historico_completo(time_id, janela)
+    else:
+        raw_events = yield from fluxo_paginas(f"/team/{time_id}/events/{tipo}", limite_paginas, janela)
+        salvar_eventos(raw_events)
     if not raw_events:
         return []
-
-    venue_map = _resolver_venues(raw_events)
-    jogos = []
-    for e in raw_events:
-        venue = e.get("venue") or {}
-        if venue.get("name") and venue.get("city"):
-            estadio, cidade = venue["name"], venue["city"].get("name", "A definir")
-        else:
-            estadio, cidade = venue_map.get(e["id"], _extrair_venue(e))
-        jogos.append(_montar_jogo(e, time_id, estadio, cidade))
-    return jogos
+    return (yield from _fluxo_montar_jogos(raw_events, time_id))
 
 
-def buscar_detalhes_jogo(event_id: int) -> list[dict] | None:
-    data = get(f"/event/{event_id}/incidents", timeout=5)
-    if not data:
-        return None
+def _gols_dos_incidentes(data: dict) -> list[dict]:
     gols = []
     for inc in data.get("incidents", []):
         if inc.get("incidentType") != "goal":
@@ -139,65 +281,81 @@ def buscar_detalhes_jogo(event_id: int) -> list[dict] | None:
         gols.append({"minuto": inc.get("time"), "jogador": f"{jogador}{obs}",
                      "lado": "home" if inc.get("isHome") else "away",
                      "is_home_goal": inc.get("isHome")})
-    gols.sort(key=lambda x: x["minuto"])
+    gols.sort(key=lambda x: x["minuto"] or 0)
     return gols
 
 
-def buscar_jogos_por_ano(time_id: int, ano: int) -> list:
-    from datetime import datetime, timezone
-    
+def _fluxo_gols_jogos(event_ids: list[int]) -> Fluxo[dict[int, list[dict] | None]]:
+    """
+    Gols de vários jogos. Jogos encerrados saem da tabela `gols_evento`; os
+    outros vão a /event/{id}/incidents em paralelo (o ritmo fica com o rate
+    limiter) e, se já encerraram, são guardados para sempre.
+    """
+    gols = dict.fromkeys(event_ids)
+    gols.update(gols_de_eventos(event_ids))
+    faltam = [event_id for event_id, g in gols.items() if g is None]
+    if not faltam:
+        return gols
+    with rastrear_degradados() as degradados:
+        respostas = yield [(f"/event/{event_id}/incidents", 5) for event_id in faltam]
+    finalizados = eventos_finalizados(faltam)
+    encerrados = {}
+    for event_id, data in zip(faltam, respostas):
+        if not data:
+            continue
+        gols[event_id] = _gols_dos_incidentes(data)
+        # Payload antigo (ex.: copiado no meio do jogo) não vira verdade permanente.
+        if f"/event/{event_id}/incidents" in degradados:
+            continue
+        if event_id in finalizados or incidentes_encerrados(data):
+            encerrados[event_id] = gols[event_id]
+    salvar_gols(encerrados)
+    return gols
+
+
+def _fluxo_detalhes_jogo(event_id: int) -> Fluxo[list[dict] | None]:
+    gols = yield from _fluxo_gols_jogos([event_id])
+    return gols[event_id]
+
+
+def _fluxo_jogos_por_ano(time_id: int, ano: int) -> Fluxo[list]:
     agora = datetime.now().timestamp()
     ano_atual = datetime.now().year
     raw_events = []
     ids_vistos = set()
 
     # --- Jogos PASSADOS (last/) ---
-    pagina = 0
-    while True:
-        data = get(f"/team/{time_id}/events/last/{pagina}")
-        if not data:
-            break
-        events = data.get("events", [])
-        if not events:
-            break
-
-        achou_ano = False
-        passou_do_ano = False
-
-        for e in events:
-            ts = e.get("startTimestamp")
-            if not ts:
-                continue
-            ano_jogo = datetime.fromtimestamp(ts).year
-            if ano_jogo == ano:
-                achou_ano = True
-                if e["id"] not in ids_vistos:
-                    raw_events.append(e)
-                    ids_vistos.add(e["id"])
-            elif ano_jogo < ano:
-                # SofaScore pagina do mais recente para o mais antigo.
-                # Se já passamos do ano buscado, não há mais o que encontrar.
-                passou_do_ano = True
-
-        if passou_do_ano:
-            break  # Early exit: não precisa varrer páginas mais antigas
-
-        if not data.get("hasNextPage", False):
-            break
-        pagina += 1
-        time.sleep(0.2)
+    # O começo do ano já fechado no banco (só jogos finalizados) sai de lá; do
+    # SofaScore vêm só as páginas do resto, localizadas pelo índice página -> datas.
+    inicio = datetime(ano, 1, 1).timestamp()
+    fim = datetime(ano + 1, 1, 1).timestamp()
+    coberto = min(cobertura_ate(time_id, inicio) or inicio, fim)
+    novos = []
+    if coberto < fim:
+        with rastrear_degradados() as degradados:
+            novos = yield from fluxo_eventos_do_periodo(time_id, coberto, fim)
+        salvar_eventos(novos)
+        limite = _limite_final(novos, coberto, fim, agora)
+        if limite > coberto and not degradados:
+            registrar_cobertura(time_id, inicio, limite)
+    passados = novos + (eventos_do_time(time_id, inicio, coberto) if coberto > inicio else [])
+    for e in passados:
+        if e["id"] not in ids_vistos:
+            raw_events.append(e)
+            ids_vistos.add(e["id"])
 
     # --- Jogos FUTUROS / recém-terminados que o SofaScore ainda não moveu (next/) ---
     # Só busca se for o ano atual ou futuro
     if ano >= ano_atual:
         pagina = 0
         while True:
-            data = get(f"/team/{time_id}/events/next/{pagina}")
+            data, = yield [f"/team/{time_id}/events/next/{pagina}"]
             if not data:
                 break
             events = data.get("events", [])
             if not events:
                 break
+            salvar_eventos(events)
             for e in events:
                 ts = e.get("startTimestamp")
                 if not ts:
@@ -208,7 +366,6 @@ def buscar_jogos_por_ano(time_id: int, ano: int) -> list:
             if not data.get("hasNextPage", False):
                 break
             pagina += 1
-            time.sleep(0.2)
 
     if not raw_events:
         return []
@@ -230,15 +387,99 @@ def buscar_jogos_por_ano(time_id: int, ano: int) -> list:
     if not eventos_filtrados:
         return []
 
-    venue_map = _resolver_venues(eventos_filtrados)
-    jogos = []
-    for e in eventos_filtrados:
-        venue = e.get("venue") or {}
-        if venue.get("name") and venue.get("city"):
-            estadio, cidade = venue["name"], venue["city"].get("name", "A definir")
-        else:
-            estadio, cidade = venue_map.get(e["id"], _extrair_venue(e))
-        jogos.append(_montar_jogo(e, time_id, estadio, cidade))
-
+    jogos = yield from _fluxo_montar_jogos(eventos_filtrados, time_id)
     jogos.sort(key=lambda x: x["timestamp"], reverse=True)
-    return jogos
\ No newline at end of file
+    return jogos
+
+
+def buscar_id_time(nome_time: str) -> dict | None:
+    return executar(_fluxo_id_time(nome_time))
+
+
+async def buscar_id_time_async(nome_time: str) -> dict | None:
+    return await executar_async(_fluxo_id_time(nome_time))
+
+
+def buscar_jogos(time_id: int, tipo: str = "next", limite_paginas: int | None = None,
+                 janela: int | None = None) -> list[dict]:
+    janela = janela or settings.SOFASCORE_JANELA_PAGINAS
+    chave = ("jogos", time_id, tipo, limite_paginas)
+    return voos_jogos.executar(chave, lambda: executar(_fluxo_jogos(time_id, tipo, limite_paginas, janela)))
+
+
+async def buscar_jogos_async(time_id: int, tipo: str = "next", limite_paginas: int | None = None,
+                             janela: int | None = None) -> list[dict]:
+    janela = janela or settings.SOFASCORE_JANELA_PAGINAS
+    chave = ("jogos", time_id, tipo, limite_paginas)
+    return await voos_jogos.executar_async(
+        chave, lambda: executar_async(_fluxo_jogos(time_id, tipo, limite_paginas, janela))
+    )
+
+
+async def transmitir_jogos_async(time_id: int, tipo: str = "last", limite_paginas: int | None = None,
+                                janela: int | None = None) -> AsyncIterator[dict]:
+    """
+    buscar_jogos_async em streaming: cada página de jogos sai assim que chega.
+
+    Registros, em ordem:
+      {"tipo": "jogos", "pagina": p, "jogos": [...]}   uma por página (pagina None = vindos do banco)
+      {"tipo": "venue", "id": ..., "estadio": ..., "cidade": ...}
+      {"tipo": "fim", "total": n}
+
+    As páginas saem com a venue que o banco já conhece (ou o palpite de
+    sempre); o que só /event/{id} resolve chega depois como registro "venue",
+    que corrige o jogo já enviado.
+    """
+    janela = janela or settings.SOFASCORE_JANELA_PAGINAS
+    historico = tipo == "last" and limite_paginas is None
+    # O trabalho no SQLite (cobertura, venues guardadas, gravação) vai para threads.
+    coberto = await asyncio.to_thread(cobertura_ate, time_id, 0) if historico else None
+    enviados: dict[int, tuple[str, str]] = {}
+    novos = []
+    frescos = True
+
+    def registro(pagina: int | None, events: list) -> dict:
+        jogos = _montar_jogos(events, time_id, _venues_locais(events))
+        enviados.update((j["id"], (j["estadio"], j["cidade"])) for j in jogos)
+        return {"tipo": "jogos", "pagina": pagina, "jogos": jogos}
+
+    async for pagina, events, degradada in transmitir_paginas(
+        f"/team/{time_id}/events/{tipo}", limite_paginas, janela, parar=_parar_na_cobertura(coberto)
+    ):
+        await asyncio.to_thread(salvar_eventos, events)
+        novos.extend(events)
+        frescos = frescos and not degradada
+        yield await asyncio.to_thread(registro, pagina, events)
+
+    eventos = novos
+    if historico:
+        antigos = await asyncio.to_thread(_fechar_historico, time_id, novos, coberto, frescos)
+        if antigos:
+            yield await asyncio.to_thread(registro, None, antigos)
+        eventos = novos + antigos
+
+    venue_map = await executar_async(_fluxo_venues(eventos))
+    for event_id, (estadio, cidade) in venue_map.items():
+        if enviados.get(event_id) != (estadio, cidade):
+            yield {"tipo": "venue", "id": event_id, "estadio": estadio, "cidade": cidade}
+    yield {"tipo": "fim", "total": len(eventos)}
+
+
+def buscar_detalhes_jogo(event_id: int) -> list[dict] | None:
+    return executar(_fluxo_detalhes_jogo(event_id))
+
+
+async def buscar_detalhes_jogo_async(event_id: int) -> list[dict] | None:
+    return await executar_async(_fluxo_detalhes_jogo(event_id))
+
+
+async def buscar_gols_jogos_async(event_ids: list[int]) -> dict[int, list[dict] | None]:
+    return await executar_async(_fluxo_gols_jogos(event_ids))
+
+
+def buscar_jogos_por_ano(time_id: int, ano: int) -> list:
+    return executar(_fluxo_jogos_por_ano(time_id, ano))
+
+
+async def buscar_jogos_por_ano_async(time_id: int, ano: int) -> list:
+    return await executar_async(_fluxo_jogos_por_ano(time_id, ano))
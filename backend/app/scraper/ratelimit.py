@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+
+
+class LimitadorAdaptativo:
+    """
+    Token bucket global para o upstream, compartilhado por threads e corrotinas.
+
+    Cada requisição reserva um token; se o balde está vazio, a reserva fica
+    "devendo" e o chamador espera o tempo de repor o token. Assim a fila é
+    justa e a espera de um usuário sozinho é zero enquanto houver rajada.
+
+    Em 403/429 a taxa cai pela metade (até `taxa_minima`) e depois volta
+    aos poucos, somando `recuperacao` req/s a cada segundo sem novo bloqueio.
+    """
+
+    def __init__(self, taxa: float, rajada: int, taxa_minima: float, recuperacao: float):
+        self._taxa_max = taxa
+        self._taxa = taxa
+        self._taxa_minima = taxa_minima
+        self._recuperacao = recuperacao
+        self._capacidade = rajada
+        self._tokens = float(rajada)
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+        self.reservas = 0
+        self.esperas = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+        self.penalidades = 0
+
+    def _reservar(self) -> float:
+        with self._lock:
+            agora = time.monotonic()
+            decorrido = agora - self._ultimo
+            self._ultimo = agora
+            if self._taxa < self._taxa_max:
+                self._taxa = min(self._taxa_max, self._taxa + self._recuperacao * decorrido)
+            self._tokens = min(self._capacidade, self._tokens + decorrido * self._taxa) - 1
+            espera = -self._tokens / self._taxa if self._tokens < 0 else 0.0
+
+            self.reservas += 1
+            if espera:
+                self.esperas += 1
+                self.espera_total += espera
+                self.espera_max = max(self.espera_max, espera)
+            return espera
+
+    def aguardar(self) -> None:
+        espera = self._reservar()
+        if espera:
+            time.sleep(espera)
+
+    async def aguardar_async(self) -> None:
+        espera = self._reservar()
+        if espera:
+            await asyncio.sleep(espera)
+
+    def folga(self) -> float:
+        """Tokens disponíveis agora, sem reservar nenhum."""
+        with self._lock:
+            decorrido = time.monotonic() - self._ultimo
+            return min(self._capacidade, self._tokens + decorrido * self._taxa)
+
+    def penalizar(self) -> None:
+        with self._lock:
+            self._taxa = max(self._taxa_minima, self._taxa / 2)
+            self.penalidades += 1
+
+    def estatisticas(self) -> dict:
+        return {
+            "taxa_atual":     round(self._taxa, 3),
+            "taxa_max":       self._taxa_max,
+            "reservas":       self.reservas,
+            "esperas":        self.esperas,
+            "espera_total_s": round(self.espera_total, 3),
+            "espera_max_s":   round(self.espera_max, 3),
+            "penalidades":    self.penalidades,
+        }
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Colapsa chamadas idênticas em andamento numa só execução.
+
+    Quem chega enquanto a chave já está em voo espera o mesmo resultado
+    (ou a mesma exceção). O resultado é compartilhado entre todos — não mutar.
+    Funciona nos dois modelos: threads (`executar`) e asyncio (`executar_async`).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._em_voo: dict[Hashable, Future] = {}
+        self._tarefas: dict[tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+        self.execucoes = 0
+        self.coalescidas = 0
+
+    def executar(self, chave: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            futuro = self._em_voo.get(chave)
+            dono = futuro is None
+            if dono:
+                futuro = Future()
+                self._em_voo[chave] = futuro
+                self.execucoes += 1
+            else:
+                self.coalescidas += 1
+
+        if not dono:
+            return futuro.result()
+
+        try:
+            resultado = fn()
+            futuro.set_result(resultado)
+            return resultado
+        except BaseException as e:
+            futuro.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._em_voo[chave]
+
+    async def executar_async(self, chave: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        k = (asyncio.get_running_loop(), chave)
+        tarefa = self._tarefas.get(k)
+        if tarefa is None:
+            tarefa = asyncio.ensure_future(fn())
+            self._tarefas[k] = tarefa
+            tarefa.add_done_callback(lambda _: self._tarefas.pop(k, None))
+            self.execucoes += 1
+        else:
+            self.coalescidas += 1
+        # shield: se um dos clientes desconectar, a busca compartilhada continua
+        return await asyncio.shield(tarefa)
+
+    def estatisticas(self) -> dict:
+        return {"execucoes": self.execucoes, "coalescidas": self.coalescidas}
@@ -0,0 +1,28 @@
+import json
+from pathlib import Path
+
+from app.config import BASE_DIR
+
+DIR_PADRAO = BASE_DIR / "fixtures" / "sofascore"
+
+
+def arquivo_do_path(raiz: Path, path: str) -> Path:
+    """/team/1963/events/last/0 -> <raiz>/team/1963/events/last/0.json"""
+    return raiz / (path.strip("/") + ".json")
+
+
+def path_do_arquivo(raiz: Path, arquivo: Path) -> str:
+    return "/" + arquivo.relative_to(raiz).with_suffix("").as_posix()
+
+
+def salvar(raiz: Path, path: str, data: dict) -> None:
+    arquivo = arquivo_do_path(raiz, path)
+    arquivo.parent.mkdir(parents=True, exist_ok=True)
+    arquivo.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def carregar_todas(raiz: Path) -> dict[str, dict]:
+    return {
+        path_do_arquivo(raiz, arquivo): json.loads(arquivo.read_text(encoding="utf-8"))
+        for arquivo in raiz.rglob("*.json")
+    }
@@ -0,0 +1,107 @@
+"""
+Grava respostas reais do SofaScore como fixtures para o stub local.
+
+    python -m app.stub.gravador --times 1963 5981 --torneios 325 --eventos 12345678
+
+Sempre fala com o SofaScore oficial (ignora SOFASCORE_BASE_URL e o cache).
+"""
+import argparse
+import logging
+import time
+from pathlib import Path
+
+from curl_cffi import requests
+
+from app.config import settings
+from app.scraper.client import URL_OFICIAL
+from app.stub import fixtures
+
+logger = logging.getLogger(__name__)
+
+
+class Gravador:
+    def __init__(self, raiz: Path, intervalo: float):
+        self._raiz = raiz
+        self._intervalo = intervalo
+        self._sessao = requests.Session(impersonate=settings.SOFASCORE_IMPERSONATE)
+        self.gravados = 0
+
+    def gravar(self, path: str) -> dict | None:
+        time.sleep(self._intervalo)
+        try:
+            response = self._sessao.get(f"{URL_OFICIAL}{path}", timeout=15)
+        except Exception as e:
+            logger.error(f"Erro request {path}: {e}")
+            return None
+        if response.status_code != 200:
+            logger.warning(f"SofaScore {response.status_code}: {path}")
+            return None
+        data = response.json()
+        fixtures.salvar(self._raiz, path, data)
+        self.gravados += 1
+        logger.info(f"Gravado {path}")
+        return data
+
+    def gravar_paginas(self, base: str, max_paginas: int) -> list[dict]:
+        eventos = []
+        for pagina in range(max_paginas):
+            data = self.gravar(f"{base}/{pagina}")
+            if not data:
+                break
+            eventos.extend(data.get("events", []))
+            if not data.get("hasNextPage", False):
+                break
+        return eventos
+
+    def gravar_time(self, time_id: int, max_paginas: int) -> None:
+        self.gravar(f"/team/{time_id}")
+        eventos = self.gravar_paginas(f"/team/{time_id}/events/last", max_paginas)
+        eventos += self.gravar_paginas(f"/team/{time_id}/events/next", max_paginas)
+        # Mesmos /event/{id} que o parser busca para completar venues
+        for e in eventos:
+            if not (e.get("venue") or {}).get("name"):
+                self.gravar(f"/event/{e['id']}")
+
+    def gravar_torneio(self, tournament_id: int) -> None:
+        data = self.gravar(f"/unique-tournament/{tournament_id}/seasons")
+        seasons = (data or {}).get("seasons", [])
+        if not seasons:
+            return
+        base = f"/unique-tournament/{tournament_id}/season/{seasons[0]['id']}"
+        self.gravar(f"{base}/standings/total")
+        eventos = self.gravar_paginas(f"{base}/events/last", 1)
+        rodadas = {e.get("roundInfo", {}).get("round") for e in eventos} - {None}
+        for rodada in sorted(rodadas):
+            self.gravar(f"{base}/events/round/{rodada}")
+
+    def gravar_evento(self, event_id: int) -> None:
+        self.gravar(f"/event/{event_id}")
+        self.gravar(f"/event/{event_id}/incidents")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Grava fixtures do SofaScore para o stub local")
+    parser.add_argument("--times", type=int, nargs="*", default=[])
+    parser.add_argument("--torneios", type=int, nargs="*", default=[])
+    parser.add_argument("--eventos", type=int, nargs="*", default=[])
+    parser.add_argument("--buscas", nargs="*", default=[], help="termos de /search")
+    parser.add_argument("--paginas", type=int, default=5, help="máximo de páginas por listagem")
+    parser.add_argument("--intervalo", type=float, default=0.3, help="pausa entre requests (s)")
+    parser.add_argument("--destino", type=Path, default=fixtures.DIR_PADRAO)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    gravador = Gravador(args.destino, args.intervalo)
+    for termo in args.buscas:
+        gravador.gravar(f"/search/{termo}")
+    for time_id in args.times:
+        gravador.gravar_time(time_id, args.paginas)
+    for tournament_id in args.torneios:
+        gravador.gravar_torneio(tournament_id)
+    for event_id in args.eventos:
+        gravador.gravar_evento(event_id)
+    logger.info(f"{gravador.gravados} fixtures gravadas em {args.destino}")
+
+
+if __name__ == "__main__":
+    main()
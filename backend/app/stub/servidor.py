@@ -0,0 +1,96 @@
+"""
+Stub local do SofaScore, servindo as fixtures gravadas por app.stub.gravador.
+
+    python -m app.stub.servidor --porta 8765 --latencia-ms 120 --jitter-ms 60 --taxa-erro 0.02
+
+e no backend:
+
+    SOFASCORE_BASE_URL=http://127.0.0.1:8765/api/v1 uvicorn app.main:app
+
+Com --tamanho-pagina, as listagens /team/{id}/events/{last,next}/{p} são
+repaginadas a partir de todos os eventos gravados do time.
+"""
+import argparse
+import asyncio
+import random
+import re
+from pathlib import Path
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.stub import fixtures
+
+_RE_PAGINA_TIME = re.compile(r"^/team/(\d+)/events/(last|next)/(\d+)$")
+
+
+def repaginar(respostas: dict[str, dict], tamanho: int) -> dict[str, dict]:
+    """Reparte os eventos de cada time/tipo em páginas de `tamanho` eventos."""
+    por_lista: dict[tuple[str, str], dict[int, dict]] = {}
+    for path, data in respostas.items():
+        m = _RE_PAGINA_TIME.match(path)
+        if m:
+            eventos = por_lista.setdefault((m.group(1), m.group(2)), {})
+            for e in data.get("events", []):
+                eventos[e["id"]] = e
+
+    novas = {p: d for p, d in respostas.items() if not _RE_PAGINA_TIME.match(p)}
+    for (time_id, tipo), eventos in por_lista.items():
+        # last: página 0 = mais recentes; next: página 0 = mais próximos
+        ordenados = sorted(eventos.values(), key=lambda e: e.get("startTimestamp") or 0,
+                           reverse=(tipo == "last"))
+        paginas = [ordenados[i:i + tamanho] for i in range(0, len(ordenados), tamanho)]
+        for n, pagina in enumerate(paginas):
+            novas[f"/team/{time_id}/events/{tipo}/{n}"] = {
+                "events": sorted(pagina, key=lambda e: e.get("startTimestamp") or 0),
+                "hasNextPage": n < len(paginas) - 1,
+            }
+    return novas
+
+
+def criar_app(raiz: Path, latencia_ms: float = 0, jitter_ms: float = 0,
+              taxa_erro: float = 0, tamanho_pagina: int | None = None) -> FastAPI:
+    respostas = fixtures.carregar_todas(raiz)
+    if tamanho_pagina:
+        respostas = repaginar(respostas, tamanho_pagina)
+
+    app = FastAPI(title="SofaScore stub")
+    app.state.requisicoes = 0
+
+    @app.get("/api/v1/{caminho:path}")
+    async def servir(caminho: str):
+        app.state.requisicoes += 1
+        atraso = latencia_ms + random.uniform(-jitter_ms, jitter_ms)
+        if atraso > 0:
+            await asyncio.sleep(atraso / 1000)
+        if taxa_erro and random.random() < taxa_erro:
+            return JSONResponse({"error": {"code": 500}}, status_code=random.choice([500, 503, 429]))
+        data = respostas.get("/" + caminho)
+        if data is None:
+            return JSONResponse({"error": {"code": 404}}, status_code=404)
+        return data
+
+    @app.get("/stub/status")
+    def status():
+        return {"fixtures": len(respostas), "requisicoes": app.state.requisicoes}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stub local do SofaScore")
+    parser.add_argument("--fixtures", type=Path, default=fixtures.DIR_PADRAO)
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--latencia-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--taxa-erro", type=float, default=0, help="fração de respostas 5xx/429 (0-1)")
+    parser.add_argument("--tamanho-pagina", type=int, default=None)
+    args = parser.parse_args()
+
+    app = criar_app(args.fixtures, args.latencia_ms, args.jitter_ms, args.taxa_erro, args.tamanho_pagina)
+    uvicorn.run(app, host="127.0.0.1", port=args.porta)
+
+
+if __name__ == "__main__":
+    main()
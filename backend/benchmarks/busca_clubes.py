@@ -0,0 +1,98 @@
+"""
+Benchmark: LIKE '%nome%' (consulta antiga) x índice de trigramas (clubes_busca).
+
+    cd backend
+    python -m benchmarks.busca_clubes --db ../scraper/futebol.db
+
+Trabalha numa cópia do banco (o índice é criado nela). Para uma amostra de
+clubes, consulta o nome exato, o nome sem acento e um pedaço do nome, e mede
+latência e se o clube certo veio em primeiro.
+"""
+import argparse
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from app.config import settings
+
+
+def _medir(consulta, termos: list[tuple[int, str]]) -> dict:
+    tempos, acertos, vazios = [], 0, 0
+    for clube_id, termo in termos:
+        inicio = time.perf_counter()
+        resultado = consulta(termo)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        if resultado is None:
+            vazios += 1
+        elif resultado == clube_id:
+            acertos += 1
+    tempos.sort()
+    return {
+        "media_ms": statistics.mean(tempos),
+        "p95_ms":   tempos[int(len(tempos) * 0.95) - 1],
+        "acertos":  acertos / len(termos),
+        "vazios":   vazios / len(termos),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LIKE x FTS5 trigram na busca de clubes")
+    parser.add_argument("--db", type=Path, default=Path(settings.DB_FILE))
+    parser.add_argument("--amostra", type=int, default=500)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        copia = Path(tmp) / "bench.db"
+        shutil.copy(args.db, copia)
+        settings.DB_FILE = str(copia)
+
+        from app.db.database import conectar, inicializar_banco
+        from app.db.repositories.club_repo import buscar_clubes, normalizar_nome
+
+        inicializar_banco()
+        conn = conectar()
+        clubes = [(row["id"], row["nome"]) for row in conn.execute("SELECT id, nome FROM clubes WHERE nome <> ''")]
+        if not clubes:
+            raise SystemExit(f"{args.db} não tem clubes")
+
+        random.seed(args.semente)
+        amostra = random.sample(clubes, min(args.amostra, len(clubes)))
+        variantes = {
+            "nome exato":    [(i, nome) for i, nome in amostra],
+            "sem acento":    [(i, normalizar_nome(nome)) for i, nome in amostra if normalizar_nome(nome) != nome.lower()],
+            "pedaço (4+)":   [(i, max(nome.split(), key=len)) for i, nome in amostra if len(max(nome.split(), key=len)) >= 4],
+        }
+
+        def like(termo: str) -> int | None:
+            # Como o consultar_estadio_do_clube antigo: uma conexão por consulta.
+            c = conectar()
+            try:
+                row = c.execute("SELECT id FROM clubes WHERE nome LIKE ? LIMIT 1", (f"%{termo}%",)).fetchone()
+                return row[0] if row else None
+            finally:
+                c.close()
+
+        def fts(termo: str) -> int | None:
+            clubes = buscar_clubes(termo, limite=1)
+            return clubes[0]["id"] if clubes else None
+
+        inicio = time.perf_counter()
+        fts("aquecimento")  # primeira chamada constrói o índice
+        print(f"{len(clubes)} clubes em {args.db}; índice construído em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+        print(f"{'variante':<14} {'n':>5}  {'consulta':<6} {'média ms':>9} {'p95 ms':>8} {'acerto':>7} {'vazio':>6}")
+        for nome, termos in variantes.items():
+            if not termos:
+                continue
+            for rotulo, consulta in (("LIKE", like), ("FTS", fts)):
+                r = _medir(consulta, termos)
+                print(f"{nome:<14} {len(termos):>5}  {rotulo:<6} {r['media_ms']:>9.3f} {r['p95_ms']:>8.3f} "
+                      f"{r['acertos']:>7.1%} {r['vazios']:>6.1%}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: estatísticas de clubes em laço sobre dicts x colunas NumPy.
+
+    cd backend
+    python -m benchmarks.estatisticas_times --ligas 10 --temporadas 8
+
+Gera temporadas sintéticas (20 times, turno e returno) e calcula, para todos
+os clubes e para um só, totais, casa/fora, jogos sem sofrer gol, forma e
+pontos por jogo por temporada: primeiro percorrendo os dicts no formato de
+_montar_jogo (como a página do clube faria hoje), depois com
+calcular_estatisticas. Confere que os dois dão o mesmo resultado.
+"""
+import argparse
+import random
+import statistics
+import time
+from collections import defaultdict
+
+from app.core.estatisticas import Resultados, calcular_estatisticas
+
+SEMANA = 7 * 24 * 3600
+
+
+def _gerar(ligas: int, temporadas: int, semente: int) -> list[tuple]:
+    random.seed(semente)
+    linhas = []
+    for liga in range(ligas):
+        times = [liga * 100 + t for t in range(1, 21)]
+        for temporada in range(temporadas):
+            season_id = liga * 1000 + temporada
+            inicio = 1_500_000_000 + temporada * 52 * SEMANA
+            rodadas = []
+            for r in range(19):
+                rot = times[:1] + times[1:][r:] + times[1:][:r]
+                rodadas.append([(rot[i], rot[-1 - i]) for i in range(10)])
+            rodadas += [[(b, a) for a, b in rodada] for rodada in rodadas]
+            for n, rodada in enumerate(rodadas):
+                for k, (home, away) in enumerate(rodada):
+                    linhas.append((inicio + n * SEMANA + k, season_id, home, away,
+                                   random.choice((0, 0, 1, 1, 1, 2, 2, 3, 4)), random.choice((0, 0, 1, 1, 2, 2, 3))))
+    return linhas
+
+
+def _jogos(linhas: list[tuple]) -> list[dict]:
+    """Dicts com os campos de _montar_jogo que importam aqui."""
+    return [
+        {"timestamp": inicio, "season_id": season_id, "home_id": home, "away_id": away,
+         "placar": f"{hg} - {ag}", "status": "finished"}
+        for inicio, season_id, home, away, hg, ag in linhas
+    ]
+
+
+def _laco(jogos: list[dict], time_ids: set[int] | None, ultimos: int) -> dict[int, dict]:
+    stats: dict[int, dict] = {}
+    historico: dict[int, list] = defaultdict(list)
+    for j in jogos:
+        hg, ag = (int(p) for p in j["placar"].split(" - "))
+        for time_id, pro, contra, lado in ((j["home_id"], hg, ag, "casa"), (j["away_id"], ag, hg, "fora")):
+            if time_ids is not None and time_id not in time_ids:
+                continue
+            s = stats.setdefault(time_id, {"jogos": 0, "pontos": 0, "gols_pro": 0, "gols_contra": 0,
+                                           "sem_sofrer": 0, "casa": [0, 0], "fora": [0, 0],
+                                           "temporadas": defaultdict(lambda: [0, 0])})
+            pontos = 3 if pro > contra else 1 if pro == contra else 0
+            s["jogos"] += 1
+            s["pontos"] += pontos
+            s["gols_pro"] += pro
+            s["gols_contra"] += contra
+            s["sem_sofrer"] += contra == 0
+            s[lado][0] += 1
+            s[lado][1] += pontos
+            s["temporadas"][j["season_id"]][0] += 1
+            s["temporadas"][j["season_id"]][1] += pontos
+            historico[time_id].append((j["timestamp"], "V" if pro > contra else "E" if pro == contra else "D"))
+    for time_id, s in stats.items():
+        s["forma"] = [letra for _, letra in sorted(historico[time_id])[-ultimos:]]
+    return stats
+
+
+def _medir(fn, repeticoes: int) -> tuple[float, object]:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = fn()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos), resultado
+
+
+def _conferir(laco: dict, vetor: dict) -> None:
+    assert laco.keys() == vetor.keys()
+    for time_id, s in laco.items():
+        v = vetor[time_id]
+        assert (s["jogos"], s["pontos"], s["gols_pro"], s["gols_contra"], s["sem_sofrer"]) == \
+               (v["jogos"], v["pontos"], v["gols_pro"], v["gols_contra"], v["sem_sofrer"]), time_id
+        assert s["casa"] == [v["casa"]["jogos"], v["casa"]["pontos"]], time_id
+        assert s["forma"] == v["forma"], time_id
+        assert {k: tuple(x) for k, x in s["temporadas"].items()} == \
+               {t["season_id"]: (t["jogos"], t["pontos"]) for t in v["temporadas"]}, time_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Estatísticas de clubes: laço em dicts x NumPy")
+    parser.add_argument("--ligas", type=int, default=10)
+    parser.add_argument("--temporadas", type=int, default=8)
+    parser.add_argument("--ultimos", type=int, default=5)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    linhas = _gerar(args.ligas, args.temporadas, args.semente)
+    jogos = _jogos(linhas)
+    print(f"{len(linhas)} jogos ({args.ligas} ligas x {args.temporadas} temporadas)")
+
+    inicio = time.perf_counter()
+    colunas = Resultados.de_linhas(linhas)
+    print(f"montagem das colunas: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    clube = linhas[0][2]
+    casos = {
+        "todos os clubes": None,
+        "um clube":        {clube},
+    }
+    print(f"{'caso':<16} {'laço ms':>9} {'numpy ms':>9} {'ganho':>7}")
+    for nome, time_ids in casos.items():
+        t_laco, laco = _medir(lambda: _laco(jogos, time_ids, args.ultimos), args.repeticoes)
+        alvos = list(time_ids) if time_ids else None
+        t_vetor, vetor = _medir(lambda: calcular_estatisticas(colunas, alvos, args.ultimos), args.repeticoes)
+        _conferir(laco, vetor)
+        print(f"{nome:<16} {t_laco:>9.1f} {t_vetor:>9.1f} {t_laco / t_vetor:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
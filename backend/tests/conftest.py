@@ -0,0 +1,43 @@
+import os
+import tempfile
+
+# Antes de importar o app: nada de tocar nos bancos e caches de verdade.
+_TMP = tempfile.mkdtemp(prefix="deolho-testes-")
+os.environ.setdefault("DB_FILE", os.path.join(_TMP, "futebol.db"))
+os.environ.setdefault("SOFASCORE_CACHE_DB", os.path.join(_TMP, "cache_sofascore.db"))
+os.environ.setdefault("IMAGENS_DIR", os.path.join(_TMP, "cache_imagens"))
+os.environ.setdefault("AQUECIMENTO_ATIVO", "false")
+
+import pytest
+
+from app.config import settings
+from app.db.database import inicializar_banco
+from app.scraper.client import _marcar_degradado
+
+
+@pytest.fixture
+def banco(tmp_path, monkeypatch):
+    """Banco vazio por teste."""
+    monkeypatch.setattr(settings, "DB_FILE", str(tmp_path / "futebol.db"))
+    inicializar_banco()
+
+
+@pytest.fixture
+def rodar():
+    """
+    Executa um fluxo respondendo de um dict path -> payload; devolve (resultado, paths pedidos).
+    Paths em `degradados` saem como o fallback do client os serviria (payload antigo, marcado).
+    """
+    def executar(fluxo, respostas: dict, degradados: frozenset = frozenset()):
+        pedidos_feitos = []
+        try:
+            pedidos = next(fluxo)
+            while True:
+                paths = [p if isinstance(p, str) else p[0] for p in pedidos]
+                pedidos_feitos.extend(paths)
+                for p in degradados.intersection(paths):
+                    _marcar_degradado(p)
+                pedidos = fluxo.send([respostas.get(p) for p in paths])
+        except StopIteration as fim:
+            return fim.value, pedidos_feitos
+    return executar
@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+import pytest
+
+from app.scraper.cache import CacheDisco, CacheMemoria, CacheRespostas, familia, ttl_para
+
+STANDINGS = "/unique-tournament/325/season/1/standings/total"
+INCIDENTES = "/event/9/incidents"
+ENCERRADO = {"incidents": [{"incidentType": "period", "text": "FT"}]}
+
+
+@pytest.fixture
+def respostas(tmp_path):
+    cache = CacheRespostas(max_bytes=10_000, arquivo=str(tmp_path / "cache.db"))
+    yield cache
+    cache.descarregar()
+
+
+def test_memoria_descarta_o_menos_usado_pelo_orcamento_em_bytes():
+    memoria = CacheMemoria(max_bytes=30)
+    for path in ("/a", "/b", "/c"):
+        memoria.gravar(path, b"x" * 10, None)
+    memoria.ler("/a")                  # /a passa a ser o mais recente
+    memoria.gravar("/d", b"x" * 10, None)
+    assert memoria.ler("/b") is None
+    assert all(memoria.ler(p) is not None for p in ("/a", "/c", "/d"))
+    assert (memoria.evictions, memoria.tamanho()) == (1, (3, 30))
+
+
+def test_memoria_ignora_payload_maior_que_o_orcamento_e_vencido():
+    memoria = CacheMemoria(max_bytes=10)
+    memoria.gravar("/grande", b"x" * 11, None)
+    memoria.gravar("/vencido", b"x", time.time() - 1)
+    assert memoria.ler("/grande") is None
+    assert memoria.ler("/vencido") is None
+    assert memoria.tamanho() == (0, 0)
+
+
+def test_politica_de_ttl_por_template():
+    assert ttl_para("/unique-tournament/325/seasons", {}) == 6 * 3600
+    assert ttl_para(STANDINGS, {}) == 5 * 60
+    assert ttl_para(INCIDENTES, ENCERRADO) is None        # jogo encerrado: nunca vence
+    assert ttl_para(INCIDENTES, {"incidents": []}) == 60
+    assert ttl_para("/sem/politica", {}) == 0
+    assert familia("/team/5/events/last/3") == "/team/*/events/last/*"
+    assert familia("/sem/politica") == "/sem/*"
+
+
+def test_disco_atende_depois_da_memoria_e_promove(respostas):
+    respostas.gravar(STANDINGS, {"standings": []})
+    respostas.memoria = CacheMemoria(10_000)          # como depois de um restart
+    assert respostas.ler(STANDINGS) == {"standings": []}
+    assert respostas.ler(STANDINGS) == {"standings": []}
+    assert (respostas.hits_disco, respostas.hits_memoria, respostas.misses) == (1, 1, 0)
+
+
+def test_path_sem_politica_nao_e_guardado(respostas):
+    respostas.gravar("/sem/politica", {"x": 1})
+    assert respostas.ler("/sem/politica") is None
+    assert respostas.misses == 1
+
+
+def test_vencido_e_miss_mas_continua_servindo_de_antigo(respostas):
+    respostas.gravar(STANDINGS, {"standings": []})
+    respostas.descarregar()
+    payload, expira_em, gravado_em = respostas.disco.ler(STANDINGS)
+    respostas.disco.gravar(STANDINGS, payload, time.time() - 1)
+    respostas.memoria = CacheMemoria(10_000)
+    assert respostas.ler(STANDINGS) is None
+    data, _ = respostas.ler_antigo(STANDINGS)
+    assert data == {"standings": []}
+
+
+def test_gravacao_em_fila_vira_um_commit_e_sobrevive_a_reabrir(tmp_path):
+    arquivo = str(tmp_path / "cache.db")
+    disco = CacheDisco(arquivo)
+    commits = disco.commits
+    for i in range(50):
+        disco.gravar(f"/team/{i}", b"{}", None)
+    assert disco.ler("/team/7") == (b"{}", None, pytest.approx(time.time(), abs=5))   # ainda na fila
+    disco.descarregar()
+    assert disco.commits == commits + 1
+    assert CacheDisco(arquivo).ler("/team/49")[0] == b"{}"
+
+
+def test_ler_async_igual_ao_ler(respostas):
+    respostas.gravar(INCIDENTES, ENCERRADO)
+    respostas.memoria = CacheMemoria(10_000)
+    assert asyncio.run(respostas.ler_async(INCIDENTES)) == ENCERRADO
+    assert asyncio.run(respostas.ler_async(INCIDENTES)) == ENCERRADO
+    assert (respostas.hits_disco, respostas.hits_memoria) == (1, 1)
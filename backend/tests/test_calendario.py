@@ -0,0 +1,52 @@
+from app.scraper.leagues import _fluxo_calendario_liga
+
+TORNEIO, TEMPORADA = 384, 70000
+BASE = f"/unique-tournament/{TORNEIO}/season/{TEMPORADA}"
+
+
+def _evento(id_: int, rodada: int, slug: str | None, home: int, away: int) -> dict:
+    return {
+        "id": id_, "startTimestamp": 1_700_000_000 + id_, "status": {"type": "finished"},
+        "homeTeam": {"id": home, "name": f"Time {home}"}, "awayTeam": {"id": away, "name": f"Time {away}"},
+        "homeScore": {"display": 1}, "awayScore": {"display": 0},
+        "tournament": {"id": 1, "uniqueTournament": {"id": TORNEIO}}, "season": {"id": TEMPORADA},
+        "roundInfo": {"round": rodada, **({"slug": slug} if slug else {})},
+    }
+
+
+def _respostas() -> dict:
+    # Copa: a rodada 1 é a primeira fase e as quartas e a semi também vêm como "round" 1.
+    return {
+        f"{BASE}/rounds": {"rounds": [
+            {"round": 1},
+            {"round": 1, "slug": "quarterfinals", "name": "Quartas"},
+            {"round": 1, "slug": "semifinals", "name": "Semifinal"},
+        ]},
+        f"{BASE}/events/round/1": {"events": [_evento(1, 1, None, 1, 2), _evento(2, 1, None, 3, 4)]},
+        f"{BASE}/events/round/1/slug/quarterfinals": {"events": [_evento(3, 1, "quarterfinals", 1, 3)]},
+        f"{BASE}/events/round/1/slug/semifinals": {"events": [_evento(4, 1, "semifinals", 1, 5)]},
+    }
+
+
+def _jogos_por_fase(calendario: dict) -> dict:
+    return {r["slug"]: [j["id"] for j in r["jogos"]] for r in calendario["rodadas"]}
+
+
+def test_fases_com_o_mesmo_numero_nao_se_misturam(banco, rodar):
+    calendario, pedidos = rodar(_fluxo_calendario_liga(TORNEIO, TEMPORADA), _respostas())
+    assert len(pedidos) == 4
+    assert _jogos_por_fase(calendario) == {None: [1, 2], "quarterfinals": [3], "semifinals": [4]}
+
+
+def test_cada_fase_fecha_por_conta_propria(banco, rodar):
+    rodar(_fluxo_calendario_liga(TORNEIO, TEMPORADA), _respostas())
+    calendario, pedidos = rodar(_fluxo_calendario_liga(TORNEIO, TEMPORADA), _respostas())
+    # Todas fecharam na primeira passada: só /rounds volta ao SofaScore.
+    assert pedidos == [f"{BASE}/rounds"]
+    assert _jogos_por_fase(calendario) == {None: [1, 2], "quarterfinals": [3], "semifinals": [4]}
+
+
+def test_sem_upstream_serve_as_fases_do_banco(banco, rodar):
+    rodar(_fluxo_calendario_liga(TORNEIO, TEMPORADA), _respostas())
+    calendario, _ = rodar(_fluxo_calendario_liga(TORNEIO, TEMPORADA), {})
+    assert _jogos_por_fase(calendario) == {None: [1, 2], "quarterfinals": [3], "semifinals": [4]}
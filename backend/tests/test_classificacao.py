@@ -0,0 +1,136 @@
+from dataclasses import replace
+
+from app.core.classificacao import (
+    CRITERIOS_DESEMPATE, CRITERIOS_PADRAO, MotorClassificacao, Resultado, montar_tabela,
+)
+
+BRASILEIRAO, PREMIER, LA_LIGA, LIGUE_1 = 325, 17, 8, 34
+
+
+def _resultados(*jogos: tuple) -> list[Resultado]:
+    """Jogos (home, away, home_gols, away_gols[, rodada]) na ordem em que aconteceram."""
+    return [
+        Resultado(id=i, inicio=1000 + i, rodada=j[4] if len(j) > 4 else 1,
+                  home_id=j[0], away_id=j[1], home_gols=j[2], away_gols=j[3])
+        for i, j in enumerate(jogos, start=1)
+    ]
+
+
+def _ordem(resultados: list[Resultado], torneio: int | None = None, **kwargs) -> list[int]:
+    criterios = CRITERIOS_DESEMPATE.get(torneio, CRITERIOS_PADRAO)
+    return [linha.time_id for linha in montar_tabela(resultados, criterios, **kwargs).ordenadas()]
+
+
+def test_pontos_vitoria_empate_derrota():
+    tabela = montar_tabela(_resultados((1, 2, 2, 0), (2, 3, 1, 1)), CRITERIOS_PADRAO)
+    linhas = {linha.time_id: linha for linha in tabela.linhas.values()}
+    assert (linhas[1].pontos, linhas[2].pontos, linhas[3].pontos) == (3, 1, 1)
+    assert (linhas[2].derrotas, linhas[2].empates, linhas[2].saldo) == (1, 1, -2)
+
+
+def test_vitorias_antes_do_saldo_no_brasileirao():
+    # 10 e 20 com 3 pontos: 10 com uma vitória e saldo -4, 20 com três empates e saldo 0.
+    jogos = _resultados((10, 30, 1, 0), (40, 10, 5, 0), (20, 50, 0, 0), (60, 20, 0, 0), (20, 30, 0, 0))
+    brasileirao = _ordem(jogos, BRASILEIRAO)
+    padrao = _ordem(jogos)
+    assert brasileirao.index(10) < brasileirao.index(20)
+    assert padrao.index(20) < padrao.index(10)
+
+
+def test_confronto_direto_antes_do_saldo_na_la_liga():
+    # 1 e 2 com 3 pontos; 2 tem saldo melhor, mas 1 ganhou o confronto.
+    jogos = _resultados((1, 2, 1, 0), (2, 3, 4, 0), (1, 4, 0, 1), (3, 4, 0, 0))
+    assert _ordem(jogos, LA_LIGA) == [4, 1, 2, 3]
+    assert _ordem(jogos, PREMIER) == [4, 2, 1, 3]
+
+
+def test_saldo_do_confronto_quando_os_pontos_do_confronto_empatam():
+    # Triangular 1 > 2 > 3 > 1, todos com 3 pontos entre si; saldo no confronto: 1 +2, 3 0, 2 -2.
+    # Cada um ganha mais um jogo de fora, com margens que invertem o saldo geral.
+    jogos = _resultados(
+        (1, 2, 3, 0), (2, 3, 1, 0), (3, 1, 1, 0),
+        (1, 4, 1, 0), (2, 5, 9, 0), (3, 6, 5, 0),
+    )
+    assert _ordem(jogos, LA_LIGA)[:3] == [1, 3, 2]
+    assert _ordem(jogos, LIGUE_1)[:3] == [2, 3, 1]
+
+
+def test_confronto_e_recalculado_no_subgrupo_que_segue_empatado():
+    # 1, 2 e 3 com 9 pontos. No confronto a três, 1 fica à frente e 3 e 2 empatam
+    # em pontos (4); o saldo desse confronto poria 2 na frente (-1 x -3), mas
+    # entre os dois só contam os jogos deles, e 3 ganhou um e empatou o outro.
+    jogos = _resultados(
+        (1, 3, 1, 0), (3, 1, 0, 3), (1, 2, 1, 0), (2, 1, 1, 0), (3, 2, 1, 0), (2, 3, 0, 0),
+        (3, 4, 1, 0), (3, 5, 0, 0), (3, 6, 0, 0),
+        (2, 7, 1, 0), (2, 8, 0, 0), (2, 9, 0, 0),
+    )
+    assert _ordem(jogos, LA_LIGA)[:3] == [1, 3, 2]
+
+
+def test_empate_total_fica_na_ordem_do_id():
+    jogos = _resultados((5, 9, 1, 1), (3, 7, 1, 1))
+    assert _ordem(jogos) == [3, 5, 7, 9]
+
+
+def test_tabela_ate_a_rodada():
+    jogos = _resultados((1, 2, 1, 0, 1), (2, 1, 3, 0, 2))
+    assert _ordem(jogos, rodada=1)[0] == 1
+    assert _ordem(jogos, rodada=2)[0] == 2
+
+
+def test_tabela_de_mando_so_conta_o_lado():
+    jogos = _resultados((1, 2, 0, 3), (2, 1, 0, 1))
+    casa = {linha.time_id: linha for linha in montar_tabela(jogos, CRITERIOS_PADRAO, "casa").linhas.values()}
+    assert (casa[1].jogos, casa[1].pontos, casa[2].jogos, casa[2].pontos) == (1, 0, 1, 0)
+    fora = {linha.time_id: linha for linha in montar_tabela(jogos, CRITERIOS_PADRAO, "fora").linhas.values()}
+    assert (fora[1].pontos, fora[2].pontos) == (3, 3)
+
+
+def test_tabela_de_forma_usa_os_ultimos_jogos_de_cada_time():
+    # 1 perdeu os dois primeiros e ganhou os três últimos; 2 o contrário.
+    jogos = _resultados(
+        (1, 3, 0, 1), (2, 3, 1, 0), (1, 4, 0, 1), (2, 4, 1, 0),
+        (1, 5, 1, 0), (2, 5, 0, 1), (1, 6, 1, 0), (2, 6, 0, 1), (1, 7, 1, 0), (2, 7, 0, 1),
+    )
+    forma = montar_tabela(jogos, CRITERIOS_PADRAO, "forma", n_forma=3)
+    linhas = {linha.time_id: linha for linha in forma.linhas.values()}
+    assert (linhas[1].jogos, linhas[1].pontos, linhas[2].pontos) == (3, 9, 0)
+    assert forma.forma(3)[1] == ["V", "V", "V"]
+
+
+def test_motor_incremental_igual_ao_calculo_do_zero():
+    jogos = _resultados((1, 2, 1, 0), (2, 3, 4, 0), (1, 4, 0, 1), (3, 4, 0, 0), (4, 2, 2, 2))
+    motor = MotorClassificacao()
+    motor.tabela(LA_LIGA, 1, jogos[:2], "total")
+    linhas, _ = motor.tabela(LA_LIGA, 1, jogos, "total")
+    assert [linha.time_id for linha in linhas] == _ordem(jogos, LA_LIGA)
+    assert (motor.recalculos, motor.incrementais) == (1, 1)
+
+
+def test_motor_recalcula_quando_um_resultado_muda():
+    jogos = _resultados((1, 2, 1, 0), (3, 4, 1, 0))
+    motor = MotorClassificacao()
+    motor.tabela(PREMIER, 1, jogos, "total")
+    corrigido = [jogos[0], replace(jogos[1], home_gols=0, away_gols=5)]
+    linhas, _ = motor.tabela(PREMIER, 1, corrigido, "total")
+    assert [linha.time_id for linha in linhas] == _ordem(corrigido)
+    assert linhas[0].time_id == 4
+    assert motor.recalculos == 2
+
+
+def test_motor_devolve_copias():
+    jogos = _resultados((1, 2, 1, 0))
+    motor = MotorClassificacao()
+    linhas, _ = motor.tabela(PREMIER, 1, jogos, "total")
+    linhas[0].vitorias = 99
+    linhas, _ = motor.tabela(PREMIER, 1, jogos, "total")
+    assert linhas[0].vitorias == 1
+
+
+def test_motor_forma_com_n_jogos():
+    jogos = _resultados(*[(1, 2, k % 3, 1) for k in range(8)])
+    motor = MotorClassificacao()
+    _, forma = motor.tabela(PREMIER, 1, jogos, "total", n_forma=7)
+    assert forma[1] == ["E", "V", "D", "E", "V", "D", "E"]
+    _, forma = motor.tabela(PREMIER, 1, jogos, "total")
+    assert len(forma[1]) == 5
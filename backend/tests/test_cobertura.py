@@ -0,0 +1,65 @@
+import sqlite3
+
+from app.config import settings
+from app.db.repositories.evento_repo import cobertura_ate, registrar_cobertura
+
+TIME_ID = 7
+
+
+def _intervalos(time_id: int = TIME_ID) -> list[tuple[int, int]]:
+    conn = sqlite3.connect(settings.DB_FILE)
+    try:
+        return conn.execute(
+            "SELECT inicio, fim FROM cobertura_time WHERE time_id = ? ORDER BY inicio", (time_id,)
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def test_intervalos_disjuntos_ficam_separados(banco):
+    registrar_cobertura(TIME_ID, 100, 200)
+    registrar_cobertura(TIME_ID, 300, 400)
+    assert _intervalos() == [(100, 200), (300, 400)]
+
+
+def test_sobreposicao_e_encostados_se_fundem(banco):
+    registrar_cobertura(TIME_ID, 100, 200)
+    registrar_cobertura(TIME_ID, 150, 250)
+    registrar_cobertura(TIME_ID, 250, 300)     # encosta no fim: [a, b) + [b, c) = [a, c)
+    assert _intervalos() == [(100, 300)]
+
+
+def test_intervalo_que_cobre_varios_funde_todos(banco):
+    for inicio in (100, 300, 500):
+        registrar_cobertura(TIME_ID, inicio, inicio + 50)
+    registrar_cobertura(TIME_ID, 120, 520)
+    assert _intervalos() == [(100, 550)]
+
+
+def test_intervalo_contido_nao_muda_nada(banco):
+    registrar_cobertura(TIME_ID, 100, 500)
+    registrar_cobertura(TIME_ID, 200, 300)
+    assert _intervalos() == [(100, 500)]
+
+
+def test_fora_de_ordem_da_o_mesmo_resultado(banco):
+    for inicio, fim in [(500, 600), (0, 100), (90, 510)]:
+        registrar_cobertura(TIME_ID, inicio, fim)
+    assert _intervalos() == [(0, 600)]
+
+
+def test_times_nao_se_misturam(banco):
+    registrar_cobertura(TIME_ID, 0, 100)
+    registrar_cobertura(TIME_ID + 1, 100, 200)
+    assert _intervalos() == [(0, 100)]
+    assert _intervalos(TIME_ID + 1) == [(100, 200)]
+
+
+def test_cobertura_ate(banco):
+    registrar_cobertura(TIME_ID, 0, 100)
+    registrar_cobertura(TIME_ID, 200, 300)
+    assert cobertura_ate(TIME_ID, 0) == 100
+    assert cobertura_ate(TIME_ID, 99) == 100
+    assert cobertura_ate(TIME_ID, 100) is None      # fim é aberto
+    assert cobertura_ate(TIME_ID, 250) == 300
+    assert cobertura_ate(TIME_ID + 1, 0) is None
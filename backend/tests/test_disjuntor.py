@@ -0,0 +1,211 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.scraper import breaker, client
+from app.scraper.breaker import ABERTO, FECHADO, MEIO_ABERTO, Disjuntor, Disjuntores
+from app.scraper.cache import CacheRespostas
+from app.scraper.ratelimit import LimitadorAdaptativo
+from app.scraper.singleflight import SingleFlight
+
+PATH = "/team/1/events/last/0"
+ANTIGO = {"events": [{"id": 1}]}
+NOVO = {"events": [{"id": 1}, {"id": 2}]}
+
+
+class _Relogio:
+    def __init__(self):
+        self.agora = 1000.0
+
+    def monotonic(self) -> float:
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = _Relogio()
+    monkeypatch.setattr(breaker, "time", relogio)
+    return relogio
+
+
+def _esperar(condicao, limite: float = 5.0) -> None:
+    fim = time.monotonic() + limite
+    while not condicao():
+        assert time.monotonic() < fim
+        time.sleep(0.01)
+
+
+# --- Disjuntor ---
+
+def test_abre_depois_de_falhas_seguidas_e_recusa(relogio):
+    disjuntor = Disjuntor(limite_falhas=3, tempo_aberto=30)
+    disjuntor.falha()
+    disjuntor.falha()
+    disjuntor.sucesso()            # sucesso zera a sequência
+    disjuntor.falha()
+    disjuntor.falha()
+    assert disjuntor.permitir() == FECHADO
+    disjuntor.falha()
+    assert disjuntor.permitir() is None
+    assert disjuntor.estatisticas()["estado"] == ABERTO
+    assert (disjuntor.aberturas, disjuntor.recusadas) == (1, 1)
+
+
+def test_meio_aberto_deixa_passar_um_teste_so(relogio):
+    disjuntor = Disjuntor(limite_falhas=1, tempo_aberto=30)
+    disjuntor.falha()
+    relogio.agora += 30
+    assert disjuntor.permitir() == MEIO_ABERTO
+    assert disjuntor.permitir() is None
+    disjuntor.sucesso()
+    assert disjuntor.permitir() == FECHADO
+
+
+def test_falha_no_teste_reabre(relogio):
+    disjuntor = Disjuntor(limite_falhas=5, tempo_aberto=30)
+    for _ in range(5):
+        disjuntor.falha()
+    relogio.agora += 30
+    assert disjuntor.permitir() == MEIO_ABERTO
+    disjuntor.falha()              # uma falha basta no meio-aberto
+    assert disjuntor.permitir() is None
+    relogio.agora += 30
+    assert disjuntor.permitir() == MEIO_ABERTO
+    assert disjuntor.aberturas == 2
+
+
+def test_liberar_devolve_a_vaga_de_teste(relogio):
+    disjuntor = Disjuntor(limite_falhas=1, tempo_aberto=30)
+    disjuntor.falha()
+    relogio.agora += 30
+    assert disjuntor.permitir() == MEIO_ABERTO
+    disjuntor.liberar()
+    assert disjuntor.permitir() == MEIO_ABERTO
+
+
+# --- client.get com disjuntor e fallback ---
+
+class _Upstream:
+    """Troca a rede do client: cada path responde um payload ou levanta uma exceção."""
+
+    def __init__(self):
+        self.respostas: dict = {}
+        self.pedidos: list[str] = []
+
+    def responder(self, path: str):
+        self.pedidos.append(path)
+        resposta = self.respostas.get(path)
+        if isinstance(resposta, Exception):
+            raise resposta
+        return resposta
+
+
+@pytest.fixture
+def upstream(tmp_path, monkeypatch):
+    monkeypatch.setattr(client, "cache", CacheRespostas(10_000, str(tmp_path / "cache.db")))
+    monkeypatch.setattr(client, "_disjuntores", Disjuntores(2, 60))
+    monkeypatch.setattr(client, "_voos", SingleFlight())
+    monkeypatch.setattr(client, "_limitador", LimitadorAdaptativo(100, 100, 1, 1))
+    falso = _Upstream()
+
+    async def buscar_async(path, timeout):
+        return falso.responder(path)
+
+    monkeypatch.setattr(client, "_buscar", lambda path, timeout: falso.responder(path))
+    monkeypatch.setattr(client, "_buscar_async", buscar_async)
+    return falso
+
+
+def _guardar_vencido(path: str, data: dict) -> None:
+    payload = json.dumps(data).encode("utf-8")
+    client.cache.disco.gravar(path, payload, time.time() - 1)
+
+
+def _abrir(path: str = PATH) -> None:
+    disjuntor = client._disjuntores.para(client.familia(path))
+    disjuntor.falha()
+    disjuntor.falha()
+
+
+def test_circuito_aberto_serve_o_antigo_sem_ir_ao_upstream(upstream):
+    _guardar_vencido(PATH, ANTIGO)
+    _abrir()
+    marcas = client.rastrear_dados_antigos()
+    with client.rastrear_degradados() as degradados:
+        assert client.get(PATH) == ANTIGO
+    assert upstream.pedidos == []
+    assert degradados == [PATH]
+    assert len(marcas) == 1
+
+
+def test_falha_sem_antigo_devolve_none_e_marca_degradado(upstream):
+    upstream.respostas[PATH] = client.FalhaUpstream("timeout")
+    with client.rastrear_degradados() as degradados:
+        assert client.get(PATH) is None
+    assert degradados == [PATH]
+
+
+def test_falha_com_antigo_serve_o_antigo(upstream):
+    _guardar_vencido(PATH, ANTIGO)
+    upstream.respostas[PATH] = client.FalhaUpstream("SofaScore 503")
+    assert client.get(PATH) == ANTIGO
+    assert client._disjuntores.para(client.familia(PATH)).estatisticas()["falhas"] == 1
+
+
+def test_meio_aberto_serve_o_antigo_e_revalida_em_background(upstream, relogio):
+    _guardar_vencido(PATH, ANTIGO)
+    _abrir()
+    relogio.agora += 60
+    upstream.respostas[PATH] = NOVO
+    assert client.get(PATH) == ANTIGO
+    disjuntor = client._disjuntores.para(client.familia(PATH))
+    _esperar(lambda: disjuntor.estatisticas()["estado"] == FECHADO)
+    assert upstream.pedidos == [PATH]
+    assert client.get(PATH) == NOVO          # a revalidação gravou no cache
+
+
+def test_meio_aberto_sem_antigo_busca_e_nao_marca_degradado(upstream, relogio):
+    _abrir()
+    relogio.agora += 60
+    upstream.respostas[PATH] = NOVO
+    with client.rastrear_degradados() as degradados:
+        assert client.get(PATH) == NOVO
+    assert degradados == []
+
+
+def test_200_sem_json_penaliza_e_conta_como_falha(upstream, monkeypatch):
+    class _Html:
+        status_code = 200
+
+        def json(self):
+            raise ValueError("<html>desafio</html>")
+
+    monkeypatch.setattr(client, "_buscar", lambda path, timeout: client._interpretar(_Html(), path))
+    _guardar_vencido(PATH, ANTIGO)
+    assert client.get(PATH) == ANTIGO
+    assert client._limitador.penalidades == 1
+    assert client._disjuntores.para(client.familia(PATH)).estatisticas()["falhas"] == 1
+
+
+def test_get_async_circuito_aberto_serve_o_antigo(upstream):
+    _guardar_vencido(PATH, ANTIGO)
+    _abrir()
+
+    async def cenario():
+        with client.rastrear_degradados() as degradados:
+            return await client.get_async(PATH), list(degradados)
+
+    assert asyncio.run(cenario()) == (ANTIGO, [PATH])
+    assert upstream.pedidos == []
+
+
+def test_erro_inesperado_solta_a_vaga_de_teste(upstream, relogio):
+    _abrir()
+    relogio.agora += 60
+    upstream.respostas[PATH] = RuntimeError("bug")
+    with pytest.raises(RuntimeError):
+        client.get(PATH)
+    upstream.respostas[PATH] = NOVO
+    assert client.get(PATH) == NOVO
@@ -0,0 +1,114 @@
+from datetime import datetime
+
+from app.db.repositories.evento_repo import cobertura_ate, registrar_cobertura
+from app.scraper.parser import _fluxo_jogos_por_ano, _parar_na_cobertura
+
+TIME_ID = 42
+ANO = 2023
+DIA = 24 * 3600
+POR_PAGINA = 10
+N_PAGINAS = 20
+# Página 0 termina no fim de fevereiro do ano seguinte; um jogo a cada 3 dias para trás.
+ULTIMO = int(datetime(ANO + 1, 2, 28).timestamp())
+INICIO, FIM = int(datetime(ANO, 1, 1).timestamp()), int(datetime(ANO + 1, 1, 1).timestamp())
+
+
+def _evento(id_: int, inicio: int, status: str) -> dict:
+    return {
+        "id": id_, "startTimestamp": inicio, "status": {"type": status, "description": status},
+        "homeTeam": {"id": TIME_ID, "name": "Casa"}, "awayTeam": {"id": 1000 + id_, "name": f"Visitante {id_}"},
+        "homeScore": {"display": 1}, "awayScore": {"display": 0},
+        "tournament": {"id": 1, "name": "Liga", "uniqueTournament": {"id": 1}}, "season": {"id": ANO},
+        "venue": {"id": 1, "name": "Estádio", "city": {"name": "Cidade"}},
+    }
+
+
+def _respostas(status: dict[int, str] | None = None) -> dict:
+    status = status or {}
+    respostas = {}
+    for p in range(N_PAGINAS):
+        ids = [p * POR_PAGINA + k for k in reversed(range(POR_PAGINA))]
+        respostas[f"/team/{TIME_ID}/events/last/{p}"] = {
+            "events": [_evento(i, ULTIMO - i * 3 * DIA, status.get(i, "finished")) for i in ids],
+            "hasNextPage": p < N_PAGINAS - 1,
+        }
+    return respostas
+
+
+def _do_ano(respostas: dict) -> set[int]:
+    return {
+        e["id"] for data in respostas.values() for e in data["events"]
+        if INICIO <= e["startTimestamp"] < FIM
+    }
+
+
+def _paginas(pedidos: list[str]) -> list[str]:
+    return [p for p in pedidos if "/events/last/" in p]
+
+
+def _inicio_de(id_: int) -> int:
+    return ULTIMO - id_ * 3 * DIA
+
+
+def test_parar_na_cobertura():
+    assert _parar_na_cobertura(None) is None
+    parar = _parar_na_cobertura(1000)
+    assert parar([{"startTimestamp": 999}, {"startTimestamp": 5000}])
+    assert not parar([{"startTimestamp": 1000}, {"startTimestamp": 5000}])
+    assert not parar([{"id": 1}])          # sem horário não decide nada
+
+
+def test_ano_fechado_sai_do_banco(banco, rodar):
+    respostas = _respostas()
+    jogos, frio = rodar(_fluxo_jogos_por_ano(TIME_ID, ANO), respostas)
+    assert {j["id"] for j in jogos} == _do_ano(respostas)
+    assert cobertura_ate(TIME_ID, INICIO) == FIM
+
+    jogos, quente = rodar(_fluxo_jogos_por_ano(TIME_ID, ANO), respostas)
+    assert _paginas(frio) and not _paginas(quente)
+    assert {j["id"] for j in jogos} == _do_ano(respostas)
+
+
+def test_cobertura_parcial_so_busca_o_resto(banco, rodar):
+    respostas = _respostas()
+    meio = int(datetime(ANO, 9, 1).timestamp())
+    _, frio = rodar(_fluxo_jogos_por_ano(TIME_ID, ANO), respostas)
+
+    registrar_cobertura(TIME_ID + 1, INICIO, meio)
+    jogos, parcial = rodar(_fluxo_jogos_por_ano(TIME_ID + 1, ANO), {
+        p.replace(f"/team/{TIME_ID}/", f"/team/{TIME_ID + 1}/"): data for p, data in respostas.items()
+    })
+    assert len(_paginas(parcial)) < len(_paginas(frio))
+    # Tudo o que foi buscado é de depois da parte coberta.
+    assert all(_inicio_de(j["id"]) >= meio for j in jogos)
+
+
+def test_jogo_adiado_segura_a_cobertura_e_e_rebuscado(banco, rodar):
+    adiado = sorted(_do_ano(_respostas()))[len(_do_ano(_respostas())) // 2]
+    respostas = _respostas({adiado: "postponed"})
+    rodar(_fluxo_jogos_por_ano(TIME_ID, ANO), respostas)
+    # A cobertura para antes do jogo adiado...
+    assert cobertura_ate(TIME_ID, INICIO) == _inicio_de(adiado)
+
+    # ...então a próxima consulta volta à página dele.
+    pagina = f"/team/{TIME_ID}/events/last/{adiado // POR_PAGINA}"
+    _, pedidos = rodar(_fluxo_jogos_por_ano(TIME_ID, ANO), respostas)
+    assert pagina in pedidos
+
+    # Quando o jogo termina, o ano fecha e o SofaScore não é mais consultado.
+    respostas = _respostas()
+    rodar(_fluxo_jogos_por_ano(TIME_ID, ANO), respostas)
+    assert cobertura_ate(TIME_ID, INICIO) == FIM
+    _, pedidos = rodar(_fluxo_jogos_por_ano(TIME_ID, ANO), respostas)
+    assert not _paginas(pedidos)
+
+
+def test_pagina_degradada_nao_registra_cobertura(banco, rodar):
+    respostas = _respostas()
+    jogos, frio = rodar(_fluxo_jogos_por_ano(TIME_ID, ANO), respostas, degradados=frozenset(respostas))
+    assert {j["id"] for j in jogos} == _do_ano(respostas)
+    assert cobertura_ate(TIME_ID, INICIO) is None
+
+    _, pedidos = rodar(_fluxo_jogos_por_ano(TIME_ID, ANO), respostas)
+    assert _paginas(pedidos)
+    assert cobertura_ate(TIME_ID, INICIO) == FIM
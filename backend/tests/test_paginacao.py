@@ -0,0 +1,105 @@
+import pytest
+
+from app.scraper.paginacao import PaginasTime, fluxo_eventos_do_periodo
+
+TIME_ID = 42
+DIA = 24 * 3600
+AGORA = 1_700_000_000
+POR_PAGINA = 10
+N_PAGINAS = 12
+
+
+def _respostas(n_paginas: int = N_PAGINAS) -> dict:
+    """Histórico de /events/last: página 0 é a mais recente, um jogo a cada 3 dias."""
+    respostas = {}
+    for p in range(n_paginas):
+        # Dentro da página o SofaScore lista do mais antigo para o mais recente.
+        eventos = [
+            {"id": p * 100 + k, "startTimestamp": AGORA - (p * POR_PAGINA + k + 1) * 3 * DIA}
+            for k in reversed(range(POR_PAGINA))
+        ]
+        respostas[f"/team/{TIME_ID}/events/last/{p}"] = {"events": eventos, "hasNextPage": p < n_paginas - 1}
+    return respostas
+
+
+def _todos(respostas: dict) -> list[dict]:
+    return [e for data in respostas.values() for e in data["events"]]
+
+
+def _primeira_esperada(respostas: dict, extremo, limite: float, minimo: int = 0) -> int:
+    p = minimo
+    while True:
+        data = respostas.get(f"/team/{TIME_ID}/events/last/{p}")
+        eventos = data["events"] if data else []
+        if extremo(eventos) < limite:
+            return p
+        p += 1
+
+
+def _mais_antigo(eventos):
+    return min((e["startTimestamp"] for e in eventos), default=float("-inf"))
+
+
+@pytest.mark.parametrize("dica", [0, 3, 7, 11, 20])
+def test_primeira_acha_a_fronteira_de_qualquer_dica(banco, rodar, dica):
+    respostas = _respostas()
+    for dias in (0, 1, 40, 95, 200, 359, 361, 1000):
+        limite = AGORA - dias * DIA
+        paginas = PaginasTime(TIME_ID)
+        achada, _ = rodar(paginas.primeira(paginas.mais_antigo, limite, dica), respostas)
+        assert achada == _primeira_esperada(respostas, _mais_antigo, limite), dias
+
+
+def test_primeira_com_dica_certa_custa_uma_requisicao(banco, rodar):
+    respostas = _respostas()
+    limite = AGORA - 95 * 3 * DIA + 1   # cai dentro da página 9
+    paginas = PaginasTime(TIME_ID)
+    achada, pedidos = rodar(paginas.primeira(paginas.mais_antigo, limite, 9), respostas)
+    assert achada == 9
+    # A página da dica e a vizinha de cima, que confirma a fronteira.
+    assert len(pedidos) <= 2
+
+
+@pytest.mark.parametrize("dica", [4, 6, 11])
+def test_primeira_respeita_o_minimo(banco, rodar, dica):
+    respostas = _respostas()
+    paginas = PaginasTime(TIME_ID)
+    achada, pedidos = rodar(paginas.primeira(paginas.mais_antigo, AGORA, dica, minimo=4), respostas)
+    assert achada == 4
+    assert all(int(p.rsplit("/", 1)[1]) >= 4 for p in pedidos)
+
+
+def test_primeira_alem_do_fim_do_historico(banco, rodar):
+    respostas = _respostas(3)
+    paginas = PaginasTime(TIME_ID)
+    achada, pedidos = rodar(paginas.primeira(paginas.mais_antigo, AGORA - 10_000 * DIA, 0), respostas)
+    assert achada == 3
+    assert all(not p.endswith(("/5", "/6", "/7")) for p in pedidos)
+
+
+@pytest.mark.parametrize("inicio_dias, fim_dias", [
+    (30, 0),        # só as primeiras páginas
+    (200, 100),     # no meio do histórico
+    (92, 88),       # período menor que uma página
+    (400, 0),       # histórico inteiro
+    (5000, 4000),   # antes do primeiro jogo
+])
+def test_eventos_do_periodo_igual_a_filtrar_tudo(banco, rodar, inicio_dias, fim_dias):
+    respostas = _respostas()
+    inicio, fim = AGORA - inicio_dias * DIA, AGORA - fim_dias * DIA
+    eventos, _ = rodar(fluxo_eventos_do_periodo(TIME_ID, inicio, fim), respostas)
+    esperados = [e for e in _todos(respostas) if inicio <= e["startTimestamp"] < fim]
+    assert sorted(e["id"] for e in eventos) == sorted(e["id"] for e in esperados)
+
+
+def test_eventos_do_periodo_usa_o_indice_aprendido(banco, rodar):
+    respostas = _respostas()
+    inicio, fim = AGORA - 200 * DIA, AGORA - 150 * DIA
+
+    _, frio = rodar(fluxo_eventos_do_periodo(TIME_ID, inicio, fim), respostas)
+    eventos, quente = rodar(fluxo_eventos_do_periodo(TIME_ID, inicio, fim), respostas)
+
+    # Quente: as páginas 5 e 6 do período e no máximo uma vizinha para confirmar a borda.
+    assert {f"/team/{TIME_ID}/events/last/{p}" for p in (5, 6)} <= set(quente)
+    assert len(quente) <= 3 < len(frio)
+    assert all(inicio <= e["startTimestamp"] < fim for e in eventos)
@@ -0,0 +1,85 @@
+import pytest
+
+from app.scraper import ratelimit
+from app.scraper.ratelimit import LimitadorAdaptativo
+
+
+class _Relogio:
+    """Substitui o módulo time do limiter: o tempo só anda quando alguém dorme ou o teste manda."""
+
+    def __init__(self):
+        self.agora = 1000.0
+
+    def monotonic(self) -> float:
+        return self.agora
+
+    def sleep(self, segundos: float) -> None:
+        self.agora += segundos
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = _Relogio()
+    monkeypatch.setattr(ratelimit, "time", relogio)
+    return relogio
+
+
+def _limitador(taxa=10.0, rajada=5, taxa_minima=1.0, recuperacao=0.5) -> LimitadorAdaptativo:
+    return LimitadorAdaptativo(taxa, rajada, taxa_minima, recuperacao)
+
+
+def test_rajada_passa_sem_esperar_e_depois_segue_a_taxa(relogio):
+    limitador = _limitador()
+    assert [limitador._reservar() for _ in range(5)] == [0.0] * 5
+    # Sem tempo passando, cada reserva fica devendo mais 1/taxa.
+    assert [limitador._reservar() for _ in range(3)] == pytest.approx([0.1, 0.2, 0.3])
+    assert (limitador.reservas, limitador.esperas) == (8, 3)
+    assert limitador.espera_max == pytest.approx(0.3)
+
+
+def test_aguardar_dorme_o_que_deve(relogio):
+    limitador = _limitador(rajada=1)
+    inicio = relogio.agora
+    for _ in range(11):
+        limitador.aguardar()
+    assert relogio.agora - inicio == pytest.approx(1.0)
+
+
+def test_folga_nao_reserva_e_nao_passa_da_rajada(relogio):
+    limitador = _limitador()
+    limitador._reservar()
+    limitador._reservar()
+    assert limitador.folga() == pytest.approx(3)
+    assert limitador.folga() == pytest.approx(3)
+    relogio.agora += 60
+    assert limitador.folga() == 5
+    assert limitador.reservas == 2
+
+
+def test_bloqueio_corta_a_taxa_pela_metade_ate_o_minimo(relogio):
+    limitador = _limitador(taxa=8.0, taxa_minima=1.5)
+    for esperado in (4.0, 2.0, 1.5, 1.5):
+        limitador.penalizar()
+        assert limitador.estatisticas()["taxa_atual"] == esperado
+    assert limitador.penalidades == 4
+
+
+def test_taxa_volta_aos_poucos_depois_do_bloqueio(relogio):
+    limitador = _limitador(taxa=10.0, recuperacao=0.5)
+    limitador.penalizar()
+    limitador._reservar()
+    relogio.agora += 4
+    limitador._reservar()
+    assert limitador.estatisticas()["taxa_atual"] == pytest.approx(7.0)
+    relogio.agora += 60
+    limitador._reservar()
+    assert limitador.estatisticas()["taxa_atual"] == 10.0
+
+
+def test_penalizado_espera_mais_por_token(relogio):
+    limitador = _limitador(taxa=10.0, rajada=1)
+    limitador._reservar()
+    assert limitador._reservar() == pytest.approx(0.1)
+    limitador.penalizar()
+    # A dívida anterior (1 token) mais o novo, agora a 5 req/s.
+    assert limitador._reservar() == pytest.approx(0.4)
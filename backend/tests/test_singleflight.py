@@ -0,0 +1,146 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.scraper import client
+from app.scraper.breaker import Disjuntores
+from app.scraper.cache import CacheRespostas
+from app.scraper.singleflight import SingleFlight
+
+N = 8
+
+
+def _esperar(condicao, limite: float = 5.0) -> None:
+    fim = time.monotonic() + limite
+    while not condicao():
+        assert time.monotonic() < fim
+        time.sleep(0.01)
+
+
+def test_threads_com_a_mesma_chave_dividem_uma_execucao():
+    voos = SingleFlight()
+    liberar = threading.Event()
+    chamadas = []
+
+    def buscar():
+        chamadas.append(1)
+        assert liberar.wait(5)
+        return {"ok": True}
+
+    with ThreadPoolExecutor(N) as pool:
+        futuros = [pool.submit(voos.executar, "/team/1", buscar) for _ in range(N)]
+        _esperar(lambda: voos.coalescidas == N - 1)
+        liberar.set()
+        resultados = [f.result(timeout=5) for f in futuros]
+
+    assert len(chamadas) == 1
+    assert all(r is resultados[0] for r in resultados)
+    assert (voos.execucoes, voos.coalescidas) == (1, N - 1)
+
+
+def test_excecao_chega_a_todos_e_a_chave_e_liberada():
+    voos = SingleFlight()
+    liberar = threading.Event()
+
+    def falhar():
+        assert liberar.wait(5)
+        raise client.FalhaUpstream("SofaScore 503")
+
+    with ThreadPoolExecutor(N) as pool:
+        futuros = [pool.submit(voos.executar, "/team/1", falhar) for _ in range(N)]
+        _esperar(lambda: voos.coalescidas == N - 1)
+        liberar.set()
+        for f in futuros:
+            with pytest.raises(client.FalhaUpstream):
+                f.result(timeout=5)
+
+    assert voos.executar("/team/1", lambda: "de novo") == "de novo"
+    assert voos.execucoes == 2
+
+
+def test_chaves_diferentes_nao_se_misturam():
+    voos = SingleFlight()
+    with ThreadPoolExecutor(4) as pool:
+        resultados = list(pool.map(lambda k: voos.executar(k, lambda: k), ["/a", "/b", "/c", "/d"]))
+    assert resultados == ["/a", "/b", "/c", "/d"]
+    assert voos.coalescidas == 0
+
+
+def test_corrotinas_com_a_mesma_chave_dividem_uma_execucao():
+    voos = SingleFlight()
+    chamadas = []
+
+    async def buscar():
+        chamadas.append(1)
+        await asyncio.sleep(0.05)
+        return {"ok": True}
+
+    async def cenario():
+        return await asyncio.gather(*(voos.executar_async("/team/1", buscar) for _ in range(N)))
+
+    resultados = asyncio.run(cenario())
+    assert len(chamadas) == 1
+    assert all(r is resultados[0] for r in resultados)
+    assert (voos.execucoes, voos.coalescidas) == (1, N - 1)
+
+
+def test_cancelar_um_cliente_nao_cancela_a_busca_compartilhada():
+    voos = SingleFlight()
+
+    async def buscar():
+        await asyncio.sleep(0.05)
+        return "pronto"
+
+    async def cenario():
+        desistente = asyncio.create_task(voos.executar_async("/team/1", buscar))
+        paciente = asyncio.create_task(voos.executar_async("/team/1", buscar))
+        await asyncio.sleep(0)
+        desistente.cancel()
+        return await paciente
+
+    assert asyncio.run(cenario()) == "pronto"
+
+
+@pytest.fixture
+def cliente_isolado(tmp_path, monkeypatch):
+    """client.get/get_async com cache e disjuntores novos e a rede trocada por `buscas`."""
+    monkeypatch.setattr(client, "cache", CacheRespostas(10_000, str(tmp_path / "cache.db")))
+    monkeypatch.setattr(client, "_disjuntores", Disjuntores(5, 60))
+    monkeypatch.setattr(client, "_voos", SingleFlight())
+    buscas = []
+
+    def buscar(path, timeout):
+        buscas.append(path)
+        time.sleep(0.1)
+        return {"events": [], "path": path}
+
+    async def buscar_async(path, timeout):
+        buscas.append(path)
+        await asyncio.sleep(0.1)
+        return {"events": [], "path": path}
+
+    monkeypatch.setattr(client, "_buscar", buscar)
+    monkeypatch.setattr(client, "_buscar_async", buscar_async)
+    return buscas
+
+
+def test_get_concorrente_vai_uma_vez_ao_upstream(cliente_isolado):
+    path = "/team/1/events/next/0"
+    with ThreadPoolExecutor(N) as pool:
+        resultados = list(pool.map(lambda _: client.get(path), range(N)))
+    assert cliente_isolado == [path]
+    assert all(r == {"events": [], "path": path} for r in resultados)
+
+
+def test_get_async_concorrente_vai_uma_vez_ao_upstream(cliente_isolado):
+    path = "/team/1/events/next/0"
+
+    async def cenario():
+        return await asyncio.gather(*(client.get_async(path) for _ in range(N)))
+
+    resultados = asyncio.run(cenario())
+    assert cliente_isolado == [path]
+    assert all(r == {"events": [], "path": path} for r in resultados)
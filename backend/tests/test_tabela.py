@@ -0,0 +1,78 @@
+import time
+
+from app.db.repositories.evento_repo import fechar_rodadas, salvar_eventos
+from app.scraper.leagues import _fluxo_tabela, _fluxo_tabela_local
+
+BRASILEIRAO, COPA_DO_BRASIL, TEMPORADA = 325, 390, 70000
+AGORA = int(time.time())
+
+
+def _base(torneio: int) -> str:
+    return f"/unique-tournament/{torneio}/season/{TEMPORADA}"
+
+
+def _evento(id_: int, rodada: int, home: int, away: int, placar: tuple[int, int] | None,
+            torneio: int = BRASILEIRAO, inicio: int = AGORA - 10 * 86400) -> dict:
+    return {
+        "id": id_, "startTimestamp": inicio, "status": {"type": "finished" if placar else "notstarted"},
+        "homeTeam": {"id": home, "name": f"Time {home}"}, "awayTeam": {"id": away, "name": f"Time {away}"},
+        "homeScore": {"display": placar[0]} if placar else {},
+        "awayScore": {"display": placar[1]} if placar else {},
+        "tournament": {"id": 1, "uniqueTournament": {"id": torneio}}, "season": {"id": TEMPORADA},
+        "roundInfo": {"round": rodada},
+    }
+
+
+def _respostas(torneio: int = BRASILEIRAO, rodadas: list[dict] | None = None) -> dict:
+    return {
+        f"{_base(torneio)}/rounds": {"rounds": rodadas or [{"round": 1}, {"round": 2}]},
+        f"{_base(torneio)}/standings/total": {"standings": [{"name": "", "rows": [
+            {"position": 1, "team": {"id": 2, "name": "Time 2"}, "points": 3},
+        ]}]},
+    }
+
+
+def _temporada(torneio: int = BRASILEIRAO, rodada_2: dict | None = None) -> None:
+    """Rodada 1 fechada; a 2 guardada como `rodada_2` (padrão: um jogo futuro)."""
+    salvar_eventos([_evento(1, 1, 1, 2, (2, 0), torneio)])
+    fechar_rodadas(torneio, TEMPORADA, [(1, "")])
+    salvar_eventos([rodada_2 or _evento(2, 2, 2, 1, None, torneio, inicio=AGORA + 86400)])
+
+
+def test_temporada_sincronizada_sai_do_banco(banco, rodar):
+    _temporada()
+    tabela, pedidos = rodar(_fluxo_tabela(BRASILEIRAO, TEMPORADA), _respostas())
+    assert pedidos == [f"{_base(BRASILEIRAO)}/rounds"]
+    assert (tabela["origem"], tabela["completa"]) == ("local", True)
+    assert [linha["time_id"] for linha in tabela["grupos"][0]["tabela"]] == [1, 2]
+
+
+def test_jogo_atrasado_no_banco_vai_ao_sofascore(banco, rodar):
+    # Marcado para ontem e ainda "notstarted" no banco: o resultado pode já existir.
+    _temporada(rodada_2=_evento(2, 2, 2, 1, None, inicio=AGORA - 86400))
+    tabela, pedidos = rodar(_fluxo_tabela(BRASILEIRAO, TEMPORADA), _respostas())
+    assert f"{_base(BRASILEIRAO)}/standings/total" in pedidos
+    assert tabela["origem"] == "sofascore"
+
+    local, _ = rodar(_fluxo_tabela_local(BRASILEIRAO, TEMPORADA, None, "total", None, 5), _respostas())
+    assert local["completa"] is False
+
+
+def test_rodada_sem_jogos_no_banco_vai_ao_sofascore(banco, rodar):
+    _temporada()
+    respostas = _respostas(rodadas=[{"round": 1}, {"round": 2}, {"round": 3}])
+    tabela, _ = rodar(_fluxo_tabela(BRASILEIRAO, TEMPORADA), respostas)
+    assert tabela["origem"] == "sofascore"
+
+
+def test_copa_e_mata_mata_vao_ao_sofascore(banco, rodar):
+    _temporada(COPA_DO_BRASIL)
+    tabela, pedidos = rodar(_fluxo_tabela(COPA_DO_BRASIL, TEMPORADA), _respostas(COPA_DO_BRASIL))
+    assert tabela["origem"] == "sofascore"
+    assert f"{_base(COPA_DO_BRASIL)}/rounds" not in pedidos
+
+    # Liga de tabela única com playoff na temporada: rodada com slug.
+    _temporada()
+    respostas = _respostas(rodadas=[{"round": 1}, {"round": 2}, {"round": 1, "slug": "final"}])
+    tabela, _ = rodar(_fluxo_tabela(BRASILEIRAO, TEMPORADA), respostas)
+    assert tabela["origem"] == "sofascore"
@@ -0,0 +1,48 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import app.core.typeahead as typeahead
+from app.core.typeahead import IndiceTypeahead
+from app.db.database import conectar
+
+
+def _inserir_clube(id_: int, nome: str) -> None:
+    conn = conectar()
+    try:
+        conn.execute("INSERT INTO clubes (id, nome, pais) VALUES (?, ?, 'Brasil')", (id_, nome))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _nomes(sugestoes: list[dict]) -> list[str]:
+    return [s["nome"] for s in sugestoes]
+
+
+def test_sugerir_nao_espera_a_reconstrucao(banco, monkeypatch):
+    _inserir_clube(1, "Flamengo")
+    indice = IndiceTypeahead()
+    assert _nomes(indice.sugerir("fla")) == ["Flamengo"]
+
+    comecou, liberar = threading.Event(), threading.Event()
+    listar_times = typeahead.listar_times
+
+    def listar_times_lento():
+        comecou.set()
+        assert liberar.wait(5)
+        return listar_times()
+
+    monkeypatch.setattr(typeahead, "listar_times", listar_times_lento)
+    _inserir_clube(2, "Fluminense")
+    indice.invalidar()
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        reconstrucao = pool.submit(indice.sugerir, "flu")
+        assert comecou.wait(5)
+        # Durante a construção as consultas respondem com o índice anterior.
+        assert _nomes(pool.submit(indice.sugerir, "fla").result(timeout=1)) == ["Flamengo"]
+        assert pool.submit(indice.sem_resultado, "xyz").result(timeout=1) is False
+        liberar.set()
+        assert _nomes(reconstrucao.result(timeout=5)) == ["Fluminense"]
+
+    assert indice.construcoes == 2
@@ -7,13 +7,17 @@ from database import consultar_estadio_por_id, consultar_estadio_do_clube
 
 logging.basicConfig(level=logging.INFO)
 
+# Sessão única e de vida longa: cada thread do Flask ganha seu próprio handle curl
+# (use_thread_local_curl), reaproveitando conexões e o TLS já negociado.
+_sessao = requests.Session(impersonate="chrome110")
+
 # ... (MANTENHA A FUNÇÃO buscar_id_time IGUAL, NÃO PRECISA MUDAR) ...
 # Copie a função buscar_id_time do seu código anterior ou use este encurtado se preferir
 
 def buscar_id_time(nome_time):
     url_search = f"https://www.sofascore.com/api/v1/search/{nome_time}"
     try:
-        response = requests.get(url_search, impersonate="chrome110", timeout=10)
+        response = _sessao.get(url_search, timeout=10)
         if response.status_code == 200:
             data = response.json()
             for item in data.get('results', []):
@@ -23,7 +27,7 @@ def buscar_id_time(nome_time):
                     # Pega cor
                     cor = "#000000"
                     try:
-                        resp_det = requests.get(f"https://www.sofascore.com/api/v1/team/{time_id}", impersonate="chrome110", timeout=5)
+                        resp_det = _sessao.get(f"https://www.sofascore.com/api/v1/team/{time_id}", timeout=5)
                         if resp_det.status_code == 200:
                             cor = resp_det.json().get('team', {}).get('teamColors', {}).get('primary', '#000000')
                     except: pass
@@ -52,7 +56,7 @@ def buscar_jogos(time_id, tipo='next', limite_paginas=None):
         
         try:
             logging.info(f"📡 Consultando API (Pág {pagina}): {url}")
-            response = requests.get(url, impersonate="chrome110", timeout=10)
+            response = _sessao.get(url, timeout=10)
             
             if response.status_code != 200: break
 
@@ -126,7 +130,7 @@ def buscar_detalhes_jogo(event_id):
     url = f"https://www.sofascore.com/api/v1/event/{event_id}/incidents"
     
     try:
-        response = requests.get(url, impersonate="chrome110", timeout=5)
+        response = _sessao.get(url, timeout=5)
         if response.status_code != 200: return None
         
         data = response.json()